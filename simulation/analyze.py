@@ -0,0 +1,48 @@
+"""
+Post-run analytics across experiment output directories.
+
+Streams every run under the given paths and writes CSV tables:
+interactions.csv, fills.csv, fills_per_step.csv, pair_tokens.csv,
+conversations.csv and runs.csv.
+
+Run from the simulation directory:
+    python analyze.py outputs [more paths...] --out outputs/analysis
+"""
+import argparse
+import time
+
+from utils.run_analytics import RunAnalytics, find_runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=["outputs"], help="Run directories or directories containing runs")
+    parser.add_argument("--out", default="outputs/analysis", help="Directory for the CSV tables")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    runs = find_runs(args.paths)
+    analytics = RunAnalytics()
+    for run_dir in runs:
+        analytics.add_run(run_dir)
+    written = analytics.export_csv(args.out)
+
+    summary = analytics.run_summary()
+    fills = analytics.fills_per_step()
+    print("\n=== Run Analytics ===")
+    print(f"Runs: {len(runs)}")
+    print(f"Agents: {len(analytics.agents)}")
+    print(f"API calls: {int(summary[:, 0].sum()):,}")
+    print(f"Tokens: {int(summary[:, 1:3].sum()):,}")
+    print(f"Conversations: {int(summary[:, 3].sum()):,}")
+    if summary[:, 3].sum():
+        print(f"Mean exchanges per conversation: {summary[:, 4].sum() / summary[:, 3].sum():.1f}")
+    print(f"Squares filled: {int(fills.sum()):,}")
+    print(f"Elapsed: {time.perf_counter() - start:.2f}s")
+    print("=====================")
+    for path in written:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
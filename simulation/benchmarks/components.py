@@ -0,0 +1,331 @@
+"""
+Micro-benchmarks for the hot helpers of the simulation loop.
+
+Each benchmark runs on a synthetic population (utils.population) and
+dialogue built from a fixed seed, so two runs on the same machine do the
+same work:
+
+    bingo.update_agent_bingo, bingo.keyword_match
+    memory.update_short_term, memory.read_short_term, memory.clear_short_term
+    env.pair_idle_agents@N, env.get_conversation_pairs@N, env.get_conversation_context@N
+    prompt.format, tokens.add_api_call
+
+Results (median and best seconds per operation) are compared with a JSON
+baseline; any benchmark whose median is more than --threshold percent above
+its baseline is a regression and the exit code is 1. Baselines are
+machine-specific: record one with --save-baseline on the machine that runs
+the comparison.
+
+Run from the simulation directory:
+    python -m benchmarks.components [--sizes 10 100 1000 10000] [--filter env.] [--threshold 20]
+    python -m benchmarks.components --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+SIM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SIM_DIR)
+
+from hydra import compose, initialize_config_dir  # noqa: E402
+from utils.console import console  # noqa: E402
+from utils.population import generate_population  # noqa: E402
+
+BASELINE = os.path.join(SIM_DIR, "benchmarks", "baselines", "components.json")
+SEED = 0
+WORDS = (
+    "research startup language music hiking college advice internship teaching robotics climate policy "
+    "painting travel cooking design history marathon photography volunteering biology finance writing "
+    "chess physics theater soccer poetry software medicine law architecture gardening astronomy"
+).split()
+
+
+def measure(fn: Callable[[Any], None], setup: Optional[Callable[[], Any]] = None,
+            repeat: int = 5, number: int = 100) -> Dict[str, float]:
+    """Seconds per call of fn(state): median and best over `repeat` rounds of `number` calls"""
+    rounds = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(state)
+        rounds.append((time.perf_counter() - start) / number)
+    return {"median": statistics.median(rounds), "best": min(rounds), "repeat": repeat, "number": number}
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class Workspace:
+    """A synthetic population (utils.population) in a temporary directory, and configs that point at it"""
+
+    def __init__(self, max_agents: int):
+        self.root = tempfile.mkdtemp(prefix="bingo_bench_")
+        self.agents_dir = os.path.join(self.root, "agents_personas")
+        self.boards_dir = os.path.join(self.root, "bingo_boards", "input")
+        generate_population(self.root, max_agents, seed=SEED)
+
+    def config(self, name: str, agents: int, overrides: Optional[List[str]] = None):
+        outputs_dir = os.path.join(self.root, "outputs", name)
+        os.makedirs(outputs_dir, exist_ok=True)
+        with initialize_config_dir(config_dir=os.path.join(SIM_DIR, "configs"), version_base=None):
+            return compose(config_name="config", overrides=[
+                f"paths.base_dir={os.path.join(SIM_DIR, 'simulation')}",
+                f"paths.agents_dir={self.agents_dir}",
+                f"paths.bingo_board_dir={self.boards_dir}",
+                f"paths.outputs_dir={outputs_dir}",
+                "experiment.experiment_id=bench",
+                f"experiment.max_agents={agents}",
+                "environment.settings.time_dependent.random_seed=0",
+                "console.level=quiet",
+                *(overrides or []),
+            ])
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+#######################
+# Benchmarks
+#######################
+
+def bench_bingo(workspace: Workspace) -> Dict[str, Dict[str, float]]:
+    from core.bingo_manager import BingoManager
+
+    cfg = workspace.config("bingo", 100)
+    names = sorted(f[:-4] for f in os.listdir(workspace.agents_dir))[:100]
+    rng = random.Random(SEED)
+    responses = [sentence(rng, 25) for _ in range(1000)]
+    clues = [sentence(rng, 8) for _ in range(1000)]
+
+    def setup():
+        # A fresh overlay each round, so boards do not fill up across rounds
+        for fname in os.listdir(cfg.paths.outputs_dir):
+            os.remove(os.path.join(cfg.paths.outputs_dir, fname))
+        return {"manager": BingoManager(cfg), "i": 0}
+
+    def update(state):
+        i = state["i"] = state["i"] + 1
+        state["manager"].update_agent_bingo(names[i % len(names)], responses[i % len(responses)], names[(i + 1) % len(names)])
+
+    def match(state):
+        i = state["i"] = state["i"] + 1
+        state["manager"].keyword_match(clues[i % len(clues)], responses[i % len(responses)].lower())
+
+    return {
+        "bingo.update_agent_bingo": measure(update, setup, repeat=5, number=500),
+        "bingo.keyword_match": measure(match, setup, repeat=5, number=5000),
+    }
+
+
+def bench_memory(workspace: Workspace) -> Dict[str, Dict[str, float]]:
+    from core.memory_manager import MemoryManager
+
+    cfg = workspace.config("memory", 100)
+    memory = MemoryManager(cfg)
+    rng = random.Random(SEED)
+    exchanges = [{"A00000": sentence(rng), "A00001": sentence(rng)} for _ in range(200)]
+
+    def setup():
+        # Six exchanges already stored: the size of a conversation mid-way
+        memory.clear_short_term_memory("A00000")
+        for exchange in exchanges[:6]:
+            memory.update_short_term_memory("A00000", "A00001", exchange)
+        return {"i": 0}
+
+    def update(state):
+        state["i"] += 1
+        memory.update_short_term_memory("A00000", "A00001", exchanges[state["i"] % len(exchanges)])
+        if state["i"] % 6 == 0:
+            memory.clear_short_term_memory("A00000")
+
+    def read(state):
+        memory.get_short_term_memory("A00000")
+
+    def clear(state):
+        memory.update_short_term_memory("A00000", "A00001", exchanges[0])
+        memory.clear_short_term_memory("A00000")
+
+    return {
+        "memory.update_short_term": measure(update, setup, repeat=5, number=200),
+        "memory.read_short_term": measure(read, setup, repeat=5, number=500),
+        "memory.clear_short_term": measure(clear, setup, repeat=5, number=100),
+    }
+
+
+def bench_environment(workspace: Workspace, sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    from core.agent_manager import AgentManager
+    from environments.time_dependent import TimeDependentEnvironment
+
+    results = {}
+    for n in sizes:
+        cfg = workspace.config(f"env_{n}", n)
+        random.seed(SEED)
+        agent_manager = AgentManager(cfg)
+        # Large populations get fewer rounds; pairing is the slowest path here
+        repeat = 5 if n <= 1000 else 2
+
+        def fresh():
+            return TimeDependentEnvironment(cfg, agent_manager)
+
+        def paired():
+            environment = fresh()
+            environment.get_conversation_pairs()
+            return environment
+
+        results[f"env.pair_idle_agents@{n}"] = measure(lambda env: env.pair_idle_agents(), fresh, repeat=repeat, number=1)
+        results[f"env.get_conversation_pairs@{n}"] = measure(lambda env: env.get_conversation_pairs(), paired,
+                                                             repeat=repeat, number=10)
+        names = sorted(agent_manager.get_agent_names())
+        results[f"env.get_conversation_context@{n}"] = measure(
+            lambda env: env.get_conversation_context(names[0], names[1], []), paired, repeat=repeat, number=20
+        )
+    return results
+
+
+def bench_prompt_and_tokens(workspace: Workspace) -> Dict[str, Dict[str, float]]:
+    from langchain_core.messages import AIMessage
+    from utils.token_counter import TokenCounter
+
+    with open(os.path.join(SIM_DIR, "prompt_template.txt"), "r") as f:
+        template = f.read().strip()
+    rng = random.Random(SEED)
+    board = {"squares": [{"text": f"Find someone who {sentence(rng, 6)}", "filled": False} for _ in range(12)]}
+    values = {
+        "agent_curr_bingo_board": board, "num_filled_squares": 3, "num_unfilled_squares": 9,
+        "name": "A00000", "personality": sentence(rng, 60), "other_name": "A00001",
+        "conversation_summary": sentence(rng, 120), "time_step": 4, "max_time_steps": 50,
+        "messages_exchanged": 2, "max_messages": 2, "past_partners_agent1": {"A00002", "A00003"},
+        "past_partners_agent2": {"A00004"}, "last_exchange": {"A00000": sentence(rng), "A00001": sentence(rng)},
+    }
+    prompts = [template.format(**values) for _ in range(2)]
+    with_usage = AIMessage(content=sentence(rng), usage_metadata={"input_tokens": 900, "output_tokens": 30, "total_tokens": 930})
+    texts = [sentence(rng, 30) for _ in range(100)]
+
+    def add_estimated(state):
+        i = state["i"] = state["i"] + 1
+        # New text every call, so the token estimate cache does not hide the work
+        state["counter"].add_api_call(prompt=f"{prompts[0]} {i}", response=texts[i % len(texts)],
+                                      call_type="dialogue", agent="A00000", partner="A00001")
+
+    def add_reported(state):
+        state["counter"].add_api_call(prompt=prompts[0], response=with_usage, call_type="dialogue",
+                                      agent="A00000", partner="A00001")
+
+    def counter():
+        token_counter = TokenCounter()
+        token_counter.set_output_dir(os.path.join(workspace.root, "outputs"))
+        return {"counter": token_counter, "i": 0}
+
+    return {
+        "prompt.format": measure(lambda _: template.format(**values), repeat=5, number=2000),
+        "tokens.add_api_call": measure(add_estimated, counter, repeat=5, number=1000),
+        "tokens.add_api_call.reported": measure(add_reported, counter, repeat=5, number=5000),
+    }
+
+
+#######################
+# Baselines
+#######################
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Per-benchmark change against the baseline; a benchmark may carry its own threshold"""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            rows.append({"name": name, "median": result["median"], "baseline": None, "change": None, "regressed": False})
+            continue
+        limit = base.get("threshold", threshold)
+        change = (result["median"] / base["median"] - 1) * 100 if base["median"] else 0.0
+        rows.append({"name": name, "median": result["median"], "baseline": base["median"], "change": change,
+                     "regressed": change > limit})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Population sizes for env.*")
+    parser.add_argument("--filter", help="Only run benchmarks whose name starts with this text")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown of the median, in percent")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    console.set_level("quiet")
+    groups = [
+        ("bingo.", lambda ws: bench_bingo(ws)),
+        ("memory.", lambda ws: bench_memory(ws)),
+        ("env.", lambda ws: bench_environment(ws, args.sizes)),
+        ("prompt.", lambda ws: bench_prompt_and_tokens(ws)),
+        ("tokens.", lambda ws: bench_prompt_and_tokens(ws)),
+    ]
+    workspace = Workspace(max(args.sizes + [100]))
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for prefix, run in groups:
+            if args.filter and not (prefix.startswith(args.filter) or args.filter.startswith(prefix)):
+                continue
+            if any(name.startswith(prefix) for name in results):
+                continue
+            print(f"Running {prefix}* ...", flush=True)
+            results.update(run(workspace))
+    finally:
+        workspace.close()
+    if args.filter:
+        results = {name: result for name, result in results.items() if name.startswith(args.filter)}
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+
+    print("\n=== Component benchmarks (seconds per call) ===")
+    print(f"{'benchmark':40}{'median':>14}{'baseline':>14}{'change':>10}")
+    for row in rows:
+        base = f"{row['baseline']:.3e}" if row["baseline"] is not None else "-"
+        change = f"{row['change']:+.1f}%" if row["change"] is not None else "-"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:40}{row['median']:>14.3e}{base:>14}{change:>10}{flag}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "comparison": rows}, f, indent=2)
+    if args.save_baseline:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                saved = json.load(f)
+        # Keep baselines (and per-benchmark thresholds) of benchmarks that were not run
+        merged = saved.get("results", {})
+        for name, result in results.items():
+            merged[name] = {**merged.get(name, {}), **result}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.platform(),
+                       "processor": platform.processor(), "results": merged}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Startup-time benchmark for the simulation entry point.
+
+Reports an `-X importtime` breakdown of `import main` (grouped by top-level
+package) and the wall time of each startup phase up to a ready
+ConversationManager. No LLM client is created, so no API key is needed.
+
+Run from the simulation directory:
+    python -m benchmarks.startup [--top N] [--json out.json] [hydra overrides...]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+SIM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_breakdown(module: str = "main", top: int = 15) -> Dict[str, Any]:
+    """Import `module` in a fresh interpreter with -X importtime and summarize the result"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SIM_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    modules: List[Dict[str, Any]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_seconds": int(self_us) / 1e6,
+            "cumulative_seconds": int(cumulative_us) / 1e6,
+            "top_level": not name.startswith("  "),
+        })
+
+    by_package: Dict[str, float] = {}
+    for entry in modules:
+        package = entry["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + entry["self_seconds"]
+
+    return {
+        "total_seconds": sum(entry["cumulative_seconds"] for entry in modules if entry["top_level"]),
+        "by_package": sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top],
+        "slowest_modules": [
+            (entry["module"], entry["self_seconds"])
+            for entry in sorted(modules, key=lambda entry: entry["self_seconds"], reverse=True)[:top]
+        ],
+    }
+
+
+def startup_phases(overrides: List[str]) -> Dict[str, float]:
+    """Time each startup phase in this process, from `import main` to a ready ConversationManager"""
+    phases: Dict[str, float] = {}
+    sys.path.insert(0, SIM_DIR)
+
+    start = time.perf_counter()
+    import main as simulation_main
+    from hydra import compose, initialize_config_dir
+    from utils.token_counter import TokenCounter
+    phases["import"] = time.perf_counter() - start
+
+    output_root = tempfile.mkdtemp(prefix="bingo_startup_")
+    start = time.perf_counter()
+    with initialize_config_dir(config_dir=os.path.join(SIM_DIR, "configs"), version_base=None):
+        cfg = compose(config_name="config", overrides=[
+            f"paths.base_dir={os.path.join(SIM_DIR, 'simulation')}",
+            f"paths.outputs_dir={output_root}",
+            "console.level=quiet",
+            *overrides,
+        ])
+    phases["compose_config"] = time.perf_counter() - start
+
+    token_counter = TokenCounter()
+    start = time.perf_counter()
+    simulation_main.setup_experiment(cfg, SIM_DIR, token_counter)
+    phases["setup_experiment"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulation_main.build_simulation(cfg, token_counter)
+    phases["build_simulation"] = time.perf_counter() - start
+    token_counter.close()
+    shutil.rmtree(output_root, ignore_errors=True)
+
+    phases["total"] = sum(phases.values())
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Number of packages/modules to list")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("overrides", nargs="*", help="Hydra overrides, e.g. experiment.max_agents=4")
+    args = parser.parse_args()
+
+    breakdown = import_breakdown(top=args.top)
+    phases = startup_phases(args.overrides)
+
+    print("=== Import time (-X importtime, fresh interpreter) ===")
+    print(f"import main: {breakdown['total_seconds'] * 1000:.1f} ms")
+    print("\nBy package (self time):")
+    for package, seconds in breakdown["by_package"]:
+        print(f"  {package:40} {seconds * 1000:8.1f} ms")
+    print("\nSlowest modules (self time):")
+    for module, seconds in breakdown["slowest_modules"]:
+        print(f"  {module:40} {seconds * 1000:8.1f} ms")
+
+    print("\n=== Startup phases (this process) ===")
+    for phase, seconds in phases.items():
+        print(f"  {phase:40} {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"imports": breakdown, "phases": phases}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+A/B comparison of the two turn modes: one call per speaker (alternating)
+against one structured call that writes both speakers' messages (director).
+
+Runs main.py `--repeats` times per mode with the same Hydra overrides, each
+mode writing its runs under <out>/<mode>, then compares LLM round trips,
+dialogue messages, tokens, squares filled and bingo lines per mode.
+Runs already under <out> can be compared without new runs (--compare-only).
+
+Run from the simulation directory:
+    python -m benchmarks.turn_mode --repeats 3 [hydra overrides...]
+    python -m benchmarks.turn_mode --compare-only --out outputs/turn_mode_ab
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+import numpy as np
+
+SIM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SIM_DIR)
+
+from core.director import TURN_MODES  # noqa: E402
+from utils.run_analytics import RunAnalytics, find_runs  # noqa: E402
+
+
+def run_mode(mode: str, out_dir: str, repeats: int, overrides: List[str]):
+    """Run the simulation `repeats` times in one turn mode"""
+    for repeat in range(repeats):
+        print(f"Running {mode} {repeat + 1}/{repeats}...")
+        subprocess.run(
+            [sys.executable, "main.py", f"conversation.conversation.turn_mode={mode}",
+             f"paths.outputs_dir={os.path.join(out_dir, mode)}", "console.level=quiet", *overrides],
+            cwd=SIM_DIR, check=True
+        )
+
+
+def summarize_mode(mode_dir: str) -> Dict[str, Any]:
+    """Totals and per-run fill rates for every run of one mode"""
+    analytics = RunAnalytics()
+    for run_dir in find_runs([mode_dir]):
+        analytics.add_run(run_dir)
+    if not analytics.runs:
+        return {"runs": 0}
+
+    summary = analytics.run_summary()
+    turn_calls = analytics.turn_calls()
+    round_trips = turn_calls.sum(axis=1)
+    messages = turn_calls[:, 0] + 2 * turn_calls[:, 1]
+    fills = analytics.fills_per_step().sum(axis=1)
+    per_run_rate = 100 * fills / np.maximum(messages, 1)
+    return {
+        "runs": len(analytics.runs),
+        "round_trips": int(round_trips.sum()),
+        "messages": int(messages.sum()),
+        "messages_per_round_trip": float(messages.sum() / max(round_trips.sum(), 1)),
+        "tokens": int(summary[:, 1:3].sum()),
+        "tokens_per_message": float(summary[:, 1:3].sum() / max(messages.sum(), 1)),
+        "fills": int(fills.sum()),
+        "lines_completed": int(analytics.lines_per_step().sum()),
+        "fills_per_100_messages": float(100 * fills.sum() / max(messages.sum(), 1)),
+        "fills_per_100_round_trips": float(100 * fills.sum() / max(round_trips.sum(), 1)),
+        "fills_per_100_messages_run_std": float(per_run_rate.std(ddof=1)) if len(per_run_rate) > 1 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per turn mode")
+    parser.add_argument("--out", default="outputs/turn_mode_ab", help="Directory for the runs of both modes")
+    parser.add_argument("--compare-only", action="store_true", help="Compare existing runs under --out without running")
+    parser.add_argument("--json", help="Also write the comparison to this JSON file")
+    parser.add_argument("overrides", nargs="*", help="Hydra overrides applied to both modes, e.g. experiment.max_agents=6")
+    args = parser.parse_args()
+
+    out_dir = os.path.join(SIM_DIR, args.out)
+    if not args.compare_only:
+        for mode in TURN_MODES:
+            run_mode(mode, out_dir, args.repeats, args.overrides)
+
+    results = {mode: summarize_mode(os.path.join(out_dir, mode)) for mode in TURN_MODES}
+    rows = ["runs", "round_trips", "messages", "messages_per_round_trip", "tokens", "tokens_per_message",
+            "fills", "lines_completed", "fills_per_100_messages", "fills_per_100_round_trips",
+            "fills_per_100_messages_run_std"]
+
+    print("\n=== Turn mode A/B ===")
+    print(f"{'':32}" + "".join(f"{mode:>14}" for mode in TURN_MODES))
+    for row in rows:
+        values = [results[mode].get(row) for mode in TURN_MODES]
+        print(f"{row:32}" + "".join(f"{value:>14,.2f}" if isinstance(value, float) else f"{value if value is not None else '-':>14}"
+                                    for value in values))
+    baseline, candidate = results["alternating"], results["director"]
+    if baseline.get("runs") and candidate.get("runs"):
+        print(f"\nRound trips per message: {baseline['round_trips'] / max(baseline['messages'], 1):.2f} -> "
+              f"{candidate['round_trips'] / max(candidate['messages'], 1):.2f}")
+        print(f"Fill rate change: {candidate['fills_per_100_messages'] - baseline['fills_per_100_messages']:+.2f} "
+              f"fills per 100 messages (run-to-run std {baseline['fills_per_100_messages_run_std']:.2f} / "
+              f"{candidate['fills_per_100_messages_run_std']:.2f})")
+    print("=====================")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
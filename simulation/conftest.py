@@ -0,0 +1,14 @@
+"""
+pytest setup: tests import modules the way the scripts do (core.x,
+utils.x, environments.x), so this directory goes on sys.path.
+
+Run from the simulation directory:
+    python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# An environment whose name happens to start with test_, not a test module
+collect_ignore = ["environments/test_environment.py"]
@@ -1,15 +1,51 @@
 import os
-import time
 from typing import Dict, Any, Optional
 from omegaconf import DictConfig
 from utils.agent_base import AgentBase
+from utils.bundle import BundleReader
+from utils.console import console
+from utils.metrics import metrics
+from utils.settings import Settings
 import random
 
+
+def get_response(settings: Settings, agent: AgentBase, prompt: str, call_type: str = "dialogue",
+                 speaker: Optional[str] = None, listener: Optional[str] = None, token_counter=None) -> Optional[str]:
+    """Call the model with rate limiting and retry logic; token usage is attributed to the speaker and pair"""
+    for attempt in range(settings.agent_max_retries):
+        try:
+            with metrics.timer(f"llm.{call_type}"):
+                message = agent.invoke(prompt)
+            metrics.count(f"llm.{call_type}.calls")
+            if token_counter:
+                token_counter.add_api_call(prompt=prompt, response=message, call_type=call_type,
+                                           agent=speaker, partner=listener, model=agent.model_name)
+            metrics.sleep(settings.agent_delay, "sleep.throttle")
+            return message.content
+        except Exception as e:
+            metrics.count(f"llm.{call_type}.errors")
+            if "429" in str(e) or "quota" in str(e).lower():
+                metrics.count("llm.rate_limited")
+                console.warning("Rate limit hit, waiting %s seconds...", settings.agent_delay * (attempt + 1))
+                metrics.sleep(settings.agent_delay * (attempt + 1), "sleep.backoff")
+            else:
+                console.warning("Error on attempt %d: %s", attempt + 1, e)
+                if attempt == settings.agent_max_retries - 1:
+                    raise
+    return None
+
+
 class AgentManager:
-    def __init__(self, cfg: DictConfig):
+    def __init__(self, cfg: DictConfig, token_counter=None, settings: Optional[Settings] = None):
         self.cfg = cfg
+        self.settings = settings or Settings.from_cfg(cfg)
+        self.token_counter = token_counter
         self.agents: Dict[str, Dict[str, Any]] = {}
-        self._load_agents(cfg)
+        self.bundle: Optional[BundleReader] = None
+        if cfg.paths.get("bundle_file"):
+            self._load_agents_from_bundle(cfg)
+        else:
+            self._load_agents(cfg)
         self._load_prompt_template()
 
     def _load_prompt_template(self) -> None:
@@ -19,20 +55,20 @@ class AgentManager:
             with open(template_path, "r") as f:
                 self.prompt_template = f.read().strip()
         except Exception as e:
-            print(f"Error loading prompt template: {e}")
+            console.error("Error loading prompt template: %s", e)
             self.prompt_template = "You are {name}. Your personality: {personality}. You are talking to {other_name}. Previous conversation: {conversation_summary}"
 
     def _load_agents(self, cfg: DictConfig) -> None:
         """Load all agent personalities and initialize agents"""
         max_agents = cfg.experiment["max_agents"]
-        print("Max agents: ", max_agents)
-        print(f"Loading agents from {self.cfg.paths.agents_dir}")
+        console.info("Max agents: %s", max_agents)
+        console.info("Loading agents from %s", self.cfg.paths.agents_dir)
         agent_files = [f for f in os.listdir(self.cfg.paths.agents_dir) if f.endswith(".txt")]
-        print(f"Found {len(agent_files)} agent files")
+        console.info("Found %d agent files", len(agent_files))
         
         if max_agents < len(agent_files):
             agent_files = random.sample(agent_files, max_agents)
-            print(f"Using only {max_agents} agents: {agent_files}")
+            console.info("Using only %d agents: %s", max_agents, agent_files)
         
         for fname in agent_files:
             with open(os.path.join(self.cfg.paths.agents_dir, fname), "r") as f:
@@ -43,22 +79,25 @@ class AgentManager:
                     "personality": personality
                 }
 
-    def safe_get_response(self, agent: AgentBase, prompt: str) -> Optional[str]:
-        """Safely get response with rate limiting and retry logic"""
-        for attempt in range(self.cfg.agent.agent.max_retries):
-            try:
-                response = agent.get_response(prompt)
-                time.sleep(self.cfg.agent.agent.delay)
-                return response
-            except Exception as e:
-                if "429" in str(e) or "quota" in str(e).lower():
-                    print(f"Rate limit hit, waiting {self.cfg.agent.agent.delay * (attempt + 1)} seconds...")
-                    time.sleep(self.cfg.agent.agent.delay * (attempt + 1))
-                else:
-                    print(f"Error on attempt {attempt + 1}: {e}")
-                    if attempt == self.cfg.agent.agent.max_retries - 1:
-                        raise
-        return None
+    def _load_agents_from_bundle(self, cfg: DictConfig) -> None:
+        """Initialize agents from the compiled bundle; personas stay memory-mapped until looked up"""
+        max_agents = cfg.experiment["max_agents"]
+        console.info("Loading agents from bundle %s", cfg.paths.bundle_file)
+        self.bundle = BundleReader(cfg.paths.bundle_file)
+        names = list(self.bundle.names())
+        console.info("Found %d agents in bundle (version %d)", len(names), self.bundle.version)
+
+        if max_agents < len(names):
+            names = random.sample(names, max_agents)
+            console.info("Using only %d agents: %s", max_agents, names)
+
+        for name in names:
+            self.agents[name] = {"agent": AgentBase()}
+
+    def safe_get_response(self, agent: AgentBase, prompt: str, call_type: str = "dialogue",
+                          speaker: Optional[str] = None, listener: Optional[str] = None) -> Optional[str]:
+        """Safely get response with rate limiting and retry logic; token usage is attributed to the speaker and pair"""
+        return get_response(self.settings, agent, prompt, call_type, speaker, listener, self.token_counter)
 
     def get_agent_names(self) -> list:
         """Return list of all agent names"""
@@ -66,4 +105,7 @@ class AgentManager:
 
     def get_agent(self, name: str) -> Dict[str, Any]:
         """Get agent by name"""
-        return self.agents.get(name) 
\ No newline at end of file
+        agent = self.agents.get(name)
+        if agent is None or self.bundle is None:
+            return agent
+        return {**agent, "personality": self.bundle.persona(name)} 
\ No newline at end of file
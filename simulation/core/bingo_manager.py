@@ -1,35 +1,210 @@
 import os
 import json
 import re
-from typing import Dict, Any
+from functools import lru_cache
+from math import isqrt
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from omegaconf import DictConfig
+from utils.bundle import BundleReader, normalize_board
+from utils.console import console
+from utils.metrics import metrics
+
+FILL_LOG = "bingo_fills.jsonl"
+
+
+def split_bingo_claim(response: str) -> Tuple[str, Optional[str]]:
+    """(response without its <FILL IN BINGO> tag, the claimed square text or None)"""
+    if "<FILL IN BINGO>" not in response:
+        return response, None
+    bingo_text = response.split("<FILL IN BINGO>")[1].split("</FILL IN BINGO>")[0]
+    return response.replace(f"<FILL IN BINGO>{bingo_text}</FILL IN BINGO>", ""), bingo_text
+
+
+def grid_shape(size: int) -> Tuple[int, int]:
+    """
+    Most square (rows, cols) factorization of a square count (25 -> 5x5, 12 -> 3x4).
+    Raises ValueError when that factorization is a single row (a prime count):
+    every column would be one square, so every fill would count as a bingo.
+    """
+    rows = isqrt(size)
+    while rows > 1 and size % rows:
+        rows -= 1
+    if rows < 2:
+        raise ValueError(f"Cannot lay out a board of {size} squares in at least 2 rows and 2 columns; "
+                         f"use a non-prime square count or set explicit rows/cols on the board")
+    return rows, size // rows
+
+
+def board_shape(board: Dict[str, Any]) -> Tuple[int, int]:
+    """(rows, cols) of a flat board: explicit `rows`/`cols` keys win, otherwise grid_shape of its square count"""
+    if board.get("rows") and board.get("cols"):
+        return int(board["rows"]), int(board["cols"])
+    return grid_shape(len(board["squares"]))
+
+
+@lru_cache(maxsize=None)
+def line_masks(rows: int, cols: int) -> Tuple[Tuple[Tuple[str, int], ...], Tuple[Tuple[Tuple[str, int], ...], ...]]:
+    """
+    Precomputed bitmasks for every row, column and (on square boards) both
+    diagonals, plus for each square the lines passing through it. Square i
+    is bit i of a board mask, in row-major order.
+    """
+    lines = []
+    for r in range(rows):
+        lines.append((f"row {r + 1}", sum(1 << (r * cols + c) for c in range(cols))))
+    for c in range(cols):
+        lines.append((f"col {c + 1}", sum(1 << (r * cols + c) for r in range(rows))))
+    if rows == cols:
+        lines.append(("diagonal", sum(1 << (i * cols + i) for i in range(rows))))
+        lines.append(("anti-diagonal", sum(1 << (i * cols + cols - 1 - i) for i in range(rows))))
+    by_square = tuple(
+        tuple(line for line in lines if line[1] >> index & 1) for index in range(rows * cols)
+    )
+    return tuple(lines), by_square
 
 class BingoManager:
+    """
+    Bingo boards as a copy-on-write overlay.
+
+    Source boards (the bundle or bingo_board_dir) are only ever read. Fills go
+    to an append-only log, bingo_fills.jsonl in the experiment output dir,
+    with one record per fill: agent, square index, partner, snippet and step.
+    That log is the only mutable state. Boards with their fills applied are
+    built on demand, and materialize() writes them to bingo_output_dir.
+
+    Filled squares are also kept as an integer bitmask per agent, so a fill
+    only tests the (at most four) precomputed lines through its square.
+    Completed lines are published as bingo events to subscribers.
+    """
+
     def __init__(self, cfg: DictConfig):
         self.cfg = cfg
+        self.step: Optional[int] = None
+        self.bundle = BundleReader(cfg.paths.bundle_file) if cfg.paths.get("bundle_file") else None
+        self._base_boards: Dict[str, Optional[Dict[str, Any]]] = {}
+        # agent -> {square index: fill record}
+        self._fills: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # agent -> bitmask of filled squares / completed line names
+        self._masks: Dict[str, int] = {}
+        self._lines: Dict[str, List[str]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self.target_bingos = cfg.experiment.get("target_bingos")
+        self.fill_log_path = os.path.join(cfg.paths.outputs_dir, FILL_LOG)
+        if os.path.exists(self.fill_log_path):
+            self._replay(self.fill_log_path)
+        self._fill_log = None
+
+    def _replay(self, path: str):
+        """Rebuild the overlay from an existing fill log"""
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._fills.setdefault(record["agent"], {})[record["square"]] = record
+                    self._lines.setdefault(record["agent"], []).extend(record.get("completed_lines", []))
+
+    def set_step(self, step: Optional[int]):
+        """Time step recorded with subsequent fills"""
+        self.step = step
+
+    def _load_board(self, path: str) -> Dict[str, Any]:
+        """Load a board file, timed under io.bingo.read"""
+        with metrics.timer("io.bingo.read"):
+            with open(path, "r") as f:
+                return json.load(f)
+
+    def _base_board(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """Read-only source board, loaded once per agent"""
+        if agent_name not in self._base_boards:
+            board = None
+            if self.bundle is not None:
+                with metrics.timer("io.bingo.read"):
+                    board = self.bundle.board(agent_name)
+            else:
+                path = os.path.join(self.cfg.paths.bingo_board_dir, f"{agent_name}.json")
+                if os.path.exists(path):
+                    board = normalize_board(self._load_board(path))
+            self._base_boards[agent_name] = board
+        return self._base_boards[agent_name]
 
+    def _is_filled(self, agent_name: str, index: int, square: Dict[str, Any]) -> bool:
+        return index in self._fills.get(agent_name, {}) or bool(square.get("filled"))
+
+    def _board_mask(self, agent_name: str, base: Dict[str, Any]) -> int:
+        """Bitmask of the agent's filled squares, built once from the base board and overlay"""
+        mask = self._masks.get(agent_name)
+        if mask is None:
+            mask = 0
+            for index, square in enumerate(base["squares"]):
+                if self._is_filled(agent_name, index, square):
+                    mask |= 1 << index
+            self._masks[agent_name] = mask
+        return mask
+
+    #######################
+    # Bingo events
+    #######################
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call `callback(event)` for every completed line"""
+        self._subscribers.append(callback)
+
+    def completed_lines(self, agent_name: str) -> List[str]:
+        return list(self._lines.get(agent_name, []))
+
+    def bingo_count(self) -> int:
+        """Number of agents with at least one completed line"""
+        return sum(1 for lines in self._lines.values() if lines)
+
+    def target_reached(self) -> bool:
+        """True once experiment.target_bingos agents have a bingo"""
+        return bool(self.target_bingos) and self.bingo_count() >= self.target_bingos
+
+    def _check_lines(self, agent_name: str, base: Dict[str, Any], index: int, partner: str) -> List[str]:
+        """Set the square's bit and return the lines it completed, publishing an event for each"""
+        mask = self._board_mask(agent_name, base) | (1 << index)
+        self._masks[agent_name] = mask
+        _, by_square = line_masks(*board_shape(base))
+        completed = [name for name, line in by_square[index] if mask & line == line]
+
+        for name in completed:
+            first = not self._lines.get(agent_name)
+            self._lines.setdefault(agent_name, []).append(name)
+            event = {"agent": agent_name, "line": name, "partner": partner, "step": self.step, "first": first}
+            self.events.append(event)
+            metrics.count("bingo.lines_completed")
+            if first:
+                metrics.count("bingo.first_bingos")
+            for callback in self._subscribers:
+                callback(event)
+        return completed
 
     def get_agent_bingo(self, agent_name: str) -> Dict[str, Any]:
-        """Get an agent's bingo board"""
-        path = os.path.join(self.cfg.paths.bingo_output_dir, f"{agent_name}.json")
-        if not os.path.exists(path):
+        """Get an agent's bingo board with its fills applied"""
+        base = self._base_board(agent_name)
+        if base is None:
             return
-        with open(path, "r") as f:
-            return json.load(f)
+        fills = self._fills.get(agent_name, {})
+        squares = []
+        for index, square in enumerate(base["squares"]):
+            fill = fills.get(index)
+            if fill is not None:
+                square = {**square, "filled": True, "matched_with": fill["partner"],
+                          "response_snippet": fill["snippet"]}
+            squares.append(square)
+        return {**base, "squares": squares}
         
     def get_agent_board_state(self, agent_name: str) -> Dict[str, Any]:
         """Get an agent's bingo board state"""
-        path = os.path.join(self.cfg.paths.bingo_output_dir, f"{agent_name}.json")
-        if not os.path.exists(path):
+        base = self._base_board(agent_name)
+        if base is None:
             return
-        with open(path, "r") as f:
-            board = json.load(f)
         
-        total_squares = len(board["squares"])
-        filled_squares = 0
-        for square in board["squares"]:
-            if square["filled"] != False:
-                filled_squares += 1
+        total_squares = len(base["squares"])
+        filled_squares = sum(
+            1 for index, square in enumerate(base["squares"]) if self._is_filled(agent_name, index, square)
+        )
         
         return {
             "filled_squares": filled_squares,
@@ -64,17 +239,12 @@ class BingoManager:
         Update an agent's bingo board based on their response and conversation context.
         Only updates if there's a meaningful match between the clue and response.
         """
-        path = os.path.join(self.cfg.paths.bingo_output_dir, f"{agent_name}.json")
-        if not os.path.exists(path):
+        base = self._base_board(agent_name)
+        if base is None:
             return
 
-        with open(path, "r") as f:
-            board = json.load(f)
-
-        updated = False
-        # Board structure is now a flat list of squares
-        for square in board["squares"]:
-            if not square.get("filled"):
+        for index, square in enumerate(base["squares"]):
+            if not self._is_filled(agent_name, index, square):
                 clue = square.get("text", "").lower()
                 
                 # Skip very short clues as they're likely to cause false positives
@@ -86,13 +256,49 @@ class BingoManager:
                     if len(response.split()) < 5:
                         continue
                         
-                    square["filled"] = True
-                    square["matched_with"] = matched_agent
-                    square["response_snippet"] = response
-                    updated = True
-                    print(f"Match found for '{clue}' in response")
+                    console.debug("Match found for '%s' in response", clue)
+                    self._record_fill(agent_name, index, matched_agent, response)
                     break  # Only fill one square per response
 
-        if updated:
-            with open(path, "w") as f:
-                json.dump(board, f, indent=2)
\ No newline at end of file
+    def _record_fill(self, agent_name: str, index: int, partner: str, snippet: str):
+        """Append a fill to the log and the in-memory overlay"""
+        record = {"agent": agent_name, "square": index, "partner": partner, "snippet": snippet, "step": self.step}
+        self._fills.setdefault(agent_name, {})[index] = record
+        completed = self._check_lines(agent_name, self._base_board(agent_name), index, partner)
+        if completed:
+            record["completed_lines"] = completed
+        metrics.count("bingo.squares_filled")
+        with metrics.timer("io.bingo.write"):
+            if self._fill_log is None:
+                self._fill_log = open(self.fill_log_path, "a", encoding="utf-8")
+            self._fill_log.write(json.dumps(record) + "\n")
+            self._fill_log.flush()
+
+    def get_fills(self, agent_name: str) -> List[Dict[str, Any]]:
+        """Fill records for an agent, in square order"""
+        return [self._fills[agent_name][index] for index in sorted(self._fills.get(agent_name, {}))]
+
+    def materialize(self, agent_names: Optional[List[str]] = None, output_dir: Optional[str] = None) -> List[str]:
+        """
+        Write final boards (source board plus fills) as <name>.json.
+        Defaults to every agent with at least one fill, written to bingo_output_dir.
+        """
+        output_dir = output_dir or self.cfg.paths.bingo_output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for agent_name in (agent_names if agent_names is not None else sorted(self._fills)):
+            board = self.get_agent_bingo(agent_name)
+            if board is None:
+                continue
+            path = os.path.join(output_dir, f"{agent_name}.json")
+            with metrics.timer("io.bingo.write"):
+                with open(path, "w") as f:
+                    json.dump(board, f, indent=2)
+            paths.append(path)
+        return paths
+
+    def close(self):
+        """Close the fill log"""
+        if self._fill_log is not None:
+            self._fill_log.close()
+            self._fill_log = None
@@ -1,80 +1,145 @@
 import os
+import json
 import time
-from typing import Dict, List, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
 from omegaconf import DictConfig
 import re
 
-from utils.log_memory import log_conversation, generate_conversation_id, digest_conversation, global_token_counter
+from utils.log_memory import log_conversation, generate_conversation_id, digest_conversation
+from utils.model_router import router
 from core.agent_manager import AgentManager
-from core.bingo_manager import BingoManager
+from core.bingo_manager import BingoManager, split_bingo_claim
 from core.memory_manager import MemoryManager
+from core.memory_consolidator import MemoryConsolidator
+from core.director import TurnDirector, TURN_MODES
+from core.coordinator import Coordinator
+from utils.context_assembler import ContextAssembler
 from environments.base_environment import BaseEnvironment
+from environments.time_dependent import TimeDependentEnvironment
+from utils.console import console, INFO, DEBUG
+from utils.metrics import metrics
+from utils.profiler import profiler
 
 class ConversationManager:
     def __init__(self, cfg: DictConfig, agent_manager: AgentManager, bingo_manager: BingoManager, environment: BaseEnvironment, token_counter=None):
         self.cfg = cfg
         self.agent_manager = agent_manager
+        self.settings = agent_manager.settings
         self.bingo_manager = bingo_manager
         self.environment = environment
         self.memory_manager = MemoryManager(cfg)
         self.token_counter = token_counter
-        
-        # Set the global token counter for log_memory.py
-        global global_token_counter
-        global_token_counter = token_counter
-
-    def safe_digest_conversation(self, prev_digest: str, history: str) -> str:
-        """Safely digest conversation with retry logic"""
-        max_retries = self.cfg.conversation.conversation.digest.max_retries
-        base_delay = self.cfg.conversation.conversation.digest.delay
+        self.memory_consolidator = MemoryConsolidator(cfg, self.memory_manager, self.settings, token_counter)
+        context_settings = cfg.conversation.conversation.get("context", {})
+        self.context_assembler = ContextAssembler(
+            max_tokens=context_settings.get("max_tokens", 600),
+            window=context_settings.get("window", 6)
+        )
+        self.bingo_manager.subscribe(self.on_bingo)
+        # Serializes bingo and memory writes when a round's conversations run concurrently
+        self._state_lock = threading.Lock()
+        self.step_exchanges = 0  # Exchanges finished in the current time step
+        self.turn_mode = self.settings.turn_mode
+        if self.turn_mode not in TURN_MODES:
+            raise ValueError(f"Unknown turn mode: {self.turn_mode}. Available modes: {TURN_MODES}")
+        self.director = TurnDirector(cfg, agent_manager) if self.turn_mode == "director" else None
+        # Time-stepped runs can hand their pair-steps to conversation workers (worker.py)
+        self.coordinator = Coordinator(cfg, self) if cfg.get("cluster", {}).get("enabled", False) else None
+
+    def on_bingo(self, event: Dict[str, Any]):
+        """Announce completed bingo lines"""
+        if event["first"]:
+            console.notice("🏆 BINGO! %s completed %s with %s (step %s)", event["agent"], event["line"], event["partner"], event["step"])
+        else:
+            console.info("🏆 %s completed another line: %s", event["agent"], event["line"])
+
+    def safe_digest_conversation(self, prev_digest: str, history: str, agent: str = None, partner: str = None) -> str:
+        """Safely digest conversation with retry logic; token usage is attributed to the given pair"""
+        max_retries = self.settings.digest_max_retries
+        base_delay = self.settings.digest_delay
         
         for attempt in range(max_retries):
             try:
-                digest = digest_conversation(prev_digest, history)
+                with metrics.timer("llm.digest"):
+                    digest = digest_conversation(prev_digest, history)
+                metrics.count("llm.digest.calls")
                 if self.token_counter:
                     self.token_counter.add_api_call(
                         prompt=f"Previous: {prev_digest}\nHistory: {history}",
-                        response=digest.content if hasattr(digest, 'content') else str(digest)
+                        response=digest,
+                        call_type="digest", agent=agent, partner=partner, model=router.route("digest").model
                     )
-                time.sleep(base_delay)
+                metrics.sleep(base_delay, "sleep.throttle")
                 return digest.content if hasattr(digest, 'content') else str(digest)
             except Exception as e:
+                metrics.count("llm.digest.errors")
                 wait_time = base_delay * (attempt + 1)
                 if "429" in str(e) or "quota" in str(e).lower():
-                    print(f"Rate limit hit during digestion, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    metrics.count("llm.rate_limited")
+                    console.warning("Rate limit hit during digestion, waiting %s seconds...", wait_time)
+                    metrics.sleep(wait_time, "sleep.backoff")
                 else:
-                    print(f"Error digesting conversation on attempt {attempt + 1}: {e}")
-                    time.sleep(wait_time)
+                    console.warning("Error digesting conversation on attempt %d: %s", attempt + 1, e)
+                    metrics.sleep(wait_time, "sleep.backoff")
                 
                 # On last attempt, try one final time with increased timeout
                 if attempt == max_retries - 1:
                     try:
-                        time.sleep(wait_time * 2)  # Double the wait time for final attempt
-                        digest = digest_conversation(prev_digest, history)
+                        metrics.sleep(wait_time * 2, "sleep.backoff")  # Double the wait time for final attempt
+                        with metrics.timer("llm.digest"):
+                            digest = digest_conversation(prev_digest, history)
+                        if self.token_counter:
+                            self.token_counter.add_api_call(
+                                prompt=f"Previous: {prev_digest}\nHistory: {history}",
+                                response=digest,
+                                call_type="digest", agent=agent, partner=partner, model=router.route("digest").model
+                            )
                         return digest.content if hasattr(digest, 'content') else str(digest)
                     except Exception as final_e:
-                        print(f"Final attempt failed: {final_e}")
+                        console.error("Final attempt failed: %s", final_e)
                         raise Exception("Failed to generate conversation digest after all retries")
         
         raise Exception("Failed to generate conversation digest after all retries")
 
-    def generate_long_term_memory(self, agent_id: str, other_agent_id: str, full_history: List[Dict[str, str]]) -> str:
-        """Generate long-term memory entry from conversation history"""
-        history_text = "\n".join([f"{k}: {v}" for turn in full_history for k, v in turn.items()])
-        memory_prompt = f"I just talked to {other_agent_id} and this is all that happened:\n{history_text}\n\nI need to condense this into a summary of what I learned about them, focusing on their personality, interests, and any important information they shared. Summary:"
-        
-        try:
-            memory = digest_conversation("", memory_prompt)
-            if self.token_counter:
-                self.token_counter.add_api_call(
-                    prompt=memory_prompt,
-                    response=memory.content if hasattr(memory, 'content') else str(memory)
-                )
-            return memory.content if hasattr(memory, 'content') else str(memory)
-        except Exception as e:
-            print(f"Error generating long-term memory: {e}")
-            return f"Had a conversation with {other_agent_id}. Unable to generate detailed memory due to error."
+    def untimed_values(self, history: List[Dict[str, str]], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Prompt values of an untimed conversation; these environments have no steps or partner history, and their context may override them"""
+        return {
+            "time_step": 1,
+            "max_time_steps": 1,
+            "messages_exchanged": len(history),
+            "max_messages": self.settings.turns_per_conversation,
+            "past_partners_agent1": set(),
+            "past_partners_agent2": set(),
+            "last_exchange": history[-1] if history else "",
+            **context,
+        }
+
+    def direct_single_exchange(self, name1: str, name2: str, history: List[Dict[str, str]], context: Dict[str, Any],
+                               conversation_digest: str) -> Optional[Dict[str, str]]:
+        """direct_exchange for untimed conversations; None means fall back to one call per speaker"""
+        for name in (name1, name2):
+            if not self.agent_manager.get_agent(name):
+                return None
+        values = {**self.untimed_values(history, context), "conversation_summary": conversation_digest}
+        for suffix, name in (("1", name1), ("2", name2)):
+            board_state = self.bingo_manager.get_agent_board_state(name)
+            values[f"personality{suffix}"] = self.agent_manager.get_agent(name)["personality"]
+            values[f"board{suffix}"] = self.bingo_manager.get_agent_bingo(name)
+            values[f"num_filled_squares{suffix}"] = board_state["filled_squares"]
+            values[f"num_unfilled_squares{suffix}"] = board_state["unfilled_squares"]
+        return self.director.generate(name1, name2, **values)
+
+    def record_single_turn(self, speaker: str, listener: str, response: str, turn_responses: Dict[str, str]):
+        """Log one message of an untimed conversation and apply it to bingo and short-term memory"""
+        console.info("%s: %s", speaker, response)
+        turn_responses[speaker] = response
+        # Other pairs of the round may be writing the fill log and memory archive too
+        with self._state_lock:
+            self.bingo_manager.update_agent_bingo(speaker, response, matched_agent=listener)
+            # Update short-term memory for both agents
+            self.memory_manager.update_short_term_memory(speaker, listener, {speaker: response})
 
     def simulate_single_conversation(self, name1: str, name2: str) -> List[Dict[str, str]]:
         """Simulate a conversation between two agents"""
@@ -85,38 +150,41 @@ class ConversationManager:
             turn_responses = {}
             context = self.environment.get_conversation_context(name1, name2, history)
 
-            for speaker, listener in [(name1, name2), (name2, name1)]:
+            # A single director call writes both messages, otherwise (or if it fails) each speaker gets their own call
+            speakers = [(name1, name2), (name2, name1)]
+            directed = self.direct_single_exchange(name1, name2, history, context, conversation_digest) \
+                if self.director else None
+            if directed:
+                for speaker, listener in speakers:
+                    self.record_single_turn(speaker, listener, directed[speaker], turn_responses)
+                speakers = []
+
+            for speaker, listener in speakers:
                 agent_data = self.agent_manager.get_agent(speaker)
                 if not agent_data:
                     continue
 
+                board_state = self.bingo_manager.get_agent_board_state(speaker)
                 prompt = self.agent_manager.prompt_template.format(
                     name=speaker,
                     personality=agent_data["personality"],
                     other_name=listener,
                     conversation_summary=conversation_digest,
-                    **context
+                    agent_curr_bingo_board=self.bingo_manager.get_agent_bingo(speaker),
+                    num_filled_squares=board_state["filled_squares"],
+                    num_unfilled_squares=board_state["unfilled_squares"],
+                    **self.untimed_values(history, context)
                 )
 
                 try:
-                    prompt_tokens = len(str(prompt)) // 4
-                    print(f"🗣️  {speaker} submitting prompt with ~{prompt_tokens} tokens...")
-                    response = self.agent_manager.safe_get_response(agent_data["agent"], prompt)
+                    console.debug(lambda: f"🗣️  {speaker} submitting prompt with ~{len(str(prompt)) // 4} tokens...")
+                    response = self.agent_manager.safe_get_response(agent_data["agent"], prompt, speaker=speaker, listener=listener)
                     if response:
-                        print(f"{speaker}: {response}")
-                        turn_responses[speaker] = response
-                        self.bingo_manager.update_agent_bingo(speaker, response, matched_agent=listener)
-                        
-                        # Update short-term memory for both agents
-                        self.memory_manager.update_short_term_memory(speaker, listener, {speaker: response})
-                        
-                        # Track token usage
-                        if self.token_counter:
-                            self.token_counter.add_api_call(prompt=prompt, response=response)
+                        self.record_single_turn(speaker, listener, response, turn_responses)
                     else:
                         break
                 except Exception as e:
-                    print(f"Error during {speaker}'s turn: {e}")
+                    console.error("Error during %s's turn: %s", speaker, e)
                     break
 
             if turn_responses:
@@ -126,30 +194,82 @@ class ConversationManager:
                     # conversation_digest = self.safe_digest_conversation(conversation_digest, turn_text)
                     conversation_digest = "Some digest"
                 except Exception as e:
-                    print(f"Failed to update digest: {e}")
+                    console.warning("Failed to update digest: %s", e)
 
-        # At the end of conversation, update long-term memory and clear short-term
-        for agent_id, other_agent_id in [(name1, name2), (name2, name1)]:
-            # Generate and store long-term memory
-            memory_summary = self.generate_long_term_memory(agent_id, other_agent_id, history)
-            self.memory_manager.update_long_term_memory(agent_id, other_agent_id, memory_summary)
-            # Clear short-term memory
-            self.memory_manager.clear_short_term_memory(agent_id)
+        # At the end of conversation, store both agents' long-term memories and clear short-term
+        self.memory_consolidator.consolidate(name1, name2, history)
+        with self._state_lock:
+            for agent_id in (name1, name2):
+                self.memory_manager.clear_short_term_memory(agent_id)
 
         return history
 
+    def apply_bingo_claim(self, speaker: str, listener: str, response: str) -> str:
+        """Strip a <FILL IN BINGO> claim from the response and fill the square if the conversation supports it"""
+        # Strip out bingo tags if present
+        response, bingo_text = split_bingo_claim(response)
+        if bingo_text is not None:
+            # Check if there's a meaningful context for the bingo filling
+            should_update = True
+
+            # Get conversation history
+            short_term_mem = self.memory_manager.get_short_term_memory(speaker)
+
+            # If this is the first exchange, don't allow bingo filling
+            if not short_term_mem or len(short_term_mem['current_conversation']['exchanges']) <= 1:
+                console.debug("⚠️ %s attempted to fill bingo too early in the conversation. Ignoring.", speaker)
+                should_update = False
+            else:
+                # Get the last exchange from the other participant
+                last_exchanges = short_term_mem['current_conversation']['exchanges']
+                other_participant_messages = []
+
+                # Collect the last 2 messages from the other participant
+                for exchange in reversed(last_exchanges):
+                    if listener in exchange:
+                        other_participant_messages.append(exchange[listener])
+                        if len(other_participant_messages) >= 2:
+                            break
+
+                # Check if the bingo text is related to what the other participant said
+                if not other_participant_messages:
+                    console.debug("⚠️ No previous messages from %s found. Ignoring bingo attempt.", listener)
+                    should_update = False
+                else:
+                    # Combine the other participant's messages
+                    other_text = " ".join(other_participant_messages)
+
+                    # Check for keyword overlap between bingo text and other's messages
+                    bingo_keywords = [w.lower() for w in re.findall(r"\b\w+\b", bingo_text) if len(w) > 3]
+                    other_keywords = [w.lower() for w in re.findall(r"\b\w+\b", other_text) if len(w) > 3]
+
+                    # Calculate overlap
+                    overlap = [w for w in bingo_keywords if w in other_keywords]
+
+                    if len(overlap) < 2 and (len(bingo_keywords) == 0 or len(overlap) / len(bingo_keywords) < 0.2):
+                        console.debug("⚠️ Bingo attempt by %s doesn't match conversation context. Ignoring.", speaker)
+                        should_update = False
+
+            # Only update if there's a meaningful context
+            if should_update:
+                self.bingo_manager.update_agent_bingo(speaker, bingo_text, matched_agent=listener)
+                console.info("✅ Bingo board updated for %s with the content: %s", speaker, bingo_text)
+        return response
+
     def print_conversation_header(self, agent1: str, agent2: str, is_new: bool, time_step: int = None, max_steps: int = None):
         """Print a formatted conversation header"""
+        if not console.enabled(INFO):
+            return
         border = "=" * 60
         if time_step is not None:
-            print(f"\n{border}")
-            print(f"Time Step: {time_step}/{max_steps}".center(60))
-            print(border)
+            console.info(f"\n{border}")
+            console.info(f"Time Step: {time_step}/{max_steps}".center(60))
+            console.info(border)
         
         status = "New Conversation" if is_new else "Resuming Conversation"
-        print(f"\n{'🗣️  ' + status + ' 🗣️':^60}")
-        print(f"{'Between ' + agent1 + ' and ' + agent2:^60}")
-        print("-" * 60)
+        console.info(f"\n{'🗣️  ' + status + ' 🗣️':^60}")
+        console.info(f"{'Between ' + agent1 + ' and ' + agent2:^60}")
+        console.info("-" * 60)
 
     def format_message(self, speaker: str, message: str) -> str:
         """Format a single message with proper indentation and structure"""
@@ -176,9 +296,16 @@ class ConversationManager:
         agent1_insights = agent1_memory.get("agent_insights", {}).get(agent2, "")
         agent2_insights = agent2_memory.get("agent_insights", {}).get(agent1, "")
 
-        # Get current short-term memory
+        # Get current short-term memory. Nothing to digest for a fresh conversation, and
+        # exchanges consolidated at the end of the last time step are already in the insights.
         agent1_memory = self.memory_manager.get_short_term_memory(agent1)
-        conversation_summary = self.safe_digest_conversation(agent1_insights, agent1_memory["current_conversation"]["exchanges"])
+        exchanges = agent1_memory["current_conversation"]["exchanges"]
+        if exchanges and agent1_memory["current_conversation"]["partner"] == agent2:
+            self.context_assembler.seed(agent1, agent2, exchanges)
+        if not exchanges or self.memory_consolidator.get_cached(agent1, agent2, exchanges) is not None:
+            conversation_summary = ""
+        else:
+            conversation_summary = self.safe_digest_conversation(agent1_insights, exchanges, agent1, agent2)
         
         return {
             "conversation_summary": conversation_summary,
@@ -188,8 +315,55 @@ class ConversationManager:
             
         }
 
+    def direct_exchange(self, agent1: str, agent2: str, memory: Dict[str, str], time_step: int, max_time_steps: int) -> Optional[Dict[str, str]]:
+        """Both messages of the next exchange from one director call; None means fall back to one call per speaker"""
+        for name in (agent1, agent2):
+            if not self.agent_manager.get_agent(name):
+                return None
+        with metrics.timer("prompt.build"):
+            short_term_mem = self.memory_manager.get_short_term_memory(agent1)
+            exchanges = short_term_mem['current_conversation']['exchanges']
+            values = {
+                "conversation_summary": self.context_assembler.build(agent1, agent2, memory),
+                "time_step": time_step,
+                "max_time_steps": max_time_steps,
+                "messages_exchanged": self.environment.agent_states[agent1].messages_in_current_conversation,
+                "max_messages": self.settings.messages_per_time_step,
+                "past_partners_agent1": self.environment.agent_states[agent1].past_partners,
+                "past_partners_agent2": self.environment.agent_states[agent2].past_partners,
+                "last_exchange": exchanges[-1] if exchanges else "",
+            }
+            for suffix, name in (("1", agent1), ("2", agent2)):
+                board_state = self.bingo_manager.get_agent_board_state(name)
+                values[f"personality{suffix}"] = self.agent_manager.get_agent(name)["personality"]
+                values[f"board{suffix}"] = self.bingo_manager.get_agent_bingo(name)
+                values[f"num_filled_squares{suffix}"] = board_state["filled_squares"]
+                values[f"num_unfilled_squares{suffix}"] = board_state["unfilled_squares"]
+        return self.director.generate(agent1, agent2, **values)
+
+    def finish_exchange(self, agent1: str, agent2: str, turn_responses: Dict[str, str]) -> bool:
+        """Record a completed exchange in memory and the environment; returns whether the conversation ended"""
+        # Update memory after each exchange
+        self.update_conversation_memory(agent1, agent2, turn_responses)
+        
+        # Check if any response has end marker
+        conversation_ended = False
+        for response in turn_responses.values():
+            if "<END OF CONVERSATION>" in response:
+                conversation_ended = True
+                if console.enabled(INFO):
+                    speaker_mem = self.memory_manager.get_short_term_memory(agent1) or self.memory_manager.get_short_term_memory(agent2)
+                    exchanges = len(speaker_mem['current_conversation']['exchanges']) if speaker_mem else 'unknown'
+                    console.info("\n🏁 Conversation naturally ended after %s exchanges", exchanges)
+        
+        # Update agent states
+        self.environment.update_agent_states(agent1, agent2, ended=conversation_ended)
+        self.step_exchanges += 1
+        return conversation_ended
+
     def update_conversation_memory(self, agent1: str, agent2: str, exchange: Dict[str, str], ended: bool = False):
         """Update memory after each exchange"""
+        self.context_assembler.add_exchange(agent1, agent2, exchange)
         self.memory_manager.update_short_term_memory(agent1, agent2, exchange)
 
         # Update agent2's memory  
@@ -213,219 +387,223 @@ class ConversationManager:
             # Get the full conversation history
             exchanges = memory["current_conversation"]["exchanges"]
             if exchanges:
-                # Generate a summary of the conversation so far
-                conversation_text = "\n".join([
-                    f"{k}: {v}" for exchange in exchanges for k, v in exchange.items()
-                ])
-                try:
-                    summary = self.safe_digest_conversation("", conversation_text)
-                    summary_text = summary.content if hasattr(summary, 'content') else str(summary)
-                except Exception as e:
-                    print(f"Error generating conversation summary: {e}")
-                    summary_text = f"Conversation with {len(exchanges)} exchanges"
-                
-                # Update long-term memory for both agents
-                self.memory_manager.update_long_term_memory(agent_name, partner, summary_text)
-                self.memory_manager.update_long_term_memory(partner, agent_name, summary_text)
+                # Summarize the conversation so far from both perspectives; skipped if
+                # these exchanges were already consolidated in an earlier time step
+                self.memory_consolidator.consolidate(agent_name, partner, exchanges)
                 
                 # Only clear short-term memory if conversation ended
                 if any("<END OF CONVERSATION>" in resp for exchange in exchanges for resp in exchange.values()):
                     self.memory_manager.clear_short_term_memory(agent_name)
                     self.memory_manager.clear_short_term_memory(partner)
+                    self.context_assembler.reset(agent_name, partner)
+
+    def record_step(self, step: int, pairs: List[tuple], started: float, stall: Optional[str] = None):
+        """Record the step's utilization (agents in a conversation / all agents) in metrics and steps.jsonl"""
+        total_agents = len(self.environment.agent_states)
+        active = 2 * len(pairs)
+        utilization = active / total_agents if total_agents else 0.0
+        metrics.observe("env.utilization", utilization)
+        record = {
+            "step": step,
+            "pairs": len(pairs),
+            "active_agents": active,
+            "idle_agents": total_agents - active,
+            "utilization": round(utilization, 4),
+            "exchanges": self.step_exchanges,
+            "seconds": round(time.perf_counter() - started, 3),
+            "stall": stall,
+        }
+        with open(os.path.join(self.cfg.paths.outputs_dir, "steps.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
 
     def simulate_conversations(self) -> List[Dict[str, Any]]:
         """Simulate multiple conversations between different agent pairs"""
-        conversation_pairs = self.environment.get_conversation_pairs()
+        time_dependent = isinstance(self.environment, TimeDependentEnvironment)
+        with metrics.timer("env.pairing"):
+            # Untimed environments schedule pairs lazily, so only count them here
+            total_pairs = len(self.environment.get_conversation_pairs()) if time_dependent \
+                else self.environment.count_conversation_pairs()
         conversation_count = 0
         all_histories = []
 
-        print(f"\n{'📊 Simulation Overview 📊':^60}")
-        print("=" * 60)
-        print(f"Total possible conversations: {len(conversation_pairs)}")
-
-        if self.cfg.environment.type != "time_dependent":
-            for agent1, agent2 in conversation_pairs:
-                if conversation_count >= self.cfg.conversation.conversation.max_total_conversations:
-                    break
+        console.info(f"\n{'📊 Simulation Overview 📊':^60}")
+        console.info("=" * 60)
+        console.info("Total possible conversations: %d", total_pairs)
 
-                self.print_conversation_header(agent1, agent2, True)
-                history = self.simulate_single_conversation(agent1, agent2)
+        if not time_dependent:
+            limit = min(total_pairs, self.settings.max_total_conversations)
+            console.start_progress(limit, "Conversations")
+            rounds = 0
+            # Pairs within a round are disjoint, so their conversations run side by side
+            with ThreadPoolExecutor(max_workers=self.settings.max_concurrent_conversations,
+                                    thread_name_prefix="conversation") as pool:
+                for pairs in self.environment.get_conversation_rounds():
+                    pairs = pairs[:limit - conversation_count]
+                    if not pairs:
+                        break
+                    for agent1, agent2 in pairs:
+                        self.print_conversation_header(agent1, agent2, True)
+                    histories = pool.map(lambda pair: self.simulate_single_conversation(*pair), pairs)
 
-                # Save conversation
-                pair_id = f"{agent1}_{agent2}_{generate_conversation_id()[:8]}"
-                pair_log_path = os.path.join(self.cfg.paths.outputs_dir, f"conversation_{pair_id}.json")
-                log_conversation(pair_id, history, pair_log_path)
-                print(f"\n📝 Conversation saved to: {pair_log_path}")
+                    for (agent1, agent2), history in zip(pairs, histories):
+                        # Save conversation
+                        pair_id = f"{agent1}_{agent2}_{generate_conversation_id()[:8]}"
+                        pair_log_path = os.path.join(self.cfg.paths.outputs_dir, f"conversation_{pair_id}.json")
+                        log_conversation(pair_id, history, pair_log_path)
+                        console.info("\n📝 Conversation saved to: %s", pair_log_path)
 
-                all_histories.append({
-                    "pair": (agent1, agent2),
-                    "dialogue": history
-                })
-                conversation_count += 1
+                        all_histories.append({
+                            "pair": (agent1, agent2),
+                            "dialogue": history
+                        })
+                        conversation_count += 1
+                        console.advance()
+                    rounds += 1
+                    metrics.count("env.rounds")
+                    profiler.step(rounds)
+                    if self.bingo_manager.target_reached():
+                        console.notice("\n🏁 Target of %d bingos reached, stopping early", self.bingo_manager.target_bingos)
+                        break
+            console.stop_progress()
         else:
-            print("\n=== Starting Time-Dependent Environment Simulation ===")
-            max_time_steps = self.cfg.environment.settings.time_dependent.max_time_steps
+            console.info("\n=== Starting Time-Dependent Environment Simulation ===")
+            max_time_steps = self.settings.max_time_steps
+            console.start_progress(max_time_steps, "Time steps")
+            silent_steps = 0  # Steps in a row whose pairs exchanged no messages
             
             for t in range(max_time_steps):
+                step_started = time.perf_counter()
+                self.step_exchanges = 0
                 self.environment.start_new_time_step()
-                print(f"\n--- Time Step {t + 1}/{max_time_steps} ---")
+                self.bingo_manager.set_step(t + 1)
+                console.info("\n--- Time Step %d/%d ---", t + 1, max_time_steps)
+                
+                with metrics.timer("env.pairing"):
+                    current_pairs = self.environment.get_conversation_pairs()
+                metrics.count("env.pairs", len(current_pairs))
                 
-                current_pairs = self.environment.get_conversation_pairs()
+                if not current_pairs and not self.environment.experiment_complete:
+                    recoverable, stall = self.environment.explain_stall()
+                    self.record_step(t + 1, current_pairs, step_started, stall)
+                    if not recoverable:
+                        console.notice("\n🧱 No conversation can start at step %d: %s; stopping early", t + 1, stall)
+                        break
+                    # Nothing to run, summarize or report; move straight on to the next step
+                    metrics.count("env.fast_forwarded_steps")
+                    console.info("⏩ No pairs this step (%s), fast-forwarding", stall)
+                    console.advance()
+                    continue
                 
-                for agent1, agent2 in current_pairs:
-                    print(f"Delaying conversation between {agent1} and {agent2} for 10 seconds.")
-                    time.sleep(10)
+                local_pairs = current_pairs
+                if self.coordinator:
+                    self.coordinator.run_step(current_pairs, t + 1, max_time_steps)
+                    local_pairs = []
+                
+                for agent1, agent2 in local_pairs:
+                    console.debug("Delaying conversation between %s and %s for 10 seconds.", agent1, agent2)
+                    metrics.sleep(10, "sleep.pair_delay")
                     # Get memory context
                     memory = self.get_memory_context(agent1, agent2)
                     if memory["conversation_summary"]:
-                        print(f"\n📜 Previous conversation context:")
-                        print(memory["conversation_summary"])
+                        console.debug("\n📜 Previous conversation context:\n%s", memory["conversation_summary"])
                     
                     # Continue conversation while within time step limit
                     while self.environment.should_continue_conversation(agent1, agent2):
-                        # Simulate one exchange
+                        # Simulate one exchange: a single director call writes both messages,
+                        # otherwise (or if it fails) each speaker gets their own call
                         turn_responses = {}
+                        directed = self.direct_exchange(agent1, agent2, memory, t + 1, max_time_steps) if self.director else None
+                        speakers = [(agent1, agent2), (agent2, agent1)]
+                        if directed:
+                            for speaker, listener in speakers:
+                                response = self.apply_bingo_claim(speaker, listener, directed[speaker])
+                                console.info(lambda: "\n" + self.format_message(speaker, f"{speaker}: {response}"))
+                                turn_responses[speaker] = response
+                            speakers = []
                         
-                        for speaker, listener in [(agent1, agent2), (agent2, agent1)]:
+                        for speaker, listener in speakers:
                             agent_data = self.agent_manager.get_agent(speaker)
                             if not agent_data:
                                 continue
                             
-                            short_term_mem = self.memory_manager.get_short_term_memory(speaker)
-                            last_exchange = short_term_mem['current_conversation']['exchanges'][-1] if len(short_term_mem['current_conversation']['exchanges']) > 0 else ""
+                            with metrics.timer("prompt.build"):
+                                short_term_mem = self.memory_manager.get_short_term_memory(speaker)
+                                last_exchange = short_term_mem['current_conversation']['exchanges'][-1] if len(short_term_mem['current_conversation']['exchanges']) > 0 else ""
                             
-                            # Build prompt with memory context
-                            memory_context = ""
-                            if memory["previous_insights_about_partner"]:
-                                memory_context += f"\nWhat you know about {listener}: {memory['previous_insights_about_partner']}"
-                            if memory["partner_previous_insights"]:
-                                memory_context += f"\nWhat {listener} knows about you: {memory['partner_previous_insights']}"
-                            if memory["conversation_summary"]:
-                                memory_context += f"\n\nPrevious conversation:\n{memory['conversation_summary']}"
+                                # Insights, digest and recent turns packed into the context token budget
+                                memory_context = self.context_assembler.build(speaker, listener, memory, turn_responses)
                             
-                            memory_context += f"\n\nThe conversation till this point:\n {last_exchange}\n{turn_responses}"
+                                prompt = self.agent_manager.prompt_template.format(
+                                    agent_curr_bingo_board=self.bingo_manager.get_agent_bingo(speaker),
+                                    num_filled_squares = self.bingo_manager.get_agent_board_state(speaker)["filled_squares"],
+                                    num_unfilled_squares = self.bingo_manager.get_agent_board_state(speaker)["unfilled_squares"],
+                                    name=speaker,
+                                    personality=agent_data["personality"],
+                                    other_name=listener,
+                                    conversation_summary=memory_context,
+                                    time_step=t + 1,
+                                    max_time_steps=max_time_steps,
+                                    messages_exchanged=self.environment.agent_states[speaker].messages_in_current_conversation,
+                                    max_messages=self.settings.messages_per_time_step,
+                                    past_partners_agent1=self.environment.agent_states[speaker].past_partners,
+                                    past_partners_agent2=self.environment.agent_states[listener].past_partners,
+                                    last_exchange=last_exchange
+                                )
                             
-                            prompt = self.agent_manager.prompt_template.format(
-                                agent_curr_bingo_board=self.bingo_manager.get_agent_bingo(speaker),
-                                num_filled_squares = self.bingo_manager.get_agent_board_state(speaker)["filled_squares"],
-                                num_unfilled_squares = self.bingo_manager.get_agent_board_state(speaker)["unfilled_squares"],
-                                name=speaker,
-                                personality=agent_data["personality"],
-                                other_name=listener,
-                                conversation_summary=memory_context,
-                                time_step=t + 1,
-                                max_time_steps=max_time_steps,
-                                messages_exchanged=self.environment.agent_states[speaker].messages_in_current_conversation,
-                                max_messages=self.cfg.environment.settings.time_dependent.messages_per_time_step,
-                                past_partners_agent1=self.environment.agent_states[speaker].past_partners,
-                                past_partners_agent2=self.environment.agent_states[listener].past_partners,
-                                last_exchange=last_exchange
-                            )
-                            
-                            prompt_tokens = len(str(prompt)) // 4
-                            print(f"🗣️  {speaker} submitting prompt with ~{prompt_tokens} tokens...")
+                            console.debug(lambda: f"🗣️  {speaker} submitting prompt with ~{len(str(prompt)) // 4} tokens...")
                             
                             try:
-                                response = self.agent_manager.safe_get_response(agent_data["agent"], prompt)
+                                response = self.agent_manager.safe_get_response(agent_data["agent"], prompt, speaker=speaker, listener=listener)
                                 if response:
-                                    # Strip out bingo tags if present
-                                    if "<FILL IN BINGO>" in response:
-                                        bingo_text = response.split("<FILL IN BINGO>")[1].split("</FILL IN BINGO>")[0]
-                                        response = response.replace(f"<FILL IN BINGO>{bingo_text}</FILL IN BINGO>", "")
-                                        
-                                        # Check if there's a meaningful context for the bingo filling
-                                        should_update = True
-                                        
-                                        # Get conversation history
-                                        short_term_mem = self.memory_manager.get_short_term_memory(speaker)
-                                        
-                                        # If this is the first exchange, don't allow bingo filling
-                                        if not short_term_mem or len(short_term_mem['current_conversation']['exchanges']) <= 1:
-                                            print(f"⚠️ {speaker} attempted to fill bingo too early in the conversation. Ignoring.")
-                                            should_update = False
-                                        else:
-                                            # Get the last exchange from the other participant
-                                            last_exchanges = short_term_mem['current_conversation']['exchanges']
-                                            other_participant_messages = []
-                                            
-                                            # Collect the last 2 messages from the other participant
-                                            for exchange in reversed(last_exchanges):
-                                                if listener in exchange:
-                                                    other_participant_messages.append(exchange[listener])
-                                                    if len(other_participant_messages) >= 2:
-                                                        break
-                                            
-                                            # Check if the bingo text is related to what the other participant said
-                                            if not other_participant_messages:
-                                                print(f"⚠️ No previous messages from {listener} found. Ignoring bingo attempt.")
-                                                should_update = False
-                                            else:
-                                                # Combine the other participant's messages
-                                                other_text = " ".join(other_participant_messages)
-                                                
-                                                # Check for keyword overlap between bingo text and other's messages
-                                                bingo_keywords = [w.lower() for w in re.findall(r"\b\w+\b", bingo_text) if len(w) > 3]
-                                                other_keywords = [w.lower() for w in re.findall(r"\b\w+\b", other_text) if len(w) > 3]
-                                                
-                                                # Calculate overlap
-                                                overlap = [w for w in bingo_keywords if w in other_keywords]
-                                                
-                                                if len(overlap) < 2 and (len(bingo_keywords) == 0 or len(overlap) / len(bingo_keywords) < 0.2):
-                                                    print(f"⚠️ Bingo attempt by {speaker} doesn't match conversation context. Ignoring.")
-                                                    should_update = False
-                                        
-                                        # Only update if there's a meaningful context
-                                        if should_update:
-                                            self.bingo_manager.update_agent_bingo(speaker, bingo_text, matched_agent=listener)
-                                            print(f"✅ Bingo board updated for {speaker} with the content: {bingo_text}")
-                                        
-                                    formatted_response = self.format_message(speaker, f"{speaker}: {response}")
-                                    print(f"\n{formatted_response}")
+                                    response = self.apply_bingo_claim(speaker, listener, response)
+                                    console.info(lambda: "\n" + self.format_message(speaker, f"{speaker}: {response}"))
                                     turn_responses[speaker] = response
-
-                                    if self.token_counter:
-                                        self.token_counter.add_api_call(prompt=prompt, response=response)
                             except Exception as e:
-                                print(f"\n❌ Error during {speaker}'s turn: {e}")
+                                console.error("\n❌ Error during %s's turn: %s", speaker, e)
                                 continue
                         
                         if turn_responses:
-                            # Update memory after each exchange
-                            self.update_conversation_memory(agent1, agent2, turn_responses)
-                            
-                            # Check for conversation end
-                            conversation_ended = False
-                            
-                            # Check if any response has end marker
-                            for response in turn_responses.values():
-                                if "<END OF CONVERSATION>" in response:
-                                    conversation_ended = True
-                                    speaker_mem = self.memory_manager.get_short_term_memory(agent1) or self.memory_manager.get_short_term_memory(agent2)
-                                    exchanges = len(speaker_mem['current_conversation']['exchanges']) if speaker_mem else 'unknown'
-                                    print(f"\n🏁 Conversation naturally ended after {exchanges} exchanges")
-                            
-                            # Update agent states
-                            self.environment.update_agent_states(agent1, agent2, ended=conversation_ended)
-                            
-                            if conversation_ended:
+                            if self.finish_exchange(agent1, agent2, turn_responses):
                                 break
                         else:
                             break
                 
-                # Process all conversations at the end of the time step
-                self.end_time_step()
+                # Process all conversations at the end of the time step; without new
+                # exchanges there is nothing to summarize
+                if self.step_exchanges:
+                    with metrics.timer("memory.end_time_step"):
+                        self.end_time_step()
+                self.record_step(t + 1, current_pairs, step_started)
                 
-                # Print agent statistics at the end of each time step
-                self.environment.print_agent_stats()
+                # Agent statistics are only rendered on demand (console.agent_stats or debug level)
+                if console.agent_stats:
+                    self.environment.print_agent_stats()
+                else:
+                    self.environment.print_agent_stats(level=DEBUG)
+                
+                metrics.observe("env.step", time.perf_counter() - step_started)
+                metrics.write_prometheus()
+                profiler.step(t + 1)
+                console.advance()
+                console.flush()
                 
                 if self.environment.experiment_complete:
-                    print("\n🎉 All possible conversations have been completed!")
+                    console.info("\n🎉 All possible conversations have been completed!")
+                    break
+                if self.bingo_manager.target_reached():
+                    console.notice("\n🏁 Target of %d bingos reached after step %d, stopping early", self.bingo_manager.target_bingos, t + 1)
+                    break
+                silent_steps = 0 if self.step_exchanges or not current_pairs else silent_steps + 1
+                if silent_steps >= self.settings.stall_patience:
+                    console.notice("\n🧱 %d pairs exchanged no messages for %d steps in a row, stopping early",
+                                   len(current_pairs), silent_steps)
                     break
             
-            print("\n" + "=" * 60)
-            print(f"{'📊 Simulation Complete 📊':^60}")
-            print(f"Total conversations: {conversation_count}".center(60))
-            print(f"Time steps used: {t + 1}/{max_time_steps}".center(60))
-            print("=" * 60)
+            console.stop_progress()
+            console.info("\n" + "=" * 60)
+            console.info(f"{'📊 Simulation Complete 📊':^60}")
+            console.info(f"Total conversations: {conversation_count}".center(60))
+            console.info(f"Time steps used: {t + 1}/{max_time_steps}".center(60))
+            console.info("=" * 60)
         
         return all_histories 
\ No newline at end of file
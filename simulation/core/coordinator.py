@@ -0,0 +1,164 @@
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+from omegaconf import DictConfig
+
+from utils.console import console
+from utils.job_queue import JobQueue
+from utils.metrics import metrics
+
+SIM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Seconds without any worker heartbeat before the coordinator warns that nothing is consuming jobs
+NO_WORKER_WARNING = 30.0
+
+
+class Coordinator:
+    """
+    Runs each time step's pair-steps on conversation workers.
+
+    The ConversationManager keeps the environment, pairing, memory and bingo
+    state. For every active pair it snapshots what the turn loop needs (see
+    PairStepRunner), submits the step's jobs to the SQLite queue and waits.
+    A job is one pair, or one group of pairs from the environment's
+    pair_groups (a venue room), which a single worker runs in turn. Results are applied in pair order exactly as local
+    exchanges are: bingo claims are validated and filled, memory and agent
+    states are updated, and the workers' token usage is recorded. Memory
+    digests and consolidation stay on the coordinator.
+    """
+
+    def __init__(self, cfg: DictConfig, manager):
+        self.cfg = cfg
+        self.manager = manager
+        settings = cfg.cluster
+        self.queue_path = settings.get("queue_file") or os.path.join(cfg.paths.outputs_dir, "jobs.sqlite")
+        self.lease_seconds = settings.get("lease_seconds", 300)
+        self.max_attempts = settings.get("max_attempts", 3)
+        self.poll_interval = settings.get("poll_interval", 0.2)
+        self.queue = JobQueue(self.queue_path)
+        self.queue.clear_shutdown()
+        self._warned = False
+        self.workers: List[subprocess.Popen] = []
+        for _ in range(settings.get("local_workers", 0)):
+            self.workers.append(self._start_local_worker())
+        console.info("🛰️  Coordinator queue: %s (%d local workers)", self.queue_path, len(self.workers))
+
+    def _start_local_worker(self) -> subprocess.Popen:
+        """Start worker.py on this machine with the coordinator's Hydra overrides"""
+        overrides: List[str] = []
+        try:
+            from hydra.core.hydra_config import HydraConfig
+            overrides = [o for o in HydraConfig.get().overrides.task if not o.startswith("cluster.queue_file=")]
+        except Exception:
+            pass
+        return subprocess.Popen(
+            [sys.executable, "worker.py", *overrides, f"cluster.queue_file={self.queue_path}", "console.level=quiet"],
+            cwd=SIM_DIR
+        )
+
+    def build_job(self, agent1: str, agent2: str, time_step: int, max_time_steps: int) -> Optional[Dict[str, Any]]:
+        """Snapshot everything one pair-step reads, or None if the pair has nothing left to say this step"""
+        manager = self.manager
+        environment = manager.environment
+        if not environment.should_continue_conversation(agent1, agent2):
+            return None
+        max_messages = manager.settings.messages_per_time_step
+        memory = manager.get_memory_context(agent1, agent2)
+        short_term_mem = manager.memory_manager.get_short_term_memory(agent1)
+        agents = {}
+        for name in (agent1, agent2):
+            board_state = manager.bingo_manager.get_agent_board_state(name)
+            agents[name] = {
+                "personality": manager.agent_manager.get_agent(name)["personality"],
+                "board": manager.bingo_manager.get_agent_bingo(name),
+                "num_filled_squares": board_state["filled_squares"],
+                "num_unfilled_squares": board_state["unfilled_squares"],
+                "past_partners": sorted(environment.agent_states[name].past_partners),
+            }
+        return {
+            "agent1": agent1,
+            "agent2": agent2,
+            "time_step": time_step,
+            "max_time_steps": max_time_steps,
+            "max_messages": max_messages,
+            "messages_exchanged": environment.agent_states[agent1].messages_in_current_conversation,
+            "exchanges_allowed": max_messages - max(environment.agent_states[agent1].messages_this_time_step,
+                                                    environment.agent_states[agent2].messages_this_time_step),
+            "agents": agents,
+            "memory": memory,
+            "recent": manager.context_assembler.recent(agent1, agent2),
+            "exchanges": short_term_mem["current_conversation"]["exchanges"]
+            if short_term_mem["current_conversation"]["partner"] == agent2 else [],
+            "context": {"max_tokens": manager.context_assembler.max_tokens, "window": manager.context_assembler.window},
+        }
+
+    def _check_workers(self, waiting: float):
+        if not self._warned and waiting > NO_WORKER_WARNING and not self.queue.active_workers(NO_WORKER_WARNING):
+            console.warning("No worker has polled %s in %ds; start one with: python worker.py cluster.queue_file=%s",
+                            self.queue_path, int(NO_WORKER_WARNING), self.queue_path)
+            self._warned = True
+
+    def run_step(self, pairs: List[Tuple[str, str]], time_step: int, max_time_steps: int):
+        """Run every pair's turn loop for this step on the workers and apply the results"""
+        jobs = []  # (pairs of the job, job id)
+        for group in self.manager.environment.pair_groups(pairs):
+            pair_jobs = []
+            for agent1, agent2 in group:
+                job = self.build_job(agent1, agent2, time_step, max_time_steps)
+                if job is not None:
+                    pair_jobs.append(((agent1, agent2), job))
+            if not pair_jobs:
+                continue
+            payload = pair_jobs[0][1] if len(pair_jobs) == 1 else {"pairs": [job for _, job in pair_jobs]}
+            jobs.append(([pair for pair, _ in pair_jobs], self.queue.submit(time_step, payload, self.max_attempts)))
+        metrics.count("cluster.jobs", len(jobs))
+        metrics.count("cluster.pair_steps", sum(len(job_pairs) for job_pairs, _ in jobs))
+
+        with metrics.timer("cluster.wait"):
+            finished = self.queue.wait([job_id for _, job_id in jobs], self.lease_seconds,
+                                       self.poll_interval, on_idle=self._check_workers)
+
+        for job_pairs, job_id in jobs:
+            status, result, error = finished[job_id]
+            if status != "done":
+                metrics.count("cluster.failed_jobs")
+                for agent1, agent2 in job_pairs:
+                    console.error("\n❌ Pair-step %s/%s failed on every attempt: %s", agent1, agent2, error)
+                continue
+            results = result["pairs"] if "pairs" in result else [result]
+            for (agent1, agent2), pair_result in zip(job_pairs, results):
+                if "error" in pair_result:
+                    metrics.count("cluster.failed_pair_steps")
+                    console.error("\n❌ Pair-step %s/%s failed: %s", agent1, agent2, pair_result["error"])
+                    continue
+                self.apply_result(agent1, agent2, pair_result)
+
+    def apply_result(self, agent1: str, agent2: str, result: Dict[str, Any]):
+        """Record a worker's calls and replay its exchanges through the usual bookkeeping"""
+        manager = self.manager
+        metrics.observe("cluster.job", result["seconds"])
+        for call in result["calls"]:
+            metrics.count(f"llm.{call['call_type']}.calls")
+            if manager.token_counter:
+                manager.token_counter.add_usage(call["prompt_tokens"], call["completion_tokens"], call["call_type"],
+                                                call["agent"], call["partner"], call["model"], call["source"])
+        for raw in result["exchanges"]:
+            turn_responses = {}
+            for speaker, listener in [(agent1, agent2), (agent2, agent1)]:
+                if speaker in raw:
+                    response = manager.apply_bingo_claim(speaker, listener, raw[speaker])
+                    console.info(lambda: "\n" + manager.format_message(speaker, f"{speaker}: {response}"))
+                    turn_responses[speaker] = response
+            if manager.finish_exchange(agent1, agent2, turn_responses):
+                break
+
+    def close(self):
+        """Tell the workers to stop and wait for the local ones"""
+        self.queue.request_shutdown()
+        for worker in self.workers:
+            try:
+                worker.wait(timeout=self.lease_seconds)
+            except subprocess.TimeoutExpired:
+                worker.terminate()
+        self.queue.close()
+
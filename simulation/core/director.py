@@ -0,0 +1,82 @@
+import os
+import json
+from typing import Dict, Optional
+from omegaconf import DictConfig
+
+from core.agent_manager import AgentManager
+from utils.agent_base import AgentBase
+from utils.console import console
+from utils.metrics import metrics
+
+TURN_MODES = ["alternating", "director"]
+
+
+def parse_director_response(text: str, agent1: str, agent2: str) -> Optional[Dict[str, str]]:
+    """
+    Turn a director response into the `turn_responses` shape of the two-call mode:
+    {agent1: message, agent2: message}, with bingo claims and end markers written
+    back as the usual <FILL IN BINGO> and <END OF CONVERSATION> tags.
+    Returns None if the response is not valid JSON for both speakers.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+
+    turn_responses = {}
+    for speaker in (agent1, agent2):
+        entry = parsed.get(speaker)
+        if isinstance(entry, str):
+            entry = {"message": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("message"), str) or not entry["message"].strip():
+            return None
+        response = entry["message"].strip()
+        bingo = entry.get("bingo")
+        if isinstance(bingo, str) and bingo.strip() and bingo.strip().lower() != "null":
+            response += f" <FILL IN BINGO> {bingo.strip()} </FILL IN BINGO>"
+        if entry.get("end") is True or str(entry.get("end")).lower() == "true":
+            response += " <END OF CONVERSATION>"
+        turn_responses[speaker] = response
+    return turn_responses
+
+
+class TurnDirector:
+    """
+    Generates both speakers' next messages in one structured `director` call.
+
+    The prompt carries both personas and boards; the JSON reply is parsed back
+    into the same turn_responses the two-call mode produces, so memory, bingo
+    and environment updates are unchanged. A reply that does not parse returns
+    None and the caller falls back to one call per speaker for that exchange.
+    """
+
+    def __init__(self, cfg: DictConfig, agent_manager: AgentManager):
+        self.agent_manager = agent_manager
+        self.agent = AgentBase(call_type="director")
+        template_path = os.path.join(os.path.dirname(cfg.paths.base_dir),
+                                     cfg.agent.agent.get("director_prompt_template_file", "director_prompt_template.txt"))
+        with open(template_path, "r") as f:
+            self.prompt_template = f.read().strip()
+
+    def generate(self, agent1: str, agent2: str, **values) -> Optional[Dict[str, str]]:
+        """Both messages of the next exchange, or None if the call failed or did not parse"""
+        prompt = self.prompt_template.format(agent1=agent1, agent2=agent2, **values)
+        console.debug(lambda: f"🎬 Directing {agent1} and {agent2} with ~{len(prompt) // 4} tokens...")
+        try:
+            response = self.agent_manager.safe_get_response(self.agent, prompt, call_type="director",
+                                                            speaker=agent1, listener=agent2)
+        except Exception as e:
+            console.warning("Director call failed for %s and %s: %s", agent1, agent2, e)
+            response = None
+        if not response:
+            return None
+        turn_responses = parse_director_response(response, agent1, agent2)
+        if turn_responses is None:
+            metrics.count("director.parse_failures")
+            console.debug("⚠️ Director response did not parse, falling back to one call per speaker")
+        return turn_responses
@@ -0,0 +1,155 @@
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from omegaconf import DictConfig
+
+from core.memory_manager import MemoryManager
+from utils.console import console
+from utils.metrics import metrics
+from utils.model_router import router
+from utils.settings import Settings
+
+CONSOLIDATION_PROMPT = """{agent1} and {agent2} just had this conversation:
+{history}
+
+Write two short memory entries, one from each person's point of view, describing what they learned about the other: their personality, interests, and any important information they shared.
+Respond with JSON only, in exactly this shape:
+{{"{agent1}": "what {agent1} learned about {agent2}", "{agent2}": "what {agent2} learned about {agent1}"}}
+"""
+
+PERSPECTIVE_PROMPT = """I just talked to {other_agent} and this is all that happened:
+{history}
+
+I need to condense this into a summary of what I learned about them, focusing on their personality, interests, and any important information they shared. Summary:"""
+
+
+def exchanges_fingerprint(exchanges: List[Dict[str, str]]) -> str:
+    """Stable fingerprint of an exchange list, used to avoid summarizing it twice"""
+    return hashlib.sha1(json.dumps(exchanges, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class MemoryConsolidator:
+    """
+    Turns a conversation into long-term memory entries for both participants.
+
+    In `structured` mode both perspectives come back from a single LLM call as
+    JSON; if that fails to parse, or in `parallel` mode, the two perspectives are
+    requested concurrently. Each pair remembers the fingerprint of the exchanges
+    it last consolidated, so the same exchange set is never summarized twice.
+    """
+
+    def __init__(self, cfg: DictConfig, memory_manager: MemoryManager, settings: Settings, token_counter=None):
+        self.cfg = cfg
+        self.memory_manager = memory_manager
+        self.token_counter = token_counter
+        consolidation = cfg.conversation.conversation.get("memory_consolidation", {})
+        self.mode = consolidation.get("mode", "structured")
+        if self.mode not in ("structured", "parallel"):
+            raise ValueError(f"Unknown memory consolidation mode: {self.mode}. Available modes: ['structured', 'parallel']")
+        self.max_retries = settings.digest_max_retries
+        self.delay = settings.digest_delay
+        # frozenset({agent1, agent2}) -> (fingerprint, {agent: summary})
+        self._consolidated: Dict[frozenset, Tuple[str, Dict[str, str]]] = {}
+
+    @staticmethod
+    def format_history(exchanges: List[Dict[str, str]]) -> str:
+        return "\n".join([f"{k}: {v}" for exchange in exchanges for k, v in exchange.items()])
+
+    def get_cached(self, agent: str, partner: str, exchanges: List[Dict[str, str]]) -> Optional[str]:
+        """Return agent's summary of these exact exchanges if they were already consolidated"""
+        cached = self._consolidated.get(frozenset((agent, partner)))
+        if cached and cached[0] == exchanges_fingerprint(exchanges):
+            return cached[1].get(agent)
+        return None
+
+    def consolidate(self, agent1: str, agent2: str, exchanges: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """
+        Summarize the exchanges from both perspectives and store them in long-term memory.
+        Returns the summaries, or None if this exchange set was already consolidated.
+        """
+        if not exchanges:
+            return None
+        pair = frozenset((agent1, agent2))
+        fingerprint = exchanges_fingerprint(exchanges)
+        cached = self._consolidated.get(pair)
+        if cached and cached[0] == fingerprint:
+            metrics.count("memory.consolidation.skipped")
+            return None
+
+        history = self.format_history(exchanges)
+        summaries = None
+        if self.mode == "structured":
+            summaries = self._consolidate_structured(agent1, agent2, history)
+        if summaries is None:
+            summaries = self._consolidate_parallel(agent1, agent2, history)
+
+        self.memory_manager.update_long_term_memory(agent1, agent2, summaries[agent1])
+        self.memory_manager.update_long_term_memory(agent2, agent1, summaries[agent2])
+        self._consolidated[pair] = (fingerprint, summaries)
+        return summaries
+
+    #######################
+    # LLM calls
+    #######################
+
+    def _invoke(self, prompt: str, agent: str, partner: str) -> str:
+        """Call the long_term_memory route with the digest retry policy"""
+        for attempt in range(self.max_retries):
+            try:
+                with metrics.timer("llm.long_term_memory"):
+                    message = router.invoke("long_term_memory", prompt)
+                metrics.count("llm.long_term_memory.calls")
+                if self.token_counter:
+                    self.token_counter.add_api_call(
+                        prompt=prompt, response=message, call_type="long_term_memory",
+                        agent=agent, partner=partner, model=router.route("long_term_memory").model
+                    )
+                return message.content if hasattr(message, "content") else str(message)
+            except Exception as e:
+                metrics.count("llm.long_term_memory.errors")
+                if attempt == self.max_retries - 1:
+                    raise
+                wait_time = self.delay * (attempt + 1)
+                if "429" in str(e) or "quota" in str(e).lower():
+                    metrics.count("llm.rate_limited")
+                    console.warning("Rate limit hit during memory consolidation, waiting %s seconds...", wait_time)
+                else:
+                    console.warning("Error consolidating memory on attempt %d: %s", attempt + 1, e)
+                metrics.sleep(wait_time, "sleep.backoff")
+
+    def _consolidate_structured(self, agent1: str, agent2: str, history: str) -> Optional[Dict[str, str]]:
+        """Both perspectives in one call; None if the call or the JSON parsing fails"""
+        prompt = CONSOLIDATION_PROMPT.format(agent1=agent1, agent2=agent2, history=history)
+        try:
+            text = self._invoke(prompt, agent1, agent2).strip()
+        except Exception as e:
+            console.error("Error generating long-term memory: %s", e)
+            return None
+
+        # Models often wrap JSON in a code fence
+        start, end = text.find("{"), text.rfind("}")
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except (ValueError, TypeError):
+            parsed = None
+        if not isinstance(parsed, dict) or not parsed.get(agent1) or not parsed.get(agent2):
+            metrics.count("memory.consolidation.parse_failures")
+            console.debug("Structured memory consolidation for %s and %s was not valid JSON, falling back", agent1, agent2)
+            return None
+        return {agent1: str(parsed[agent1]), agent2: str(parsed[agent2])}
+
+    def _summarize_perspective(self, agent: str, other_agent: str, history: str) -> str:
+        prompt = PERSPECTIVE_PROMPT.format(other_agent=other_agent, history=history)
+        try:
+            return self._invoke(prompt, agent, other_agent)
+        except Exception as e:
+            console.error("Error generating long-term memory: %s", e)
+            return f"Had a conversation with {other_agent}. Unable to generate detailed memory due to error."
+
+    def _consolidate_parallel(self, agent1: str, agent2: str, history: str) -> Dict[str, str]:
+        """Request both perspectives at the same time"""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(self._summarize_perspective, agent1, agent2, history)
+            second = pool.submit(self._summarize_perspective, agent2, agent1, history)
+            return {agent1: first.result(), agent2: second.result()}
@@ -1,8 +1,10 @@
 import os
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from omegaconf import DictConfig
 from datetime import datetime
+from utils.memory_archive import MemoryArchive
+from utils.metrics import metrics
 
 class MemoryManager:
     def __init__(self, cfg: DictConfig):
@@ -13,12 +15,25 @@ class MemoryManager:
         self.short_term_path = os.path.join(self.base_memory_path, cfg.paths.short_term_memories)
         
         self._ensure_memory_dirs()
+        self.archive = MemoryArchive(os.path.join(self.short_term_path, "archived"))
 
     def _ensure_memory_dirs(self):
         """Ensure memory directories exist"""
         os.makedirs(self.long_term_path, exist_ok=True)
         os.makedirs(self.short_term_path, exist_ok=True)
 
+    def _read_json(self, file_path: str) -> Dict[str, Any]:
+        """Load a memory file, timed under io.memory.read"""
+        with metrics.timer("io.memory.read"):
+            with open(file_path, 'r') as f:
+                return json.load(f)
+
+    def _write_json(self, file_path: str, memory: Dict[str, Any]):
+        """Save a memory file, timed under io.memory.write"""
+        with metrics.timer("io.memory.write"):
+            with open(file_path, 'w') as f:
+                json.dump(memory, f, indent=2)
+
     def _get_memory_file_path(self, agent_id: str, memory_type: str) -> str:
         """Get the path to an agent's memory file"""
         base_path = self.long_term_path if memory_type == "long_term" else self.short_term_path
@@ -30,8 +45,7 @@ class MemoryManager:
         
         # Load existing memory or create new
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                memory = json.load(f)
+            memory = self._read_json(file_path)
         else:
             memory = {
                 "current_conversation": {
@@ -39,12 +53,14 @@ class MemoryManager:
                     "exchanges": []
                 }
             }
+        # A cleared memory has no partner yet; record who this conversation is with
+        if memory["current_conversation"]["partner"] is None:
+            memory["current_conversation"]["partner"] = other_agent_id
         # Add new exchange
         memory["current_conversation"]["exchanges"].append(exchange)
         
         # Save updated memory
-        with open(file_path, 'w') as f:
-            json.dump(memory, f, indent=2)
+        self._write_json(file_path, memory)
 
     def update_long_term_memory(self, agent_id: str, other_agent_id: str, conversation_summary: str):
         """Update agent's long-term memory with conversation insights"""
@@ -52,8 +68,7 @@ class MemoryManager:
         
         # Load existing memory or create new
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                memory = json.load(f)
+            memory = self._read_json(file_path)
         else:
             memory = {"agent_insights": {}}
         
@@ -61,53 +76,44 @@ class MemoryManager:
         memory["agent_insights"][other_agent_id] = conversation_summary
         
         # Save updated memory
-        with open(file_path, 'w') as f:
-            json.dump(memory, f, indent=2)
+        self._write_json(file_path, memory)
 
     def clear_short_term_memory(self, agent_id: str):
         """Archive agent's short-term memory after conversation ends"""
         file_path = self._get_memory_file_path(agent_id, "short_term")
         if os.path.exists(file_path):
             # Read the current memory
-            with open(file_path, 'r') as f:
-                memory = json.load(f)
+            memory = self._read_json(file_path)
             
             # Add timestamp to memory
             memory["archived_at"] = datetime.now().isoformat()
             
-            # Create a timestamped filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            archive_filename = f"{agent_id}_{timestamp}.json"
-            archive_path = os.path.join(self.short_term_path, "archived", archive_filename)
-            
-            # Ensure archive directory exists
-            os.makedirs(os.path.join(self.short_term_path, "archived"), exist_ok=True)
-            
-            # Save to archive
-            with open(archive_path, 'w') as f:
-                json.dump(memory, f, indent=2)
+            # Append to the experiment's compressed archive
+            with metrics.timer("io.memory.archive"):
+                self.archive.append(agent_id, memory)
             
             # Clear the current memory file
-            with open(file_path, 'w') as f:
-                json.dump({
-                    "current_conversation": {
-                        "partner": None,
-                        "exchanges": []
-                    }
-                }, f, indent=2)
+            self._write_json(file_path, {
+                "current_conversation": {
+                    "partner": None,
+                    "exchanges": []
+                }
+            })
 
     def get_long_term_memory(self, agent_id: str) -> Dict[str, Any]:
         """Retrieve agent's long-term memory"""
         file_path = self._get_memory_file_path(agent_id, "long_term")
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return self._read_json(file_path)
         return {"agent_insights": {}}
 
     def get_short_term_memory(self, agent_id: str) -> Dict[str, Any]:
         """Retrieve agent's short-term memory"""
         file_path = self._get_memory_file_path(agent_id, "short_term")
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        return {"current_conversation": {"partner": None, "exchanges": []}} 
\ No newline at end of file
+            return self._read_json(file_path)
+        return {"current_conversation": {"partner": None, "exchanges": []}}
+
+    def get_archived_memories(self, agent_id: str, other_agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retrieve agent's archived short-term memories, optionally only those with one partner"""
+        return self.archive.load(agent_id, other_agent_id)
@@ -0,0 +1,144 @@
+import os
+import time
+from typing import Any, Dict, List
+from omegaconf import DictConfig
+
+from core.agent_manager import get_response
+from core.bingo_manager import split_bingo_claim
+from core.director import TurnDirector
+from utils.agent_base import AgentBase
+from utils.console import console
+from utils.context_assembler import ContextAssembler
+from utils.metrics import metrics
+from utils.settings import Settings
+from utils.token_counter import measure_usage
+
+
+class CallLog:
+    """Collects the token usage of a job's calls so the coordinator can record them"""
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def add_api_call(self, prompt=None, response=None, call_type: str = "dialogue", agent=None, partner=None, model=None):
+        prompt_tokens, completion_tokens, source = measure_usage(prompt, response)
+        self.calls.append({
+            "call_type": call_type, "agent": agent, "partner": partner, "model": model,
+            "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "source": source,
+        })
+
+
+class PairStepRunner:
+    """
+    Runs one pair-step of the time-dependent loop on a worker.
+
+    A job is a snapshot taken by the coordinator at the start of the step:
+    personas, boards, past partners, memory context, recent exchanges and how
+    many exchanges the pair may still have this step. The runner builds the
+    same prompts as ConversationManager and returns the raw responses (bingo
+    claims and end markers still in them) plus the token usage of every call.
+    Within one job the boards stay as they were at the start of the step;
+    the coordinator validates the claims and fills the squares.
+    """
+
+    def __init__(self, cfg: DictConfig):
+        self.cfg = cfg
+        self.settings = Settings.from_cfg(cfg)
+        self.agent = AgentBase()
+        self.call_log = CallLog()
+        template_path = os.path.join(os.path.dirname(cfg.paths.base_dir), cfg.agent.agent.prompt_template_file)
+        with open(template_path, "r") as f:
+            self.prompt_template = f.read().strip()
+        self.director = TurnDirector(cfg, self) if self.settings.turn_mode == "director" else None
+
+    def safe_get_response(self, agent: AgentBase, prompt: str, call_type: str = "dialogue", speaker=None, listener=None):
+        """Same retry policy as AgentManager; usage goes to this job's call log"""
+        return get_response(self.settings, agent, prompt, call_type, speaker, listener, self.call_log)
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.call_log = CallLog()
+        agent1, agent2 = job["agent1"], job["agent2"]
+        agents = job["agents"]
+        context = ContextAssembler(max_tokens=job["context"]["max_tokens"], window=job["context"]["window"])
+        context.seed(agent1, agent2, job["recent"])
+        exchanges = list(job["exchanges"])
+        messages_exchanged = job["messages_exchanged"]
+        raw_exchanges = []
+
+        metrics.sleep(job.get("pair_delay", 10), "sleep.pair_delay")
+        for _ in range(job["exchanges_allowed"]):
+            raw, clean = {}, {}
+            directed = None
+            if self.director:
+                directed = self.director.generate(
+                    agent1, agent2,
+                    conversation_summary=context.build(agent1, agent2, job["memory"]),
+                    time_step=job["time_step"], max_time_steps=job["max_time_steps"],
+                    messages_exchanged=messages_exchanged, max_messages=job["max_messages"],
+                    past_partners_agent1=set(agents[agent1]["past_partners"]),
+                    past_partners_agent2=set(agents[agent2]["past_partners"]),
+                    last_exchange=exchanges[-1] if exchanges else "",
+                    **{f"{key}{suffix}": agents[name][key]
+                       for suffix, name in (("1", agent1), ("2", agent2))
+                       for key in ("personality", "board", "num_filled_squares", "num_unfilled_squares")}
+                )
+            if directed:
+                raw = directed
+                clean = {speaker: split_bingo_claim(response)[0] for speaker, response in directed.items()}
+            else:
+                for speaker, listener in [(agent1, agent2), (agent2, agent1)]:
+                    prompt = self.prompt_template.format(
+                        agent_curr_bingo_board=agents[speaker]["board"],
+                        num_filled_squares=agents[speaker]["num_filled_squares"],
+                        num_unfilled_squares=agents[speaker]["num_unfilled_squares"],
+                        name=speaker,
+                        personality=agents[speaker]["personality"],
+                        other_name=listener,
+                        conversation_summary=context.build(speaker, listener, job["memory"], clean),
+                        time_step=job["time_step"],
+                        max_time_steps=job["max_time_steps"],
+                        messages_exchanged=messages_exchanged,
+                        max_messages=job["max_messages"],
+                        past_partners_agent1=set(agents[speaker]["past_partners"]),
+                        past_partners_agent2=set(agents[listener]["past_partners"]),
+                        last_exchange=exchanges[-1] if exchanges else ""
+                    )
+                    try:
+                        response = self.safe_get_response(self.agent, prompt, speaker=speaker, listener=listener)
+                    except Exception as e:
+                        console.error("\n❌ Error during %s's turn: %s", speaker, e)
+                        continue
+                    if response:
+                        raw[speaker] = response
+                        clean[speaker] = split_bingo_claim(response)[0]
+            if not raw:
+                break
+            raw_exchanges.append(raw)
+            exchanges.append(clean)
+            context.add_exchange(agent1, agent2, clean)
+            messages_exchanged += 1
+            if any("<END OF CONVERSATION>" in response for response in raw.values()):
+                break
+
+        return {
+            "exchanges": raw_exchanges,
+            "calls": self.call_log.calls,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def run_group(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a job: one pair-step, or a group of them (a venue room) one after
+        another. A pair that fails inside a group is reported with its error
+        rather than failing the group, so the others are not run again.
+        """
+        if "pairs" not in job:
+            return self.run(job)
+        results = []
+        for pair_job in job["pairs"]:
+            try:
+                results.append(self.run(pair_job))
+            except Exception as e:
+                console.error("❌ Pair-step %s/%s failed: %s", pair_job.get("agent1"), pair_job.get("agent2"), e)
+                results.append({"error": str(e)})
+        return {"pairs": results}
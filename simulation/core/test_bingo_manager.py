@@ -0,0 +1,55 @@
+"""Board layout and line detection"""
+import json
+
+import pytest
+from omegaconf import OmegaConf
+
+from core.bingo_manager import BingoManager, board_shape, grid_shape, line_masks
+
+
+def test_square_board_has_rows_columns_and_diagonals():
+    assert board_shape({"squares": [None] * 25}) == (5, 5)
+    lines, by_square = line_masks(5, 5)
+    names = [name for name, _ in lines]
+    assert len(lines) == 12
+    assert "diagonal" in names and "anti-diagonal" in names
+    # The centre square lies on its row, its column and both diagonals
+    assert len(by_square[12]) == 4
+
+
+def test_rectangular_board_has_no_diagonals():
+    assert grid_shape(12) == (3, 4)
+    lines, _ = line_masks(3, 4)
+    assert [name for name, _ in lines] == ["row 1", "row 2", "row 3", "col 1", "col 2", "col 3", "col 4"]
+
+
+@pytest.mark.parametrize("size", [7, 11, 13])
+def test_prime_square_count_is_rejected(size):
+    with pytest.raises(ValueError):
+        grid_shape(size)
+    with pytest.raises(ValueError):
+        board_shape({"squares": [None] * size})
+
+
+def test_explicit_shape_wins():
+    assert board_shape({"squares": [None] * 12, "rows": 2, "cols": 6}) == (2, 6)
+
+
+def test_fill_completes_exactly_one_row(tmp_path):
+    boards = tmp_path / "boards"
+    boards.mkdir()
+    squares = [{"visualType": "meet", "text": f"clue number {i}"} for i in range(12)]
+    (boards / "alice.json").write_text(json.dumps({"squares": squares}))
+    cfg = OmegaConf.create({"paths": {"outputs_dir": str(tmp_path), "bingo_board_dir": str(boards)}, "experiment": {}})
+    manager = BingoManager(cfg)
+    events = []
+    manager.subscribe(events.append)
+
+    for index in range(3):
+        manager._record_fill("alice", index, "bob", "snippet")
+    assert events == []
+
+    manager._record_fill("alice", 3, "bob", "snippet")
+    assert manager.completed_lines("alice") == ["row 1"]
+    assert [(event["line"], event["first"]) for event in events] == [("row 1", True)]
+    assert manager.bingo_count() == 1
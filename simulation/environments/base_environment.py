@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from omegaconf import DictConfig
 from core.agent_manager import AgentManager
 
@@ -7,12 +7,22 @@ class BaseEnvironment(ABC):
     def __init__(self, cfg: DictConfig, agent_manager: AgentManager):
         self.cfg = cfg
         self.agent_manager = agent_manager
+        self.settings = agent_manager.settings
 
     @abstractmethod
     def get_conversation_pairs(self) -> List[tuple]:
         """Return list of agent pairs that should converse"""
         pass
 
+    def get_conversation_rounds(self) -> Iterator[List[tuple]]:
+        """Batches of disjoint pairs that may converse at the same time; one pair per batch by default"""
+        for pair in self.get_conversation_pairs():
+            yield [pair]
+
+    def count_conversation_pairs(self) -> int:
+        """Number of pairs get_conversation_rounds will yield"""
+        return len(self.get_conversation_pairs())
+
     @abstractmethod
     def should_continue_conversation(self, history: List[Dict[str, str]]) -> bool:
         """Determine if a conversation should continue"""
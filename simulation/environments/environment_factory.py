@@ -5,13 +5,15 @@ from .base_environment import BaseEnvironment
 from .random_pairs import RandomPairsEnvironment
 from .time_dependent import TimeDependentEnvironment
 from .test_environment import TestEnvironment
+from .venue import VenueEnvironment
 from core.agent_manager import AgentManager
 
 class EnvironmentFactory:
     _environments: Dict[str, Type[BaseEnvironment]] = {
         "random_pairs": RandomPairsEnvironment,
         "time_dependent": TimeDependentEnvironment,
-        "test": TestEnvironment
+        "test": TestEnvironment,
+        "venue": VenueEnvironment
     }
 
     @classmethod
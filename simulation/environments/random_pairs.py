@@ -1,37 +1,83 @@
-from itertools import combinations
 import random
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from omegaconf import DictConfig
+from core.agent_manager import AgentManager
 from .base_environment import BaseEnvironment
 
+
+def round_robin_rounds(names: List[str], rng: Optional[random.Random] = None) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Yield the rounds of a round-robin tournament (circle method): every round
+    is a set of disjoint pairs, and over all rounds every pair meets exactly
+    once. With an odd number of agents one agent sits out each round.
+
+    Only O(n) state is kept; a round is built when it is requested. With an
+    rng, the agent order, the round order, and the order and orientation of
+    the pairs in each round are shuffled.
+    """
+    players: List[Optional[str]] = list(names)
+    if len(players) < 2:
+        return
+    if rng:
+        rng.shuffle(players)
+    if len(players) % 2:
+        players.append(None)  # Bye
+    n = len(players)
+    fixed, rotating = players[0], players[1:]
+    order = list(range(n - 1))
+    if rng:
+        rng.shuffle(order)
+    for r in order:
+        line = [fixed] + [rotating[(i + r) % (n - 1)] for i in range(n - 1)]
+        pairs = [(line[i], line[n - 1 - i]) for i in range(n // 2)]
+        pairs = [(a, b) for a, b in pairs if a is not None and b is not None]
+        if rng:
+            rng.shuffle(pairs)
+            pairs = [(b, a) if rng.random() < 0.5 else (a, b) for a, b in pairs]
+        yield pairs
+
+
 class RandomPairsEnvironment(BaseEnvironment):
+    def __init__(self, cfg: DictConfig, agent_manager: AgentManager):
+        super().__init__(cfg, agent_manager)
+        settings = cfg.environment.settings.get("random_pairs", {})
+        self.shuffle_pairs = settings.get("shuffle_pairs", True)
+        self.random_seed = settings.get("random_seed", None)
+
+    def get_conversation_rounds(self) -> Iterator[List[Tuple[str, str]]]:
+        """Randomized round-robin rounds of disjoint pairs, generated lazily"""
+        rng = random.Random(self.random_seed) if self.shuffle_pairs else None
+        return round_robin_rounds(self.agent_manager.get_agent_names(), rng)
+
+    def count_conversation_pairs(self) -> int:
+        n = len(self.agent_manager.get_agent_names())
+        return n * (n - 1) // 2
+
     def get_conversation_pairs(self) -> List[tuple]:
-        """Return randomly shuffled pairs of all agents"""
-        agent_names = self.agent_manager.get_agent_names()
-        unique_pairs = list(combinations(agent_names, 2))
-        random.shuffle(unique_pairs)
-        return unique_pairs
+        """Every pair, round by round; this materializes all n(n-1)/2 pairs, so prefer get_conversation_rounds"""
+        return [pair for pairs in self.get_conversation_rounds() for pair in pairs]
 
     def should_continue_conversation(self, history: List[Dict[str, str]]) -> bool:
         """Check if conversation should continue based on max turns and end markers"""
         if not history:
             return True
-            
+
         # Check if max turns reached
-        if len(history) >= self.cfg.conversation.conversation.turns_per_conversation:
+        if len(history) >= self.settings.turns_per_conversation:
             return False
-            
+
         # Check if any agent ended the conversation
         last_turn = history[-1]
         for response in last_turn.values():
             if "<END OF CONVERSATION>" in response:
                 return False
-                
+
         return True
 
     def get_conversation_context(self, agent1: str, agent2: str, history: List[Dict[str, str]]) -> Dict[str, Any]:
         """Get basic conversation context"""
         return {
-            "max_turns": self.cfg.conversation.conversation.turns_per_conversation,
+            "max_turns": self.settings.turns_per_conversation,
             "current_turn": len(history) if history else 0
-        } 
\ No newline at end of file
+        }
@@ -0,0 +1,201 @@
+"""
+LLM-free surrogate of the time-dependent environment for parameter sweeps.
+
+Many replicas of the TimeDependentEnvironment loop run in lockstep as NumPy
+arrays of shape [replicas, agents]. The LLM is replaced by a calibrated
+probabilistic model: a conversation lasts a sampled number of exchanges and
+then emits its end marker; every message fills a random bingo square with a
+fixed probability. Pairing follows pair_idle_agents: idle agents are
+shuffled and paired with someone they have not finished a conversation
+with; pairs that collide with a past partner are retried in a few extra
+shuffled rounds rather than by the sequential greedy scan.
+
+Past partners are a per-agent bitset of `bitset_words` uint64 words. It is
+exact while the population fits in the bitset (agents <= 64 * words); larger
+populations hash partners into it, so a few new partners may be treated as
+already met.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from core.bingo_manager import grid_shape, line_masks
+from utils.run_analytics import RunAnalytics, find_runs
+
+# Used when no history is available
+DEFAULT_CONVERSATION_LENGTH = 4.0
+DEFAULT_FILL_PROBABILITY = 0.05
+# Multiplicative hash for partner bit positions in large populations
+_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def calibrate(paths) -> Dict[str, Any]:
+    """Conversation lengths and per-message fill probability from earlier runs"""
+    analytics = RunAnalytics()
+    for run_dir in find_runs(paths):
+        analytics.add_run(run_dir)
+    lengths = analytics.conversation_lengths()[:, 3]
+    messages = int(analytics.interaction_matrix().sum())
+    fills = int(analytics.fill_matrix().sum())
+    return {
+        "runs": len(analytics.runs),
+        "conversation_lengths": lengths,
+        "fill_probability": fills / messages if messages else None,
+    }
+
+
+class SurrogateTimeDependent:
+    """Vectorized replicas of the time-dependent loop"""
+
+    def __init__(self, num_agents: int, max_time_steps: int, messages_per_time_step: int,
+                 conversation_lengths: Optional[np.ndarray] = None, fill_probability: Optional[float] = None,
+                 board_squares: int = 12, policy: str = "random", pairing_rounds: int = 3,
+                 bitset_words: int = 16, target_bingos: Optional[int] = None):
+        if policy not in ("random", "least_met"):
+            raise ValueError(f"Unknown pairing policy: {policy}. Available policies: ['random', 'least_met']")
+        self.num_agents = num_agents
+        self.max_time_steps = max_time_steps
+        self.messages_per_time_step = messages_per_time_step
+        self.conversation_lengths = conversation_lengths if conversation_lengths is not None and len(conversation_lengths) else None
+        self.fill_probability = DEFAULT_FILL_PROBABILITY if fill_probability is None else fill_probability
+        self.policy = policy
+        self.pairing_rounds = pairing_rounds
+        self.target_bingos = target_bingos
+        self.words = min(bitset_words, -(-num_agents // 64))
+        self.exact = num_agents <= 64 * self.words
+        # Boards are int64 bitmasks; bit 63 is the sign bit
+        if board_squares > 63:
+            raise ValueError(f"Surrogate boards hold at most 63 squares, got {board_squares}")
+        self.board_squares = board_squares
+        lines, _ = line_masks(*grid_shape(board_squares))
+        self.lines = np.array([mask for _, mask in lines], dtype=np.int64)
+
+    def _bit_positions(self, partners: np.ndarray) -> np.ndarray:
+        if self.exact:
+            return partners.astype(np.uint64)
+        return (partners.astype(np.uint64) * _HASH) % np.uint64(64 * self.words)
+
+    def _sample_lengths(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.conversation_lengths is not None:
+            return np.maximum(rng.choice(self.conversation_lengths, size=size), 1)
+        return rng.geometric(1 / DEFAULT_CONVERSATION_LENGTH, size=size)
+
+    def run_batch(self, replicas: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Simulate `replicas` independent runs; every returned array has one entry per replica"""
+        R, N = replicas, self.num_agents
+        rows = np.arange(R)[:, None]
+        partner = np.full((R, N), -1, dtype=np.int64)
+        remaining = np.zeros((R, N), dtype=np.int64)
+        conversations = np.zeros((R, N), dtype=np.int64)
+        past = np.zeros((R, N, self.words), dtype=np.uint64)
+        board = np.zeros((R, N), dtype=np.int64)
+        first_bingo = np.full((R, N), -1, dtype=np.int64)
+
+        dialogue_calls = np.zeros(R, dtype=np.int64)
+        memory_calls = np.zeros(R, dtype=np.int64)
+        fills = np.zeros(R, dtype=np.int64)
+        steps_used = np.full(R, self.max_time_steps, dtype=np.int64)
+        target_step = np.full(R, -1, dtype=np.int64)
+        utilization = np.zeros(R)
+        done = np.zeros(R, dtype=bool)
+        total_pairs = N * (N - 1) // 2
+
+        for step in range(1, self.max_time_steps + 1):
+            live = ~done[:, None]
+            # Pairing: shuffle idle agents, pair neighbours, retry collisions with past partners
+            for _ in range(self.pairing_rounds):
+                idle = (partner < 0) & (conversations < N - 1) & live
+                key = rng.random((R, N))
+                if self.policy == "least_met":
+                    key += conversations
+                key[~idle] = np.inf
+                order = np.argsort(key, axis=1)
+                a, b = order[:, 0:N - 1:2], order[:, 1:N:2]
+                valid = np.take_along_axis(idle, a, 1) & np.take_along_axis(idle, b, 1)
+                position = self._bit_positions(b)
+                word = (position // np.uint64(64)).astype(np.int64)
+                met = (past[rows, a, word] >> (position % np.uint64(64))) & np.uint64(1)
+                valid &= met == 0
+                if not valid.any():
+                    break
+                r, i = np.nonzero(valid)
+                a_valid, b_valid = a[r, i], b[r, i]
+                partner[r, a_valid], partner[r, b_valid] = b_valid, a_valid
+                lengths = self._sample_lengths(rng, len(r))
+                remaining[r, a_valid] = remaining[r, b_valid] = lengths
+
+            conversing = partner >= 0
+            utilization += conversing.mean(axis=1) * ~done
+            exchanges = np.where(conversing, np.minimum(self.messages_per_time_step, remaining), 0)
+            dialogue_calls += exchanges.sum(axis=1)
+            memory_calls += conversing.sum(axis=1) // 2
+
+            # Each message may fill one random square; a square that is already filled is a miss
+            changed = np.zeros((R, N), dtype=bool)
+            for message in range(self.messages_per_time_step):
+                attempt = (exchanges > message) & (rng.random((R, N)) < self.fill_probability)
+                bit = np.left_shift(1, rng.integers(self.board_squares, size=(R, N)))
+                new = attempt & ((board & bit) == 0)
+                board |= np.where(new, bit, 0)
+                fills += new.sum(axis=1)
+                changed |= new
+            # Only boards that changed can have completed a line
+            r, agent = np.nonzero(changed & (first_bingo < 0))
+            has_line = ((board[r, agent][:, None] & self.lines) == self.lines).any(axis=1)
+            first_bingo[r[has_line], agent[has_line]] = step
+            if self.target_bingos:
+                reached = ((first_bingo >= 0).sum(axis=1) >= self.target_bingos) & (target_step < 0)
+                target_step[reached] = step
+
+            # End markers: conversations that used up their length end this step
+            remaining -= exchanges
+            ended = conversing & (remaining == 0)
+            r, agent = np.nonzero(ended)
+            position = self._bit_positions(partner[r, agent])
+            word = (position // np.uint64(64)).astype(np.int64)
+            past[r, agent, word] |= np.left_shift(np.uint64(1), position % np.uint64(64))
+            conversations[r, agent] += 1
+            partner[r, agent] = -1
+
+            finished = (conversations.sum(axis=1) // 2 >= total_pairs) & ~done
+            if self.target_bingos:
+                finished |= (target_step >= 0) & ~done
+            steps_used[finished] = step
+            done |= finished
+            if done.all():
+                break
+
+        return {
+            "steps_used": steps_used,
+            "conversations": conversations.sum(axis=1) // 2,
+            "completion": conversations.sum(axis=1) / 2 / max(total_pairs, 1),
+            "dialogue_calls": dialogue_calls,
+            "long_term_memory_calls": memory_calls,
+            "fills": fills,
+            "agents_with_bingo": (first_bingo >= 0).sum(axis=1),
+            "target_step": target_step,
+            "utilization": utilization / np.maximum(steps_used, 1),
+        }
+
+    def run(self, replicas: int, batch_size: int = 100, seed: Optional[int] = 0) -> Dict[str, Any]:
+        """Simulate in batches of replicas and summarize each outcome across replicas"""
+        rng = np.random.default_rng(seed)
+        batches = []
+        for start in range(0, replicas, batch_size):
+            batches.append(self.run_batch(min(batch_size, replicas - start), rng))
+        results = {key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]}
+        summary = {}
+        for key, values in results.items():
+            if key == "target_step":
+                values = values[values >= 0]
+                summary["target_reached_share"] = float(len(values) / replicas)
+                if not len(values):
+                    continue
+            values = values.astype(float)
+            summary[key] = {
+                "mean": float(values.mean()),
+                "p5": float(np.percentile(values, 5)),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+            }
+        return summary
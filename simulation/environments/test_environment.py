@@ -32,9 +32,9 @@ class TestEnvironment(BaseEnvironment):
         """Write initial header information to log file"""
         header = f"""=== Debug Log Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===
 Configuration:
-- Max Agents: {self.cfg.environment.settings.test.max_agents}
-- Max Messages per Conversation: {self.cfg.environment.settings.test.messages_per_conversation}
-- Max Time Steps: {self.cfg.environment.settings.test.max_time_steps}
+- Max Agents: {self.settings.test_max_agents}
+- Max Messages per Conversation: {self.settings.test_messages_per_conversation}
+- Max Time Steps: {self.settings.test_max_time_steps}
 """
         self.log_file.write(header + "\n")
         self.log_file.flush()
@@ -68,7 +68,7 @@ Configuration:
     def initialize_random_pairs(self):
         """Initialize random pairs of agents based on max_agents setting"""
         available_agents = self.agent_manager.get_agent_names()
-        max_agents = min(self.cfg.environment.settings.test.max_agents, len(available_agents))
+        max_agents = min(self.settings.test_max_agents, len(available_agents))
         
         # Ensure max_agents is even to form pairs
         if max_agents % 2 != 0:
@@ -90,12 +90,18 @@ Configuration:
                 for i, (agent1, agent2) in enumerate(self.conversation_pairs)
             })
 
+    def get_conversation_rounds(self):
+        """The test pairs are disjoint, so they all converse in one round"""
+        pairs = self.get_conversation_pairs()
+        if pairs:
+            yield pairs
+
     def print_experiment_setup(self):
         """Print initial experiment setup information"""
         setup_info = {
-            "Maximum Agents": self.cfg.environment.settings.test.max_agents,
+            "Maximum Agents": self.settings.test_max_agents,
             "Number of Pairs": len(self.conversation_pairs),
-            "Max Messages per Conversation": self.cfg.environment.settings.test.messages_per_conversation,
+            "Max Messages per Conversation": self.settings.test_messages_per_conversation,
             "Debug Mode": self.debug_mode
         }
         self.print_debug("EXPERIMENT SETUP", setup_info)
@@ -132,7 +138,7 @@ Configuration:
             return False
         
         # Check if message limit reached
-        if len(history) >= self.cfg.environment.settings.test.messages_per_conversation:
+        if len(history) >= self.settings.test_messages_per_conversation:
             self.print_debug("CONVERSATION ENDED", f"Reached maximum messages for pair {agent_pair[0]} ↔ {agent_pair[1]}")
             self.completed_pairs.add(agent_pair)
             return False
@@ -157,7 +163,7 @@ Configuration:
             # Test environment specific parameters
             "time_step": self.current_step,
             "messages_exchanged": len(history) if history else 0,
-            "max_messages": self.cfg.environment.settings.test.messages_per_conversation,
+            "max_messages": self.settings.test_messages_per_conversation,
             "conversation_complete": is_complete,
             
             # Default values for compatibility with other environments
@@ -0,0 +1,29 @@
+"""Round-robin scheduling of random pairs"""
+import random
+from itertools import combinations
+
+import pytest
+
+from environments.random_pairs import round_robin_rounds
+
+
+@pytest.mark.parametrize("seed", [None, 0, 1])
+@pytest.mark.parametrize("n", range(2, 12))
+def test_rounds_are_disjoint_and_cover_every_pair_once(n, seed):
+    names = [f"agent{i}" for i in range(n)]
+    rounds = list(round_robin_rounds(names, random.Random(seed) if seed is not None else None))
+    # With an odd count one agent sits out each round
+    assert len(rounds) == (n - 1 if n % 2 == 0 else n)
+    met = []
+    for pairs in rounds:
+        agents = [name for pair in pairs for name in pair]
+        assert len(agents) == len(set(agents))
+        assert len(pairs) == n // 2
+        met.extend(frozenset(pair) for pair in pairs)
+    assert len(met) == len(set(met))
+    assert set(met) == {frozenset(pair) for pair in combinations(names, 2)}
+
+
+def test_fewer_than_two_agents_have_no_rounds():
+    assert list(round_robin_rounds([])) == []
+    assert list(round_robin_rounds(["solo"])) == []
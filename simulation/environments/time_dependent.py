@@ -3,6 +3,7 @@ import random
 from omegaconf import DictConfig
 from core.agent_manager import AgentManager
 from core.memory_manager import MemoryManager
+from utils.console import console, INFO
 from .base_environment import BaseEnvironment
 
 class AgentState:
@@ -14,6 +15,7 @@ class AgentState:
         self.messages_in_current_conversation = 0
         self.messages_this_time_step = 0  # Track messages in current time step
         self.total_conversations = 0  # Track total number of completed conversations
+        self.suspended_conversations: Dict[str, int] = {}  # Partner -> messages exchanged before the conversation was suspended
 
     def reset_time_step_count(self):
         """Reset the message count for new time step"""
@@ -28,12 +30,8 @@ class TimeDependentEnvironment(BaseEnvironment):
         self.memory_manager = MemoryManager(cfg)  # Initialize memory manager
         self.initialize_agent_states()
         self.total_possible_conversations = self.calculate_total_possible_conversations()
-        # Set random seed if provided
-        if hasattr(cfg.environment.settings.time_dependent, 'random_seed'):
-            random.seed(cfg.environment.settings.time_dependent.random_seed)
-        else:
-            # Use current time as seed for true randomness
-            random.seed(None)
+        # Seeded pairing if random_seed is set; None seeds from the current time
+        random.seed(self.settings.random_seed)
         self.print_experiment_setup()
 
     #######################
@@ -98,39 +96,46 @@ class TimeDependentEnvironment(BaseEnvironment):
     def print_experiment_setup(self):
         """Print initial experiment setup information"""
         total_agents = len(self.agent_manager.get_agent_names())
-        print("\n=== Experiment Setup ===")
-        print(f"Total Agents: {total_agents}")
-        print(f"Total Possible Conversations: {self.total_possible_conversations}")
-        print(f"Max Messages per Conversation: {self.cfg.environment.settings.time_dependent.messages_per_time_step}")
-        print("=" * 30)
+        console.info("\n=== Experiment Setup ===")
+        console.info("Total Agents: %d", total_agents)
+        console.info("Total Possible Conversations: %d", self.total_possible_conversations)
+        console.info("Max Messages per Conversation: %s", self.settings.messages_per_time_step)
+        console.info("=" * 30)
 
     def print_conversation_status(self, agent1: str, agent2: str):
         """Print status of a new conversation"""
+        if not console.enabled(INFO):
+            return
         completed = self.get_total_completed_conversations()
-        print(f"\nNew Conversation Started:")
-        print(f"Between: {agent1} and {agent2}")
-        print(f"Progress: {completed}/{self.total_possible_conversations} conversations completed")
+        console.info("\nNew Conversation Started:")
+        console.info("Between: %s and %s", agent1, agent2)
+        console.info("Progress: %d/%d conversations completed", completed, self.total_possible_conversations)
         progress = (completed / self.total_possible_conversations) * 100
-        print(f"Overall Progress: {progress:.1f}%")
+        console.info("Overall Progress: %.1f%%", progress)
         
-    def print_agent_stats(self):
-        """Print detailed statistics for all agents"""
-        print("\n=== Agent Statistics ===")
-        print("Agent | Status | Conversations | Available Partners | Messages This Step")
-        print("-" * 70)
-        for name, state in self.agent_states.items():
-            available = len(set(self.agent_manager.get_agent_names()) - {name} - state.past_partners)
-            status = "Talking" if state.state == "conversing" else "Idle"
-            print(f"{name:15} | {status:7} | {len(state.past_partners):12} | {available:17} | {state.messages_this_time_step:17}")
-        print("-" * 70)
+    def print_agent_stats(self, level: int = INFO):
+        """Print detailed statistics for all agents; rows are only built if the level is enabled"""
+        def rows():
+            total_agents = len(self.agent_states)
+            for name, state in self.agent_states.items():
+                available = total_agents - 1 - len(state.past_partners)
+                status = "Talking" if state.state == "conversing" else "Idle"
+                yield (name, status, len(state.past_partners), available, state.messages_this_time_step)
+
+        console.table(
+            "Agent Statistics",
+            ["Agent", "Status", "Conversations", "Available Partners", "Messages This Step"],
+            rows,
+            level=level
+        )
 
     def print_experiment_completion(self):
         """Print experiment completion status and statistics"""
-        print("\n=== Experiment Complete! ===")
-        print(f"Total Conversations Completed: {self.get_total_completed_conversations()}")
-        print(f"Total Time Steps: {self.current_step}")
+        console.info("\n=== Experiment Complete! ===")
+        console.info("Total Conversations Completed: %d", self.get_total_completed_conversations())
+        console.info("Total Time Steps: %d", self.current_step)
         self.print_agent_stats()
-        print("=" * 30 + "\n")
+        console.info("=" * 30 + "\n")
 
     #######################
     # Main Simulation Functions
@@ -146,9 +151,22 @@ class TimeDependentEnvironment(BaseEnvironment):
             self.experiment_complete = True
             return []
 
-        idle_agents = self.get_idle_agents()
+        new_pairs = self.pair_agents(self.get_idle_agents(), random)
+
+        # Check again after pairing in case this was the last set of conversations
+        if not new_pairs and self.all_conversations_complete():
+            self.experiment_complete = True
+
+        return new_pairs
+
+    def pair_agents(self, idle_agents: List[str], rng) -> List[Tuple[str, str]]:
+        """
+        Pair the given idle agents and start their conversations: first resume
+        conversations from previous time steps, then pair the rest with partners
+        they have not met. `rng` (the random module or a random.Random) sets the order.
+        """
         # Shuffle the idle agents list for randomized pairing
-        random.shuffle(idle_agents)
+        rng.shuffle(idle_agents)
         new_pairs = []
 
         # First try to resume conversations from previous time steps
@@ -165,15 +183,14 @@ class TimeDependentEnvironment(BaseEnvironment):
             if (potential_partner in idle_agents[i+1:] and 
                 self.agent_states[potential_partner].state == "idle" and
                 potential_partner not in self.agent_states[agent1].past_partners):
-                # Resume conversation
+                # Resume conversation; every resumable pair is resumed this step
                 self.start_new_conversation(agent1, potential_partner)
                 new_pairs.append((agent1, potential_partner))
-                break
 
         # Then try to create new pairs for remaining idle agents
-        remaining_idle = self.get_idle_agents()
+        remaining_idle = [name for name in idle_agents if self.agent_states[name].state == "idle"]
         # Shuffle again for randomized new pairings
-        random.shuffle(remaining_idle)
+        rng.shuffle(remaining_idle)
         
         for i in range(0, len(remaining_idle) - 1):
             agent1 = remaining_idle[i]
@@ -182,7 +199,7 @@ class TimeDependentEnvironment(BaseEnvironment):
                 
             # Shuffle potential partners for this agent
             potential_partners = remaining_idle[i+1:]
-            random.shuffle(potential_partners)
+            rng.shuffle(potential_partners)
             
             for agent2 in potential_partners:
                 if (self.agent_states[agent2].state == "idle" and 
@@ -192,12 +209,29 @@ class TimeDependentEnvironment(BaseEnvironment):
                     new_pairs.append((agent1, agent2))
                     break
 
-        # Check again after pairing in case this was the last set of conversations
-        if not new_pairs and self.all_conversations_complete():
-            self.experiment_complete = True
-
         return new_pairs
 
+    def pair_groups(self, pairs: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Units of work for conversation workers: every pair runs on its own"""
+        return [[pair] for pair in pairs]
+
+    def explain_stall(self) -> Tuple[bool, str]:
+        """
+        Why pairing produced no pairs before the experiment is complete, as
+        (recoverable, reason). A recoverable stall can clear up in a later step
+        without any conversation taking place.
+        """
+        idle_agents = self.get_idle_agents()
+        busy = sum(state.state == "conversing" for state in self.agent_states.values())
+        if busy:
+            return True, f"{busy} agents are still in conversations"
+        waiting = [name for name in idle_agents if self.has_available_partners(name)]
+        if not waiting:
+            return False, "no agent has partners left to meet"
+        if len(waiting) == 1:
+            return False, f"{waiting[0]} is the only agent with partners left to meet"
+        return False, f"{len(waiting)} agents have partners left to meet, but no two of them can be paired"
+
     def resume_conversation(self, agent1: str, agent2: str):
         """Resume a suspended conversation between two agents"""
         self.agent_states[agent1].state = "conversing"
@@ -218,8 +252,8 @@ class TimeDependentEnvironment(BaseEnvironment):
         if agent2_memory and agent2_memory["current_conversation"]["partner"] == agent1:
             self.agent_states[agent2].current_conversation_history = agent2_memory["current_conversation"]["exchanges"]
         
-        print(f"\nResuming conversation between {agent1} and {agent2}")
-        print(f"Messages exchanged so far: {self.agent_states[agent1].messages_in_current_conversation}")
+        console.info("\nResuming conversation between %s and %s", agent1, agent2)
+        console.info("Messages exchanged so far: %d", self.agent_states[agent1].messages_in_current_conversation)
 
     def start_new_conversation(self, agent1: str, agent2: str):
         """Start a new conversation between two agents"""
@@ -293,12 +327,12 @@ class TimeDependentEnvironment(BaseEnvironment):
             self.reset_agent_state(agent1)
             self.reset_agent_state(agent2)
             
-            print(f"\n🏁 Conversation completed between {agent1} and {agent2}")
+            console.info("\n🏁 Conversation completed between %s and %s", agent1, agent2)
         else:
             # If we've hit the messages per time step limit but conversation isn't over
             if (self.agent_states[agent1].messages_this_time_step >= 
-                self.cfg.environment.settings.time_dependent.messages_per_time_step):
-                print(f"\n⏸️  Time step limit reached for {agent1} and {agent2}, continuing next time step")
+                self.settings.messages_per_time_step):
+                console.info("\n⏸️  Time step limit reached for %s and %s, continuing next time step", agent1, agent2)
 
         # Check if this was the last possible conversation
         if self.all_conversations_complete():
@@ -355,10 +389,10 @@ class TimeDependentEnvironment(BaseEnvironment):
 
         return {
             "time_step": self.current_step,
-            "max_time_steps": self.cfg.environment.settings.time_dependent.max_time_steps,
+            "max_time_steps": self.settings.max_time_steps,
             "messages_exchanged": messages_exchanged,
-            "max_messages": self.cfg.environment.settings.time_dependent.messages_per_time_step,
-            "messages_per_time_step": self.cfg.environment.settings.time_dependent.messages_per_time_step,
+            "max_messages": self.settings.messages_per_time_step,
+            "messages_per_time_step": self.settings.messages_per_time_step,
             "is_suspended_conversation": is_suspended,
             "past_partners_agent1": list(self.agent_states[agent1].past_partners),
             "past_partners_agent2": list(self.agent_states[agent2].past_partners),
@@ -379,9 +413,9 @@ class TimeDependentEnvironment(BaseEnvironment):
             
         # Check if either agent has reached their message limit for this time step
         if (self.agent_states[agent1].messages_this_time_step >= 
-                self.cfg.environment.settings.time_dependent.messages_per_time_step or
+                self.settings.messages_per_time_step or
             self.agent_states[agent2].messages_this_time_step >= 
-                self.cfg.environment.settings.time_dependent.messages_per_time_step):
+                self.settings.messages_per_time_step):
             return False
             
         # Check short-term memory for end of conversation marker
@@ -402,6 +436,6 @@ class TimeDependentEnvironment(BaseEnvironment):
             return False
             
         return (self.agent_states[agent1].messages_this_time_step < 
-                self.cfg.environment.settings.time_dependent.messages_per_time_step and
+                self.settings.messages_per_time_step and
                 self.agent_states[agent2].messages_this_time_step < 
-                self.cfg.environment.settings.time_dependent.messages_per_time_step) 
\ No newline at end of file
+                self.settings.messages_per_time_step) 
\ No newline at end of file
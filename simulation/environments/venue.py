@@ -0,0 +1,249 @@
+from typing import List, Dict, Set, Tuple
+import random
+from omegaconf import DictConfig
+from core.agent_manager import AgentManager
+from utils.console import console, INFO
+from utils.metrics import metrics
+from .time_dependent import TimeDependentEnvironment
+
+class Room:
+    """One mixer inside the venue: its members, its own RNG and its completion state"""
+    def __init__(self, index: int, members: List[str], seed: int):
+        self.index = index
+        self.members: Set[str] = set(members)
+        self.rng = random.Random(seed)
+        self.conversations = 0  # Conversations completed in this room
+        self.complete = False  # No active conversation and no pair left to meet
+
+class VenueEnvironment(TimeDependentEnvironment):
+    """
+    Time-dependent environment split into rooms of `room_size` agents.
+
+    Pairing, bookkeeping and completion are local to each room, so a step
+    costs O(room_size²) per room instead of O(n²) for the whole population,
+    and in cluster runs each room's pairs go to one worker as a single job
+    (`pair_groups`).
+    Between steps a share of the idle agents swap rooms (`migration_rate`),
+    which brings new partners without growing the rooms. An optional
+    `max_conversations_per_agent` bounds the total number of conversations.
+    """
+    def __init__(self, cfg: DictConfig, agent_manager: AgentManager):
+        settings = cfg.environment.settings.get("venue", {})
+        self.room_size = max(2, settings.get("room_size", 20))
+        self.migration_rate = settings.get("migration_rate", 0.1)
+        self.max_conversations = settings.get("max_conversations_per_agent", None)
+        seed = agent_manager.settings.random_seed
+        self.rng = random.Random(seed)
+        self.rooms: List[Room] = []
+        self.room_of: Dict[str, int] = {}
+        self._dirty_rooms: Set[int] = set()
+        super().__init__(cfg, agent_manager)
+
+    #######################
+    # Rooms
+    #######################
+
+    def initialize_agent_states(self):
+        """Initialize agent states and deal the agents into rooms"""
+        super().initialize_agent_states()
+        names = sorted(self.agent_states)
+        self.rng.shuffle(names)
+        # Spread agents evenly so no room is left with a lone agent
+        num_rooms = max(1, -(-len(names) // self.room_size))
+        for index in range(num_rooms):
+            members = names[index::num_rooms]
+            self.rooms.append(Room(index, members, self.rng.getrandbits(64)))
+            for name in members:
+                self.room_of[name] = index
+        self._dirty_rooms = set(range(num_rooms))
+
+    def has_capacity(self, agent_name: str) -> bool:
+        """Whether the agent may still start new conversations"""
+        return self.max_conversations is None or self.agent_states[agent_name].total_conversations < self.max_conversations
+
+    def can_meet_anyone(self, agent_name: str) -> bool:
+        """Whether the agent has capacity and an unmet partner anywhere in the venue who has capacity too"""
+        if not self.has_capacity(agent_name):
+            return False
+        past_partners = self.agent_states[agent_name].past_partners
+        if self.max_conversations is None:
+            return len(past_partners) < len(self.agent_states) - 1
+        return any(self.has_capacity(other) for other in self.agent_states
+                   if other != agent_name and other not in past_partners)
+
+    def has_available_partners(self, agent_name: str) -> bool:
+        """Check if an agent has a potential partner in its room that it hasn't talked to yet"""
+        room = self.rooms[self.room_of[agent_name]]
+        return len(room.members - {agent_name} - self.agent_states[agent_name].past_partners) > 0
+
+    def room_complete(self, room: Room) -> bool:
+        """A room is complete when nobody in it is talking and no eligible pair is left to meet"""
+        eligible = []
+        for name in room.members:
+            if self.agent_states[name].state == "conversing":
+                return False
+            if self.has_capacity(name):
+                eligible.append(name)
+        for i, agent1 in enumerate(eligible):
+            past_partners = self.agent_states[agent1].past_partners
+            for agent2 in eligible[i + 1:]:
+                if agent2 not in past_partners:
+                    return False
+        return True
+
+    def migrate(self):
+        """Swap a share of the idle agents with idle agents in other rooms, keeping room sizes fixed"""
+        moved: Set[str] = set()
+        for room in self.rooms:
+            for agent1 in sorted(room.members):
+                if agent1 in moved or self.agent_states[agent1].state != "idle" or self.rng.random() >= self.migration_rate:
+                    continue
+                other = self.rooms[self.rng.choice([r.index for r in self.rooms if r.index != room.index])]
+                candidates = sorted(name for name in other.members
+                                    if name not in moved and self.agent_states[name].state == "idle")
+                if not candidates:
+                    continue
+                agent2 = self.rng.choice(candidates)
+                room.members.remove(agent1)
+                other.members.remove(agent2)
+                room.members.add(agent2)
+                other.members.add(agent1)
+                self.room_of[agent1], self.room_of[agent2] = other.index, room.index
+                moved.update((agent1, agent2))
+                self._dirty_rooms.update((room.index, other.index))
+        if moved:
+            metrics.count("venue.migrations", len(moved))
+            console.debug("🚪 %d agents changed rooms", len(moved))
+
+    def room_pairs(self) -> Dict[int, List[Tuple[str, str]]]:
+        """Active conversation pairs grouped by room"""
+        pairs: Dict[int, List[Tuple[str, str]]] = {}
+        for room in self.rooms:
+            processed = set()
+            for agent_name in sorted(room.members):
+                state = self.agent_states[agent_name]
+                if state.state == "conversing" and state.current_partner and agent_name not in processed:
+                    pairs.setdefault(room.index, []).append((agent_name, state.current_partner))
+                    processed.update((agent_name, state.current_partner))
+        return pairs
+
+    def pair_groups(self, pairs: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Pairs grouped by room, so each room runs as one job on one worker"""
+        groups: Dict[int, List[Tuple[str, str]]] = {}
+        for pair in pairs:
+            groups.setdefault(self.room_of[pair[0]], []).append(pair)
+        return list(groups.values())
+
+    #######################
+    # Overrides
+    #######################
+
+    def calculate_total_possible_conversations(self) -> int:
+        """Upper bound on conversations: the per-agent cap, or every pair within the rooms"""
+        n = len(self.agent_manager.get_agent_names())
+        if self.max_conversations is not None:
+            return n * min(self.max_conversations, n - 1) // 2
+        if self.migration_rate > 0:
+            return super().calculate_total_possible_conversations()
+        return sum(len(room.members) * (len(room.members) - 1) // 2 for room in self.rooms)
+
+    def all_conversations_complete(self) -> bool:
+        """
+        Complete when every room is complete and migration cannot bring anyone
+        new: either there is no migration or no agent can meet anyone new (it
+        reached its cap or has met everyone it still could). Only rooms that
+        changed since the last check are re-evaluated.
+        """
+        for index in self._dirty_rooms:
+            self.rooms[index].complete = self.room_complete(self.rooms[index])
+        self._dirty_rooms.clear()
+        completed = all(room.complete for room in self.rooms) and (
+            not self.migration_rate or len(self.rooms) == 1 or
+            not any(self.can_meet_anyone(name) for name in self.agent_states)
+        )
+        if completed and not self.experiment_complete:
+            self.print_experiment_completion()
+        return completed
+
+    def explain_stall(self) -> Tuple[bool, str]:
+        """Rooms can stall while unmet partners sit in other rooms; migration may bring them together"""
+        recoverable, reason = super().explain_stall()
+        if recoverable:
+            return recoverable, reason
+        waiting = [name for name in self.get_idle_agents() if self.can_meet_anyone(name)]
+        if len(waiting) < 2:
+            return False, reason
+        if self.migration_rate > 0 and len(self.rooms) > 1:
+            return True, f"{len(waiting)} agents only have unmet partners in other rooms; waiting for migration"
+        return False, f"{len(waiting)} agents only have unmet partners in other rooms and migration is off"
+
+    def print_experiment_setup(self):
+        super().print_experiment_setup()
+        console.info("Rooms: %d of up to %d agents, migration rate %.2f per step", len(self.rooms), self.room_size, self.migration_rate)
+        if self.max_conversations is not None:
+            console.info("Max conversations per agent: %d", self.max_conversations)
+
+    def pair_room(self, room: Room) -> List[Tuple[str, str]]:
+        """Pair idle agents within one room; resumed conversations first, then new partners"""
+        idle_agents = sorted(name for name in room.members
+                             if self.agent_states[name].state == "idle" and self.has_capacity(name))
+        new_pairs = self.pair_agents(idle_agents, room.rng)
+        if new_pairs:
+            room.complete = False
+        return new_pairs
+
+    def pair_idle_agents(self) -> List[Tuple[str, str]]:
+        """Pair idle agents room by room"""
+        if self.all_conversations_complete():
+            self.experiment_complete = True
+            return []
+
+        new_pairs = []
+        for room in self.rooms:
+            if not room.complete:
+                new_pairs.extend(self.pair_room(room))
+
+        if not new_pairs and self.all_conversations_complete():
+            self.experiment_complete = True
+        return new_pairs
+
+    def get_conversation_pairs(self) -> List[tuple]:
+        """Get all current conversation pairs, room by room"""
+        if self.experiment_complete:
+            return []
+        self.pair_idle_agents()
+        return [pair for pairs in self.room_pairs().values() for pair in pairs]
+
+    def start_new_time_step(self):
+        """Reset message counts, then let idle agents change rooms"""
+        super().start_new_time_step()
+        if self.migration_rate > 0 and len(self.rooms) > 1:
+            self.migrate()
+
+    def reset_agent_state(self, agent_name: str):
+        """Reset an agent to idle; a finished conversation may have completed its room"""
+        super().reset_agent_state(agent_name)
+        room = self.rooms[self.room_of[agent_name]]
+        self._dirty_rooms.add(room.index)
+
+    def update_agent_states(self, agent1: str, agent2: str, ended: bool = False):
+        """Update states after a conversation round or end, counting finished conversations per room"""
+        if ended:
+            self.rooms[self.room_of[agent1]].conversations += 1
+        super().update_agent_states(agent1, agent2, ended)
+
+    def print_agent_stats(self, level: int = INFO):
+        """Print per-agent statistics followed by one row per room"""
+        super().print_agent_stats(level)
+
+        def rows():
+            for room in self.rooms:
+                talking = sum(1 for name in room.members if self.agent_states[name].state == "conversing")
+                yield (room.index, len(room.members), talking, room.conversations, "yes" if room.complete else "no")
+
+        console.table(
+            "Room Statistics",
+            ["Room", "Agents", "Talking", "Conversations", "Complete"],
+            rows,
+            level=level
+        )
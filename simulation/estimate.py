@@ -0,0 +1,79 @@
+"""
+Dry-run estimate of calls, tokens and wall time for a time-dependent run.
+No LLM is called. Takes the same Hydra overrides as main.py:
+
+    python estimate.py experiment.max_agents=20 environment.settings.time_dependent.max_time_steps=30
+
+Calibration history defaults to every run under outputs/ (estimate.history).
+"""
+import os
+import json
+import random
+import hydra
+from omegaconf import DictConfig
+
+from utils.bundle import BundleReader
+from utils.estimator import RunEstimator
+
+
+def load_population(cfg: DictConfig, orig_cwd: str):
+    """Personas and boards for the agents a run with this config would use"""
+    personas, boards = {}, {}
+    if cfg.paths.get("bundle_file"):
+        bundle = BundleReader(os.path.join(orig_cwd, cfg.paths.bundle_file))
+        for name in bundle.names():
+            personas[name] = bundle.persona(name)
+            boards[name] = bundle.board(name)
+        bundle.close()
+    else:
+        agents_dir = os.path.join(orig_cwd, cfg.paths.agents_dir)
+        boards_dir = os.path.join(orig_cwd, cfg.paths.bingo_board_dir)
+        for fname in os.listdir(agents_dir):
+            if fname.endswith(".txt"):
+                with open(os.path.join(agents_dir, fname), "r") as f:
+                    personas[fname[:-4]] = f.read().strip()
+                board_path = os.path.join(boards_dir, f"{fname[:-4]}.json")
+                if os.path.exists(board_path):
+                    with open(board_path, "r") as f:
+                        boards[fname[:-4]] = json.load(f)
+    if cfg.experiment.max_agents < len(personas):
+        names = random.Random(0).sample(sorted(personas), cfg.experiment.max_agents)
+        personas = {name: personas[name] for name in names}
+    return personas, boards
+
+
+@hydra.main(version_base=None, config_path="configs", config_name="config")
+def main(cfg: DictConfig) -> None:
+    orig_cwd = hydra.utils.get_original_cwd()
+    settings = cfg.get("estimate", {})
+    time_dependent = cfg.environment.settings.time_dependent
+
+    personas, boards = load_population(cfg, orig_cwd)
+    estimator = RunEstimator(
+        agent_names=sorted(personas),
+        max_time_steps=time_dependent.max_time_steps,
+        messages_per_time_step=time_dependent.messages_per_time_step,
+        throttle_delay=cfg.agent.agent.delay,
+        consolidation_mode=cfg.conversation.conversation.get("memory_consolidation", {}).get("mode", "structured"),
+    )
+    with open(os.path.join(orig_cwd, cfg.agent.agent.prompt_template_file), "r") as f:
+        estimator.set_static_prompt(f.read().strip(), personas, boards)
+    history = [os.path.join(orig_cwd, path) for path in settings.get("history", ["outputs"])]
+    estimator.calibrate(history)
+    result = estimator.estimate(trials=settings.get("trials", 200), seed=settings.get("seed", 0))
+
+    print("\n=== Run Estimate ===")
+    print(f"Agents: {result['agents']}, time steps: {time_dependent.max_time_steps}, "
+          f"messages per step: {time_dependent.messages_per_time_step}")
+    print(f"Calibrated from {result['calibration_runs']} previous runs, {result['trials']} trials")
+    print(f"{'':22}{'mean':>12}{'p5':>12}{'p50':>12}{'p95':>12}")
+    for name, summary in result["estimates"].items():
+        print(f"{name:22}{summary['mean']:>12,.1f}{summary['p5']:>12,.1f}{summary['p50']:>12,.1f}{summary['p95']:>12,.1f}")
+    print("====================")
+    if settings.get("output"):
+        with open(os.path.join(orig_cwd, settings.output), "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 import os
+import json
 import hydra
 from omegaconf import DictConfig
 
 from utils.log_memory import log_conversation, generate_conversation_id
 from utils.token_counter import TokenCounter
+from utils.console import console, NOTICE
+from utils.metrics import metrics
+from utils.profiler import profiler
+from utils.settings import Settings
+from utils.model_router import router, hedging
+from utils.quota import quota
 import time
 
 from core.agent_manager import AgentManager
@@ -11,24 +18,20 @@ from core.bingo_manager import BingoManager
 from core.conversation_manager import ConversationManager
 from environments.environment_factory import EnvironmentFactory
 
-@hydra.main(version_base=None, config_path="configs", config_name="config")
-def main(cfg: DictConfig) -> None:
-    """Main entry point for the simulation"""
-    # Get the original working directory (project root)
-    orig_cwd = hydra.utils.get_original_cwd()
-    start_time = time.time()
-    # Initialize token counter
-    token_counter = TokenCounter()
-    
+def setup_experiment(cfg: DictConfig, orig_cwd: str, token_counter: TokenCounter) -> str:
+    """Assign an experiment id, resolve paths, create output directories and configure shared services"""
+    console.configure(cfg)
     experiment_id = generate_conversation_id()
     
-    print(f"Experiment ID: {experiment_id}")
+    console.info("Experiment ID: %s", experiment_id)
     
     cfg.experiment.experiment_id = experiment_id
     
     # Update paths to be absolute
     for key in ['outputs_dir', 'agents_dir', 'bingo_board_dir']:
         cfg.paths[key] = os.path.join(orig_cwd, cfg.paths[key])
+    if cfg.paths.get("bundle_file"):
+        cfg.paths.bundle_file = os.path.join(orig_cwd, cfg.paths.bundle_file)
     
     # Update output paths and create directories
     cfg.paths.outputs_dir = os.path.join(cfg.paths.outputs_dir, experiment_id)
@@ -36,46 +39,86 @@ def main(cfg: DictConfig) -> None:
     
     # Create output directories
     os.makedirs(cfg.paths.outputs_dir, exist_ok=True)
-    os.makedirs(cfg.paths.bingo_output_dir, exist_ok=True)
-    # Copy all JSON files from bingo_board_dir to bingo_output_dir
-    for filename in os.listdir(cfg.paths.bingo_board_dir):
-        if filename.endswith(".json"):
-            source_path = os.path.join(cfg.paths.bingo_board_dir, filename)
-            dest_path = os.path.join(cfg.paths.bingo_output_dir, filename)
-            try:
-                with open(source_path, "r") as source, open(dest_path, "w") as dest:
-                    dest.write(source.read())
-            except IOError as e:
-                print(f"Error copying bingo board {filename}: {e}")
-    log_path = os.path.join(cfg.paths.outputs_dir, f"conversation_{experiment_id}.json")
+    metrics.configure(cfg, cfg.paths.outputs_dir)
+    profiler.configure(cfg, cfg.paths.outputs_dir)
+    token_counter.set_output_dir(cfg.paths.outputs_dir)
+    router.configure(cfg)
+    quota.configure(cfg, orig_cwd)
+    # Source boards are read in place; fills go to bingo_fills.jsonl (see BingoManager)
+    return experiment_id
 
-    # Create output directories
-    os.makedirs(cfg.paths.outputs_dir, exist_ok=True)
-    os.makedirs(cfg.paths.bingo_output_dir, exist_ok=True)
 
+def build_simulation(cfg: DictConfig, token_counter: TokenCounter) -> ConversationManager:
+    """Create the managers and environment for a prepared experiment"""
     # Initialize managers
-    agent_manager = AgentManager(cfg)
+    # Loop settings are resolved and validated once; the managers and environment share this snapshot
+    agent_manager = AgentManager(cfg, token_counter, Settings.from_cfg(cfg))
     bingo_manager = BingoManager(cfg)
     
     # Create environment
     environment = EnvironmentFactory.create_environment(cfg.environment.type, cfg, agent_manager)
     
     # Initialize conversation manager with environment and token counter
-    conversation_manager = ConversationManager(cfg, agent_manager, bingo_manager, environment, token_counter)
+    return ConversationManager(cfg, agent_manager, bingo_manager, environment, token_counter)
+
+
+@hydra.main(version_base=None, config_path="configs", config_name="config")
+def main(cfg: DictConfig) -> None:
+    """Main entry point for the simulation"""
+    # Get the original working directory (project root)
+    orig_cwd = hydra.utils.get_original_cwd()
+    start_time = time.time()
+    # Initialize token counter (per-call records are streamed once the output dir exists)
+    token_counter = TokenCounter()
+    
+    experiment_id = setup_experiment(cfg, orig_cwd, token_counter)
+    log_path = os.path.join(cfg.paths.outputs_dir, f"conversation_{experiment_id}.json")
+    
+    conversation_manager = build_simulation(cfg, token_counter)
 
     # Run simulation
     all_conversations = conversation_manager.simulate_conversations()
+    if conversation_manager.coordinator:
+        conversation_manager.coordinator.close()
     log_conversation(experiment_id, all_conversations, log_path)
+    conversation_manager.bingo_manager.close()
+    board_paths = conversation_manager.bingo_manager.materialize(conversation_manager.agent_manager.get_agent_names())
+    console.info("🎯 %d final bingo boards written to: %s", len(board_paths), cfg.paths.bingo_output_dir)
+    assembler = conversation_manager.context_assembler
+    console.info("🧩 Context builds: %d, truncated: %.1f%%", assembler.builds, assembler.truncation_rate() * 100)
+    console.notice("🏆 Agents with a bingo: %d (%d lines completed)",
+                   conversation_manager.bingo_manager.bingo_count(), len(conversation_manager.bingo_manager.events))
     
-    print(f"\n📚 All conversation summaries saved to: {log_path}")
+    console.info("\n📚 All conversation summaries saved to: %s", log_path)
     
     end_time = time.time() 
     
     # Save and print token usage
     token_usage_path = token_counter.save_summary(cfg.paths.outputs_dir)
-    token_counter.print_summary()
-    print(f"\n💰 Token usage data saved to: {token_usage_path}")
-    print(f"Time taken: {(end_time - start_time)/60} minutes")
+    token_counter.close()
+    if console.enabled(NOTICE):
+        token_counter.print_summary()
+    console.notice("\n💰 Token usage data saved to: %s", token_usage_path)
+    if metrics.enabled:
+        metrics_path = metrics.save_report(cfg.paths.outputs_dir)
+        console.notice("⏱️  Phase timings saved to: %s", metrics_path)
+    if hedging.enabled or hedging.abandoned_calls:
+        hedge_report = hedging.report()
+        console.notice("🪁 Hedged %d of %d calls (%d won), %d timed-out calls still answered, %d duplicate tokens",
+                       hedge_report["hedges"], hedge_report["calls"], hedge_report["hedge_wins"],
+                       hedge_report["abandoned_calls"], hedge_report["duplicate_tokens"])
+    if quota.enabled:
+        quota_report = quota.report()
+        quota_path = os.path.join(cfg.paths.outputs_dir, "quota_report.json")
+        with open(quota_path, "w") as f:
+            json.dump(quota_report, f, indent=2)
+        console.notice("📶 Quota: %.1f requests/min measured vs %s allowed (%.0f%% utilization), %d rate limited; waited %.1fs here",
+                       quota_report["requests_per_minute_measured"], quota_report["requests_per_minute_quota"],
+                       quota_report["utilization"] * 100, quota_report["rate_limited"],
+                       quota_report["process"]["waited_seconds"])
+    if profiler.enabled:
+        console.notice("🔬 Profile (%s) saved to: %s", profiler.mode, profiler.stop())
+    console.notice("Time taken: %s minutes", (end_time - start_time)/60)
 
 if __name__ == "__main__":
     main()
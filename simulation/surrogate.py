@@ -0,0 +1,68 @@
+"""
+LLM-free surrogate runs of the time-dependent environment.
+
+Calibrates conversation length and fill probability from earlier runs, then
+simulates many replicas with NumPy. Takes the same Hydra overrides as
+main.py, so configurations can be swept without spending tokens:
+
+    python surrogate.py surrogate.agents=10000 surrogate.replicas=1000
+    python surrogate.py -m environment.settings.time_dependent.messages_per_time_step=1,2,4
+"""
+import os
+import json
+import time
+import hydra
+from omegaconf import DictConfig
+
+from environments.surrogate import SurrogateTimeDependent, calibrate
+
+
+@hydra.main(version_base=None, config_path="configs", config_name="config")
+def main(cfg: DictConfig) -> None:
+    orig_cwd = hydra.utils.get_original_cwd()
+    settings = cfg.surrogate
+    time_dependent = cfg.environment.settings.time_dependent
+
+    calibration = calibrate([os.path.join(orig_cwd, path) for path in settings.history])
+    fill_probability = settings.fill_probability if settings.fill_probability is not None else calibration["fill_probability"]
+    model = SurrogateTimeDependent(
+        num_agents=settings.agents or cfg.experiment.max_agents,
+        max_time_steps=time_dependent.max_time_steps,
+        messages_per_time_step=time_dependent.messages_per_time_step,
+        conversation_lengths=calibration["conversation_lengths"],
+        fill_probability=fill_probability,
+        board_squares=settings.board_squares,
+        policy=settings.policy,
+        pairing_rounds=settings.pairing_rounds,
+        bitset_words=settings.bitset_words,
+        target_bingos=cfg.experiment.get("target_bingos"),
+    )
+
+    start = time.perf_counter()
+    summary = model.run(settings.replicas, batch_size=settings.batch_size, seed=settings.seed)
+    elapsed = time.perf_counter() - start
+
+    print("\n=== Surrogate Run ===")
+    print(f"Agents: {model.num_agents}, replicas: {settings.replicas}, time steps: {time_dependent.max_time_steps}, "
+          f"messages per step: {time_dependent.messages_per_time_step}, policy: {model.policy}")
+    print(f"Calibrated from {calibration['runs']} runs, fill probability {model.fill_probability:.3f}"
+          f"{'' if model.exact else ', hashed partner bitset'}")
+    print(f"{'':24}{'mean':>12}{'p5':>12}{'p50':>12}{'p95':>12}")
+    for name, values in summary.items():
+        if isinstance(values, dict):
+            print(f"{name:24}{values['mean']:>12,.2f}{values['p5']:>12,.2f}{values['p50']:>12,.2f}{values['p95']:>12,.2f}")
+    if "target_reached_share" in summary and model.target_bingos:
+        print(f"Target of {model.target_bingos} bingos reached in {summary['target_reached_share']:.0%} of replicas")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print("=====================")
+
+    # Hydra runs in its own output directory, so every sweep point keeps its result
+    with open("surrogate_summary.json", "w") as f:
+        json.dump({"agents": model.num_agents, "replicas": settings.replicas,
+                   "max_time_steps": time_dependent.max_time_steps,
+                   "messages_per_time_step": time_dependent.messages_per_time_step,
+                   "policy": model.policy, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,17 @@
-from dotenv import load_dotenv
-import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../.env'))
-print(f"Loading .env from: {env_path}")
-load_dotenv(env_path)
+from utils.model_router import router
 
 
 class AgentBase:
-    def __init__(self):
-        self.model = ChatGoogleGenerativeAI(
-            model="gemma-3-27b-it",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.1,
-        )
+    def __init__(self, call_type: str = "dialogue"):
+        # Agents share one client per call type; the model comes from the routing table
+        # and its client is only created on the first call
+        self.route = router.route(call_type)
+        self.model_name = self.route.model
+
+    def invoke(self, prompt):
+        """Return the full model message, including usage metadata"""
+        return self.route.invoke(prompt)
 
     def get_response(self, prompt):
-        agent_response = self.model.invoke(prompt)
+        agent_response = self.invoke(prompt)
         return agent_response.content
@@ -1,10 +1,13 @@
 import os
 import json
 
+from utils.bundle import normalize_board
+
 def load_and_split_bingo_boards(master_path, output_dir):
     """
     Reads the master bingo board JSON and writes one JSON file per agent in the output_dir.
-    Each square is augmented with tracking fields: filled, matched_with, response_snippet.
+    Boards are normalized to the flat schema BingoManager and the bundle compiler use:
+    nested rows are flattened and each square gets filled, matched_with and response_snippet.
     """
     os.makedirs(output_dir, exist_ok=True)
 
@@ -18,16 +21,9 @@ def load_and_split_bingo_boards(master_path, output_dir):
         if not agent_name:
             continue  # skip boards with no assigned owner
 
-        # Augment each square with bingo-tracking fields
-        for row in board["squares"]:
-            for square in row:
-                square["filled"] = False
-                square["matched_with"] = None
-                square["response_snippet"] = None
-
-        path = os.path.join(output_dir, f"{agent_name}_bingo.json")
+        path = os.path.join(output_dir, f"{agent_name}.json")
         with open(path, "w") as f:
-            json.dump(board, f, indent=2)
+            json.dump(normalize_board(board), f, indent=2)
 
         agent_board_paths[agent_name] = path
 
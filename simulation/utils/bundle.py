@@ -0,0 +1,166 @@
+"""
+Precompiled persona and bingo board bundle.
+
+All personas and boards are packed into one versioned binary file that is
+memory-mapped read-only, so any number of worker processes share a single
+copy through the page cache and nothing is decoded until it is looked up.
+
+Layout (little endian):
+    header   MAGIC (8 bytes) | version u32 | agent count u32 | index offset u64
+    data     name, persona and board JSON (UTF-8) for every agent
+    index    one INDEX_ENTRY per agent, sorted by name:
+             name offset/length, persona offset/length, board offset/length
+
+Compile from the simulation directory:
+    python -m utils.bundle --agents agents_personas --boards bingo_boards/input --out population.bundle
+"""
+import os
+import json
+import mmap
+import struct
+import argparse
+from typing import Any, Dict, Iterator, List, Optional
+
+MAGIC = b"BINGOBDL"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+INDEX_ENTRY = struct.Struct("<QIQIQI")
+
+
+def normalize_board(board: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bring a board into the flat schema BingoManager uses: `squares` is a list
+    of squares, each with filled/matched_with/response_snippet tracking fields.
+    Boards from the master file nest squares in rows; those are flattened.
+    """
+    squares = board.get("squares", [])
+    if squares and isinstance(squares[0], list):
+        squares = [square for row in squares for square in row]
+    normalized = {key: value for key, value in board.items() if key != "squares"}
+    normalized["squares"] = [
+        {
+            **square,
+            "filled": square.get("filled", False),
+            "matched_with": square.get("matched_with", ""),
+            "response_snippet": square.get("response_snippet", ""),
+        }
+        for square in squares
+    ]
+    return normalized
+
+
+def compile_bundle(agents_dir: str, boards_dir: str, out_path: str) -> int:
+    """Pack every persona in agents_dir (with its board from boards_dir) into a bundle; returns the agent count"""
+    names = sorted(f[:-4] for f in os.listdir(agents_dir) if f.endswith(".txt"))
+
+    data = bytearray()
+    entries = []
+    offset = HEADER.size
+    for name in names:
+        with open(os.path.join(agents_dir, f"{name}.txt"), "r") as f:
+            persona = f.read().strip()
+        board_path = os.path.join(boards_dir, f"{name}.json")
+        board = {"squares": []}
+        if os.path.exists(board_path):
+            with open(board_path, "r") as f:
+                board = normalize_board(json.load(f))
+
+        fields = []
+        for blob in (
+            name.encode("utf-8"),
+            persona.encode("utf-8"),
+            json.dumps(board, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+        ):
+            fields.extend((offset + len(data), len(blob)))
+            data += blob
+        entries.append(fields)
+
+    index_offset = HEADER.size + len(data)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(names), index_offset))
+        f.write(data)
+        for fields in entries:
+            f.write(INDEX_ENTRY.pack(*fields))
+    os.replace(tmp_path, out_path)
+    return len(names)
+
+
+class BundleReader:
+    """Read-only, memory-mapped view of a compiled bundle"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, index_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a bingo bundle")
+        if version != VERSION:
+            raise ValueError(f"{path} is bundle version {version}, expected {VERSION}; recompile it")
+        self.version = version
+        self.count = count
+        self._index_offset = index_offset
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _entry(self, i: int):
+        return INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + i * INDEX_ENTRY.size)
+
+    def _text(self, offset: int, length: int) -> str:
+        return self._mmap[offset:offset + length].decode("utf-8")
+
+    def _find(self, name: str) -> Optional[tuple]:
+        """Binary search the sorted index, so lookups need no in-memory name table"""
+        key = name.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            current = self._mmap[entry[0]:entry[0] + entry[1]]
+            if current == key:
+                return entry
+            if current < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def names(self) -> Iterator[str]:
+        for i in range(self.count):
+            name_offset, name_length = self._entry(i)[:2]
+            yield self._text(name_offset, name_length)
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(name) is not None
+
+    def persona(self, name: str) -> Optional[str]:
+        entry = self._find(name)
+        return self._text(entry[2], entry[3]) if entry else None
+
+    def board_bytes(self, name: str) -> Optional[bytes]:
+        entry = self._find(name)
+        return self._mmap[entry[4]:entry[4] + entry[5]] if entry else None
+
+    def board(self, name: str) -> Optional[Dict[str, Any]]:
+        raw = self.board_bytes(name)
+        return json.loads(raw) if raw is not None else None
+
+    def close(self):
+        self._mmap.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compile personas and bingo boards into a bundle")
+    parser.add_argument("--agents", default="agents_personas", help="Directory of <name>.txt personas")
+    parser.add_argument("--boards", default="bingo_boards/input", help="Directory of <name>.json boards")
+    parser.add_argument("--out", default="population.bundle", help="Bundle file to write")
+    args = parser.parse_args(argv)
+
+    count = compile_bundle(args.agents, args.boards, args.out)
+    print(f"Compiled {count} agents into {args.out} ({os.path.getsize(args.out):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Leveled, buffered console output for the simulation loop"""
+import sys
+import atexit
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Union
+
+# Ordered from least to most verbose
+LEVELS = {
+    "quiet": 0,     # errors only
+    "progress": 1,  # warnings plus a progress bar
+    "info": 2,      # conversation banners and agent messages
+    "debug": 3,     # prompt sizes, per-exchange bookkeeping
+}
+
+ERROR = 0
+WARNING = 1
+NOTICE = 1  # run-level results that should survive `progress` mode
+INFO = 2
+DEBUG = 3
+
+Message = Union[str, Callable[[], str]]
+
+
+class Console:
+    """
+    Small leveled logger used instead of bare print() in the hot loop.
+
+    Messages below the configured level are dropped before any formatting
+    happens: pass %-style args or a zero-argument callable instead of an
+    f-string so the message is only built when it will actually be shown.
+    Enabled lines are buffered and written in one go, either when the buffer
+    fills up, when a warning/error arrives, or when flush() is called at the
+    end of a time step.
+    """
+
+    def __init__(self, level: str = "info", buffer_lines: int = 50, stream=None):
+        self.stream = stream or sys.stdout
+        self.buffer_lines = buffer_lines
+        self.agent_stats = False
+        self._buffer: List[str] = []
+        # Conversations of a round log from several threads
+        self._lock = threading.Lock()
+        self._progress = None
+        self._task = None
+        self._rich_console = None
+        self.set_level(level)
+
+    def set_level(self, level: str):
+        """Set the verbosity by name (quiet, progress, info, debug)"""
+        if level not in LEVELS:
+            raise ValueError(f"Unknown console level: {level}. Available levels: {list(LEVELS.keys())}")
+        self.level_name = level
+        self.level = LEVELS[level]
+
+    def configure(self, cfg) -> "Console":
+        """Apply the `console` section of the Hydra config, if present"""
+        settings = cfg.get("console") if hasattr(cfg, "get") else None
+        if settings:
+            self.set_level(settings.get("level", self.level_name))
+            self.buffer_lines = settings.get("buffer_lines", self.buffer_lines)
+            self.agent_stats = settings.get("agent_stats", self.agent_stats)
+        return self
+
+    def enabled(self, level: int) -> bool:
+        """Whether messages at this level would be shown"""
+        return level <= self.level
+
+    #######################
+    # Messages
+    #######################
+
+    def log(self, level: int, message: Message, *args: Any):
+        """Queue a message if its level is enabled; formatting is deferred until then"""
+        if level > self.level:
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+        with self._lock:
+            self._buffer.append(message)
+            full = len(self._buffer) >= self.buffer_lines
+        if level <= WARNING or full:
+            self.flush()
+
+    def error(self, message: Message, *args: Any):
+        self.log(ERROR, message, *args)
+
+    def warning(self, message: Message, *args: Any):
+        self.log(WARNING, message, *args)
+
+    def notice(self, message: Message, *args: Any):
+        self.log(NOTICE, message, *args)
+
+    def info(self, message: Message, *args: Any):
+        self.log(INFO, message, *args)
+
+    def debug(self, message: Message, *args: Any):
+        self.log(DEBUG, message, *args)
+
+    def flush(self):
+        """Write out all buffered lines"""
+        with self._lock:
+            if not self._buffer:
+                return
+            text = "\n".join(self._buffer)
+            self._buffer.clear()
+            if self._progress is not None:
+                # Keep the progress bar pinned below regular output
+                self._progress.console.print(text, markup=False, highlight=False)
+            else:
+                self.stream.write(text + "\n")
+                self.stream.flush()
+
+    #######################
+    # Tables and progress
+    #######################
+
+    def _get_rich_console(self):
+        """Create the rich console on first use"""
+        if self._rich_console is None:
+            from rich.console import Console as RichConsole
+            self._rich_console = RichConsole(file=self.stream)
+        return self._rich_console
+
+    def table(self, title: str, columns: Sequence[str], rows: Callable[[], Iterable[Sequence[Any]]], level: int = INFO):
+        """Render a table; `rows` is only evaluated when the level is enabled"""
+        if level > self.level:
+            return
+        from rich.table import Table
+
+        self.flush()
+        table = Table(title=title)
+        for column in columns:
+            table.add_column(column)
+        for row in rows():
+            table.add_row(*[str(cell) for cell in row])
+        if self._progress is not None:
+            self._progress.console.print(table)
+        else:
+            self._get_rich_console().print(table)
+
+    def start_progress(self, total: int, description: str):
+        """Show a progress bar; only used in `progress` mode"""
+        if self.level != LEVELS["progress"]:
+            return
+        from rich.progress import Progress
+
+        self.flush()
+        self._progress = Progress(console=self._get_rich_console(), transient=False)
+        self._progress.start()
+        self._task = self._progress.add_task(description, total=total)
+
+    def advance(self, steps: int = 1, description: Optional[str] = None):
+        """Advance the progress bar, if one is showing"""
+        if self._progress is None:
+            return
+        if description is not None:
+            self._progress.update(self._task, advance=steps, description=description)
+        else:
+            self._progress.advance(self._task, steps)
+
+    def stop_progress(self):
+        """Remove the progress bar and flush anything still buffered"""
+        self.flush()
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+            self._task = None
+
+
+# Shared console, configured from the Hydra config in main.py
+console = Console()
+atexit.register(console.flush)
@@ -0,0 +1,136 @@
+"""Token-budgeted conversation context for dialogue prompts"""
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from utils.metrics import metrics
+from utils.token_counter import estimate_tokens
+
+
+def _trim_to_budget(text: str, budget: int) -> str:
+    """Keep the end of `text` (the most recent part) within `budget` estimated tokens"""
+    budget -= estimate_tokens("...")
+    if budget <= 0:
+        return ""
+    words = text.split()
+    kept: List[str] = []
+    used = 0
+    for word in reversed(words):
+        cost = estimate_tokens(word)
+        if used + cost > budget:
+            break
+        kept.append(word)
+        used += cost
+    return "... " + " ".join(reversed(kept)) if kept else ""
+
+
+class ContextAssembler:
+    """
+    Builds the `conversation_summary` block of the dialogue prompt.
+
+    Each conversation keeps a ring buffer of its last `window` exchanges.
+    The block is packed into `max_tokens` (estimated) in priority order:
+    the turns of the current exchange, then recent exchanges newest first
+    (up to half the budget), then what each agent knows about the other
+    and the digest of earlier steps, which share what is left. Anything
+    that does not fit is dropped or trimmed from the start, and every build
+    that loses something counts towards the truncation rate.
+    """
+
+    def __init__(self, max_tokens: int = 600, window: int = 6):
+        self.max_tokens = max_tokens
+        self.window = window
+        self._buffers: Dict[frozenset, Deque[Dict[str, str]]] = {}
+        self.builds = 0
+        self.truncated = 0
+
+    def _buffer(self, agent1: str, agent2: str) -> Deque[Dict[str, str]]:
+        key = frozenset((agent1, agent2))
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = deque(maxlen=self.window)
+        return buffer
+
+    def add_exchange(self, agent1: str, agent2: str, exchange: Dict[str, str]):
+        self._buffer(agent1, agent2).append(exchange)
+
+    def seed(self, agent1: str, agent2: str, exchanges: List[Dict[str, str]]):
+        """Fill an empty buffer from stored exchanges, e.g. when a conversation is resumed"""
+        buffer = self._buffer(agent1, agent2)
+        if not buffer:
+            buffer.extend(exchanges[-self.window:])
+
+    def reset(self, agent1: str, agent2: str):
+        """Forget a finished conversation"""
+        self._buffers.pop(frozenset((agent1, agent2)), None)
+
+    def recent(self, agent1: str, agent2: str) -> List[Dict[str, str]]:
+        return list(self._buffer(agent1, agent2))
+
+    @staticmethod
+    def format_exchange(exchange: Dict[str, str]) -> str:
+        return "\n".join(f"{speaker}: {text}" for speaker, text in exchange.items())
+
+    def _fit(self, text: str, budget: int):
+        """(text trimmed to budget, its cost, whether it was trimmed)"""
+        cost = estimate_tokens(text)
+        if cost <= budget:
+            return text, cost, False
+        text = _trim_to_budget(text, budget)
+        return text, estimate_tokens(text), True
+
+    def build(self, speaker: str, listener: str, memory: Dict[str, str],
+              turn_responses: Optional[Dict[str, str]] = None) -> str:
+        """Assemble the context block for `speaker`, bounded by max_tokens"""
+        budget = self.max_tokens
+        truncated = False
+
+        current = ""
+        if turn_responses:
+            current, cost, trimmed = self._fit(f"This exchange so far:\n{self.format_exchange(turn_responses)}", budget)
+            budget -= cost
+            truncated |= trimmed
+
+        recent: List[str] = []
+        recent_budget = min(budget, self.max_tokens // 2)
+        for exchange in reversed(self.recent(speaker, listener)):
+            text = self.format_exchange(exchange)
+            cost = estimate_tokens(text)
+            if cost > recent_budget:
+                truncated = True
+                break
+            recent.append(text)
+            recent_budget -= cost
+            budget -= cost
+
+        background = []
+        if memory.get("previous_insights_about_partner"):
+            background.append(f"What you know about {listener}: {memory['previous_insights_about_partner']}")
+        if memory.get("partner_previous_insights"):
+            background.append(f"What {listener} knows about you: {memory['partner_previous_insights']}")
+        if memory.get("conversation_summary"):
+            background.append(f"Previous conversation:\n{memory['conversation_summary']}")
+        sections = []
+        for i, text in enumerate(background):
+            text, cost, trimmed = self._fit(text, budget // (len(background) - i))
+            budget -= cost
+            truncated |= trimmed
+            if text:
+                sections.append(text)
+
+        if recent:
+            sections.append("The conversation till this point:\n" + "\n".join(reversed(recent)))
+        if current:
+            sections.append(current)
+
+        context = "\n\n".join(sections)
+        self.builds += 1
+        metrics.count("context.builds")
+        metrics.observe("context.tokens", self.max_tokens - budget)
+        if truncated:
+            self.truncated += 1
+            metrics.count("context.truncated")
+        return context
+
+    def truncation_rate(self) -> float:
+        """Share of builds that had to drop or trim something"""
+        return self.truncated / self.builds if self.builds else 0.0
@@ -0,0 +1,241 @@
+"""
+Pre-run estimate of LLM calls, tokens and wall time for a time-dependent run.
+
+Each Monte Carlo trial replays the pairing rules of TimeDependentEnvironment
+(idle agents are shuffled and greedily paired with someone they have not
+finished a conversation with; each pair exchanges at most
+messages_per_time_step messages per step) with conversation lengths, token
+counts and latencies sampled from previous runs. The spread across trials
+gives the confidence ranges.
+
+Calibration sources, all optional:
+    token_calls_*.jsonl  per-call prompt/completion tokens by call type
+    token_usage_*.json   per-call-type means, for runs without a calls file
+    metrics_*.json       LLM latency percentiles and consolidation counters
+    memory archive       conversation lengths (exchanges per conversation)
+Without history the prompt size comes from prompt_template.txt rendered with
+each persona and board, and latencies fall back to DEFAULT_LATENCY.
+"""
+import glob
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.run_analytics import RunAnalytics, find_runs, iter_jsonl
+from utils.token_counter import estimate_tokens
+
+CALL_TYPES = ("dialogue", "digest", "long_term_memory")
+# Median seconds per call when no metrics history exists
+DEFAULT_LATENCY = {"dialogue": 2.0, "digest": 1.0, "long_term_memory": 1.5}
+# Mean exchanges per conversation when no archive history exists
+DEFAULT_CONVERSATION_LENGTH = 4.0
+# Completion tokens per call when no token history exists
+DEFAULT_COMPLETION_TOKENS = {"dialogue": 40, "digest": 60, "long_term_memory": 120}
+MAX_SAMPLES = 50000
+
+
+class RunEstimator:
+    """Calibrates from earlier runs and simulates a planned run many times"""
+
+    def __init__(self, agent_names: List[str], max_time_steps: int, messages_per_time_step: int,
+                 throttle_delay: float, pair_delay: float = 10.0, consolidation_mode: str = "structured"):
+        self.agent_names = agent_names
+        self.max_time_steps = max_time_steps
+        self.messages_per_time_step = messages_per_time_step
+        self.throttle_delay = throttle_delay
+        self.pair_delay = pair_delay
+        self.consolidation_mode = consolidation_mode
+        self.prompt_tokens: Dict[str, np.ndarray] = {}
+        self.completion_tokens: Dict[str, np.ndarray] = {}
+        self.latency: Dict[str, tuple] = {t: (np.log(DEFAULT_LATENCY[t]), 0.35) for t in CALL_TYPES}
+        self.conversation_lengths = np.array([], dtype=np.int64)
+        self.digest_rate = 0.0
+        self.parse_failure_rate = 0.0
+        self.static_prompt_tokens = 0.0
+        self.runs_used = 0
+
+    #######################
+    # Calibration
+    #######################
+
+    def set_static_prompt(self, template: str, personas: Dict[str, str], boards: Dict[str, Any]):
+        """Prompt size before any memory context, averaged over the population"""
+        sizes = []
+        for name, persona in personas.items():
+            values = dict.fromkeys(
+                ["other_name", "conversation_summary", "time_step", "max_time_steps", "messages_exchanged",
+                 "max_messages", "past_partners_agent1", "past_partners_agent2", "last_exchange",
+                 "num_filled_squares", "num_unfilled_squares"], ""
+            )
+            prompt = template.format(name=name, personality=persona, agent_curr_bingo_board=boards.get(name), **values)
+            sizes.append(estimate_tokens(prompt))
+        self.static_prompt_tokens = float(np.mean(sizes)) if sizes else 0.0
+
+    def calibrate(self, paths: List[str]):
+        """Load token, latency and conversation-length history from earlier run directories"""
+        runs = find_runs(paths) if paths else []
+        self.runs_used = len(runs)
+        prompts: Dict[str, List[int]] = {t: [] for t in CALL_TYPES}
+        completions: Dict[str, List[int]] = {t: [] for t in CALL_TYPES}
+        analytics = RunAnalytics()
+        latencies: Dict[str, List[tuple]] = {t: [] for t in CALL_TYPES}
+        counters: Dict[str, float] = {}
+
+        for run_dir in runs:
+            calls_files = glob.glob(os.path.join(run_dir, "token_calls_*.jsonl"))
+            for calls_path in calls_files:
+                for record in iter_jsonl(calls_path):
+                    call_type = record.get("call_type")
+                    if call_type in prompts and len(prompts[call_type]) < MAX_SAMPLES:
+                        prompts[call_type].append(record.get("prompt_tokens", 0))
+                        completions[call_type].append(record.get("completion_tokens", 0))
+            if not calls_files:
+                # Older runs only have the summary: use each call type's mean
+                for usage_path in glob.glob(os.path.join(run_dir, "token_usage_*.json")):
+                    with open(usage_path, "r") as f:
+                        usage = json.load(f)
+                    for call_type, totals in usage.get("by_call_type", {}).items():
+                        if call_type in prompts and totals.get("calls"):
+                            prompts[call_type].append(totals["prompt_tokens"] // totals["calls"])
+                            completions[call_type].append(totals["completion_tokens"] // totals["calls"])
+            for metrics_path in glob.glob(os.path.join(run_dir, "metrics_*.json")):
+                with open(metrics_path, "r") as f:
+                    report = json.load(f)
+                for call_type in CALL_TYPES:
+                    phase = report.get("phases", {}).get(f"llm.{call_type}")
+                    if phase and phase.get("count") and phase.get("p50", 0) > 0:
+                        latencies[call_type].append((phase["p50"], phase["p95"], phase["count"]))
+                for name, value in report.get("counters", {}).items():
+                    counters[name] = counters.get(name, 0) + value
+            analytics.add_run(run_dir)
+
+        for call_type in CALL_TYPES:
+            if prompts[call_type]:
+                self.prompt_tokens[call_type] = np.array(prompts[call_type], dtype=np.int64)
+                self.completion_tokens[call_type] = np.array(completions[call_type], dtype=np.int64)
+            if latencies[call_type]:
+                # Count-weighted log-normal fit from the median and p95
+                p50, p95, weights = np.array(latencies[call_type], dtype=float).T
+                mu = np.average(np.log(p50), weights=weights)
+                sigma = max(np.average((np.log(np.maximum(p95, p50)) - np.log(p50)) / 1.645, weights=weights), 0.05)
+                self.latency[call_type] = (mu, sigma)
+
+        self.conversation_lengths = analytics.conversation_lengths()[:, 3]
+        dialogue_calls = counters.get("llm.dialogue.calls", 0)
+        if dialogue_calls:
+            self.digest_rate = counters.get("llm.digest.calls", 0) / dialogue_calls
+        consolidations = counters.get("llm.long_term_memory.calls", 0) - counters.get("memory.consolidation.parse_failures", 0) * 2
+        if consolidations > 0:
+            self.parse_failure_rate = counters.get("memory.consolidation.parse_failures", 0) / consolidations
+
+    #######################
+    # Simulation
+    #######################
+
+    def _conversation_length(self, rng: np.random.Generator) -> int:
+        if len(self.conversation_lengths):
+            return int(rng.choice(self.conversation_lengths))
+        return int(rng.geometric(1 / DEFAULT_CONVERSATION_LENGTH))
+
+    def _simulate_schedule(self, rng: np.random.Generator) -> Dict[str, Any]:
+        """One replay of the pairing loop; returns call counts and the per-step pair counts"""
+        n = len(self.agent_names)
+        total_conversations = n * (n - 1) // 2
+        past = [set() for _ in range(n)]
+        partner = [-1] * n
+        remaining = [0] * n
+        completed = 0
+        calls = {t: 0 for t in CALL_TYPES}
+        pairs_per_step = []
+        steps = 0
+
+        for _ in range(self.max_time_steps):
+            if completed >= total_conversations:
+                break
+            steps += 1
+            idle = [i for i in range(n) if partner[i] < 0]
+            rng.shuffle(idle)
+            for position, a in enumerate(idle):
+                if partner[a] >= 0:
+                    continue
+                candidates = [b for b in idle[position + 1:] if partner[b] < 0 and b not in past[a]]
+                if candidates:
+                    b = candidates[int(rng.integers(len(candidates)))]
+                    partner[a], partner[b] = b, a
+                    remaining[a] = remaining[b] = max(1, self._conversation_length(rng))
+
+            active = [(a, partner[a]) for a in range(n) if a < partner[a]]
+            pairs_per_step.append(len(active))
+            for a, b in active:
+                exchanges = min(self.messages_per_time_step, remaining[a])
+                calls["dialogue"] += 2 * exchanges
+                remaining[a] -= exchanges
+                remaining[b] = remaining[a]
+                if remaining[a] == 0:
+                    past[a].add(b)
+                    past[b].add(a)
+                    partner[a] = partner[b] = -1
+                    completed += 1
+            # end_time_step consolidates every pair that exchanged messages this step;
+            # a structured call that fails to parse falls back to two parallel calls
+            if self.consolidation_mode == "parallel":
+                calls["long_term_memory"] += 2 * len(active)
+            else:
+                failures = int(rng.binomial(len(active), min(self.parse_failure_rate, 1.0))) if active else 0
+                calls["long_term_memory"] += len(active) + 2 * failures
+        calls["digest"] = int(rng.binomial(calls["dialogue"], min(self.digest_rate, 1.0))) if self.digest_rate else 0
+        return {"calls": calls, "pairs": sum(pairs_per_step), "steps": steps, "completed": completed}
+
+    def _sample_tokens(self, rng: np.random.Generator, call_type: str, n: int) -> tuple:
+        if n == 0:
+            return 0, 0
+        if call_type in self.prompt_tokens:
+            index = rng.integers(len(self.prompt_tokens[call_type]), size=n)
+            return int(self.prompt_tokens[call_type][index].sum()), int(self.completion_tokens[call_type][index].sum())
+        # No history: dialogue prompts are the rendered template; summaries are a fraction of it
+        base = self.static_prompt_tokens if call_type == "dialogue" else self.static_prompt_tokens / 4
+        return int(base * n), DEFAULT_COMPLETION_TOKENS[call_type] * n
+
+    def estimate(self, trials: int = 200, seed: Optional[int] = 0) -> Dict[str, Any]:
+        """Run the Monte Carlo trials and summarize them"""
+        rng = np.random.default_rng(seed)
+        columns = ["dialogue", "digest", "long_term_memory", "calls", "prompt_tokens", "completion_tokens",
+                   "total_tokens", "wall_minutes", "steps", "conversations"]
+        results = np.zeros((trials, len(columns)))
+
+        for trial in range(trials):
+            schedule = self._simulate_schedule(rng)
+            calls = schedule["calls"]
+            prompt_tokens = completion_tokens = 0
+            seconds = schedule["pairs"] * self.pair_delay
+            for call_type in CALL_TYPES:
+                prompt, completion = self._sample_tokens(rng, call_type, calls[call_type])
+                prompt_tokens += prompt
+                completion_tokens += completion
+                if calls[call_type]:
+                    mu, sigma = self.latency[call_type]
+                    seconds += rng.lognormal(mu, sigma, size=calls[call_type]).sum()
+            # Every dialogue call is followed by the throttle delay
+            seconds += calls["dialogue"] * self.throttle_delay
+            results[trial] = (
+                calls["dialogue"], calls["digest"], calls["long_term_memory"], sum(calls.values()),
+                prompt_tokens, completion_tokens, prompt_tokens + completion_tokens, seconds / 60,
+                schedule["steps"], schedule["completed"],
+            )
+
+        return {
+            "trials": trials,
+            "agents": len(self.agent_names),
+            "calibration_runs": self.runs_used,
+            "estimates": {
+                column: {
+                    "mean": float(results[:, i].mean()),
+                    "p5": float(np.percentile(results[:, i], 5)),
+                    "p50": float(np.percentile(results[:, i], 50)),
+                    "p95": float(np.percentile(results[:, i], 95)),
+                }
+                for i, column in enumerate(columns)
+            },
+        }
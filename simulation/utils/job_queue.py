@@ -0,0 +1,164 @@
+"""
+SQLite-backed job queue between the coordinator and conversation workers.
+
+The coordinator submits one job per pair-step and waits for the results;
+workers (worker.py) claim pending jobs one at a time inside an IMMEDIATE
+transaction, so two workers never get the same job. Workers heartbeat
+while they run a job, which extends its lease; a claimed job whose worker
+stopped heartbeating for a whole lease (a crashed or stuck worker) goes
+back to pending until it has used up `max_attempts`.
+
+Any process that can open the database file can take part: local worker
+processes, or workers on other machines when the file is on a shared
+filesystem with working file locks.
+"""
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    step INTEGER,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    claimed_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, seen REAL, jobs INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS control (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class JobQueue:
+    """Pending -> claimed -> done | failed; expired leases go back to pending"""
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    #######################
+    # Coordinator side
+    #######################
+
+    def submit(self, step: int, payload: Dict[str, Any], max_attempts: int = 3) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (step, payload, max_attempts) VALUES (?, ?, ?)",
+            (step, json.dumps(payload), max_attempts)
+        )
+        return cursor.lastrowid
+
+    def requeue_expired(self, lease_seconds: float) -> int:
+        """
+        Return jobs whose lease expired to pending, or fail them once out of
+        attempts. Jobs whose worker is still heartbeating are left alone.
+        """
+        cutoff = time.time() - lease_seconds
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "error = 'lease expired', worker = NULL WHERE status = 'claimed' AND claimed_at < ? "
+            "AND worker NOT IN (SELECT id FROM workers WHERE seen >= ?)",
+            (cutoff, cutoff)
+        )
+        return cursor.rowcount
+
+    def finished(self, job_ids: Iterable[int]) -> Dict[int, Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """(status, result, error) of every job in job_ids that is done or failed"""
+        job_ids = list(job_ids)
+        finished = {}
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, status, result, error FROM jobs WHERE id IN ({','.join('?' * len(chunk))}) "
+                "AND status IN ('done', 'failed')", chunk
+            )
+            for job_id, status, result, error in rows:
+                finished[job_id] = (status, json.loads(result) if result else None, error)
+        return finished
+
+    def wait(self, job_ids: Iterable[int], lease_seconds: float, poll_interval: float = 0.2,
+             on_idle=None) -> Dict[int, Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Block until every job is done or failed; `on_idle(seconds_waiting)` is called between polls"""
+        pending = set(job_ids)
+        finished = {}
+        started = time.time()
+        while pending:
+            self.requeue_expired(lease_seconds)
+            done = self.finished(pending)
+            finished.update(done)
+            pending -= done.keys()
+            if pending:
+                if on_idle:
+                    on_idle(time.time() - started)
+                time.sleep(poll_interval)
+        return finished
+
+    def active_workers(self, within_seconds: float = 30.0) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM workers WHERE seen >= ?", (time.time() - within_seconds,)).fetchone()[0]
+
+    def request_shutdown(self):
+        self.conn.execute("INSERT OR REPLACE INTO control (key, value) VALUES ('shutdown', '1')")
+
+    def clear_shutdown(self):
+        self.conn.execute("DELETE FROM control WHERE key = 'shutdown'")
+
+    #######################
+    # Worker side
+    #######################
+
+    def claim(self, worker: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Take the oldest pending job, or None if there is none"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute("SELECT id, payload FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker, time.time(), row[0])
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return (row[0], json.loads(row[1])) if row else None
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]):
+        """Store a result; the first result for a job wins, even one from a worker whose lease expired"""
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', worker = ?, result = ? WHERE id = ? AND status != 'done'",
+            (worker, json.dumps(result), job_id)
+        )
+        self.conn.execute("UPDATE workers SET jobs = jobs + 1 WHERE id = ?", (worker,))
+
+    def fail(self, job_id: int, error: str):
+        """Give the job back for another attempt, or fail it once out of attempts"""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "error = ?, worker = NULL WHERE id = ? AND status = 'claimed'",
+            (error, job_id)
+        )
+
+    def heartbeat(self, worker: str, job_id: Optional[int] = None):
+        """Mark the worker alive and, while it runs a job, extend that job's lease"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO workers (id, seen) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET seen = excluded.seen",
+            (worker, now)
+        )
+        if job_id is not None:
+            self.conn.execute("UPDATE jobs SET claimed_at = ? WHERE id = ? AND worker = ? AND status = 'claimed'",
+                              (now, job_id, worker))
+
+    def shutdown_requested(self) -> bool:
+        return self.conn.execute("SELECT value FROM control WHERE key = 'shutdown'").fetchone() is not None
+
+    def close(self):
+        self.conn.close()
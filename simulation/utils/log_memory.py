@@ -1,40 +1,21 @@
 import os
 import json
 import uuid
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.token_counter import TokenCounter
+from utils.model_router import router
 
-# Global token counter that can be set from outside
-global_token_counter = None
-
-def generate_conversation_id():
-    return uuid.uuid4().hex[:8]
-
-def digest_conversation(prev_digest, history):
-    model = ChatGoogleGenerativeAI(
-        model="gemma-3-27b-it",
-        google_api_key=os.getenv("GOOGLE_API_KEY"),
-        temperature=0.1,
-    )
-    prompt = PromptTemplate(
-        input_variables=["prev_digest", "history"],
-        template="""You are a helpful assistant.
+# Plain str.format template; avoids importing langchain's prompt machinery at startup
+DIGEST_PROMPT = """You are a helpful assistant.
         Here is the previous digest of the conversation: {prev_digest}
         Here is the history of the conversation: {history}
         Please digest the conversation and return a concise summary (less than 50 words).
         """
-    )
-    formatted_prompt = prompt.format(prev_digest=prev_digest, history=history)
-    response = model.invoke(formatted_prompt)
-    
-    # Track token usage if counter is available
-    if global_token_counter is not None:
-        global_token_counter.add_api_call(
-            prompt=formatted_prompt,
-            response=response.content if hasattr(response, 'content') else str(response)
-        )
-    
+
+def generate_conversation_id():
+    return uuid.uuid4().hex[:8]
+
+def digest_conversation(prev_digest, history, call_type="digest"):
+    formatted_prompt = DIGEST_PROMPT.format(prev_digest=prev_digest, history=history)
+    response = router.invoke(call_type, formatted_prompt)
     return response
 
 def log_conversation(exchange_id, exchange_content, out_path):
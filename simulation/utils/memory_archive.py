@@ -0,0 +1,105 @@
+"""Append-only compressed archive for short-term memory snapshots"""
+import os
+import json
+import gzip
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class MemoryArchive:
+    """
+    Stores archived short-term memories for one experiment in a single file.
+
+    Every snapshot is written as its own gzip member and appended to
+    `<name>.jsonl.gz`, so the file as a whole is still a valid gzip stream of
+    JSON lines (`zcat` works). A JSON-lines index next to it records the agent,
+    partner, byte offset and length of each member, which lets a lookup seek
+    straight to the snapshots it needs instead of decompressing everything.
+    """
+
+    def __init__(self, archive_dir: str, name: str = "short_term", compresslevel: int = 6):
+        self.archive_dir = archive_dir
+        self.data_path = os.path.join(archive_dir, f"{name}.jsonl.gz")
+        self.index_path = os.path.join(archive_dir, f"{name}.index.jsonl")
+        self.compresslevel = compresslevel
+
+        # agent -> index entries, and (agent, partner) -> index entries
+        self._by_agent: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_pair: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+        self._index_pos = 0
+
+        os.makedirs(archive_dir, exist_ok=True)
+        self._refresh_index()
+
+    def _add_to_index(self, entry: Dict[str, Any]):
+        """Register an index entry in the in-memory lookup tables"""
+        self._by_agent.setdefault(entry["agent"], []).append(entry)
+        self._by_pair.setdefault((entry["agent"], entry["partner"]), []).append(entry)
+
+    def _refresh_index(self):
+        """Pick up index entries appended since the last read (e.g. by another manager instance)"""
+        if not os.path.exists(self.index_path):
+            return
+        if os.path.getsize(self.index_path) == self._index_pos:
+            return
+        with open(self.index_path, "r") as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith("\n"):
+                    # Partially written line, pick it up on the next refresh
+                    break
+                self._add_to_index(json.loads(line))
+                self._index_pos += len(line.encode("utf-8"))
+
+    def append(self, agent_id: str, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress and append one snapshot, returning its index entry"""
+        archived_at = memory.get("archived_at") or datetime.now().isoformat()
+        partner = memory.get("current_conversation", {}).get("partner")
+        payload = json.dumps(memory, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+        frame = gzip.compress(payload, compresslevel=self.compresslevel)
+
+        with open(self.data_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(frame)
+
+        entry = {
+            "agent": agent_id,
+            "partner": partner,
+            "offset": offset,
+            "length": len(frame),
+            "archived_at": archived_at,
+        }
+        # Bring the index up to date first so our own line is not read back twice
+        self._refresh_index()
+        line = json.dumps(entry) + "\n"
+        with open(self.index_path, "a") as f:
+            f.write(line)
+        self._index_pos += len(line.encode("utf-8"))
+        self._add_to_index(entry)
+        return entry
+
+    def entries(self, agent_id: str, partner_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List index entries for an agent, optionally restricted to one partner"""
+        self._refresh_index()
+        if partner_id is None:
+            return list(self._by_agent.get(agent_id, []))
+        return list(self._by_pair.get((agent_id, partner_id), []))
+
+    def read(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Read back a single snapshot by its index entry"""
+        with open(self.data_path, "rb") as f:
+            f.seek(entry["offset"])
+            frame = f.read(entry["length"])
+        return json.loads(gzip.decompress(frame))
+
+    def load(self, agent_id: str, partner_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read all snapshots for an agent (and partner), oldest first"""
+        entries = self.entries(agent_id, partner_id)
+        if not entries:
+            return []
+        snapshots = []
+        with open(self.data_path, "rb") as f:
+            for entry in entries:
+                f.seek(entry["offset"])
+                snapshots.append(json.loads(gzip.decompress(f.read(entry["length"]))))
+        return snapshots
@@ -0,0 +1,220 @@
+"""Lightweight per-phase timers, counters and latency histograms"""
+import os
+import json
+import time
+import random
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+
+def _nearest_rank(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list, q in [0, 100]"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))]
+
+
+class Histogram:
+    """
+    Latency histogram with exact count/sum/min/max and a bounded reservoir
+    sample for percentiles, so memory stays flat however long the run is.
+    """
+
+    def __init__(self, reservoir_size: int = 4096, rng: Optional[random.Random] = None):
+        self.reservoir_size = reservoir_size
+        self.samples: List[float] = []
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._rng = rng or random.Random(0)
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample of everything observed
+            slot = self._rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.samples[slot] = value
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile over the reservoir, q in [0, 100]"""
+        return _nearest_rank(sorted(self.samples), q)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, total and p50/p95/p99 for reporting"""
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": _nearest_rank(ordered, 50),
+            "p95": _nearest_rank(ordered, 95),
+            "p99": _nearest_rank(ordered, 99),
+        }
+
+
+class _Timer:
+    """Context manager that records its elapsed time into a histogram"""
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """No-op stand-in used when metrics are disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Collects timings for the phases of a run. Phase names are dotted, e.g.
+    `llm.dialogue`, `llm.digest`, `llm.long_term_memory`, `sleep.backoff`,
+    `prompt.build`, `io.memory.read`, `io.bingo.write`, `env.pairing`.
+    """
+
+    def __init__(self, enabled: bool = True, reservoir_size: int = 4096):
+        self.enabled = enabled
+        self.reservoir_size = reservoir_size
+        self.prometheus_path: Optional[str] = None
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+        # Private RNG so reservoir sampling never perturbs the seeded pairing RNG
+        self._rng = random.Random(0)
+        # Conversations of a round record from several threads
+        self._lock = threading.Lock()
+
+    def configure(self, cfg, output_dir: str) -> "Metrics":
+        """Apply the `metrics` section of the Hydra config, if present"""
+        settings = cfg.get("metrics") if hasattr(cfg, "get") else None
+        if settings:
+            self.enabled = settings.get("enabled", self.enabled)
+            self.reservoir_size = settings.get("reservoir_size", self.reservoir_size)
+            if settings.get("prometheus", False):
+                self.prometheus_path = os.path.join(output_dir, "metrics.prom")
+        return self
+
+    def timer(self, name: str):
+        """Time a block: `with metrics.timer("llm.dialogue"): ...`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name: str, value: float):
+        """Record a value (seconds, for timers) in the named histogram"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.reservoir_size, self._rng)
+            histogram.observe(value)
+
+    def count(self, name: str, value: float = 1):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def sleep(self, seconds: float, name: str = "sleep.backoff"):
+        """time.sleep that is accounted for under the given phase"""
+        if seconds <= 0:
+            return
+        with self.timer(name):
+            time.sleep(seconds)
+
+    def get_percentile(self, name: str, q: float) -> Optional[float]:
+        """Percentile of a histogram, or None if nothing was recorded yet"""
+        histogram = self.histograms.get(name)
+        if histogram is None or histogram.count == 0:
+            return None
+        return histogram.percentile(q)
+
+    #######################
+    # Reporting
+    #######################
+
+    def report(self) -> Dict[str, Any]:
+        """Summary of all phases and counters"""
+        wall_time = time.perf_counter() - self.started_at
+        with self._lock:
+            phases = {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+            counters = dict(sorted(self.counters.items()))
+        for summary in phases.values():
+            summary["share_of_wall_time"] = summary["sum"] / wall_time if wall_time else 0.0
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "wall_time_seconds": wall_time,
+            "phases": phases,
+            "counters": counters,
+        }
+
+    def save_report(self, output_dir: str) -> str:
+        """Write the JSON report next to the token usage file"""
+        filename = f'metrics_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        filepath = os.path.join(output_dir, filename)
+        with open(filepath, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        self.write_prometheus()
+        return filepath
+
+    def write_prometheus(self):
+        """Rewrite the Prometheus text-format file, if enabled"""
+        if not self.enabled or not self.prometheus_path:
+            return
+        lines = [
+            "# HELP bingo_phase_seconds Time spent per simulation phase.",
+            "# TYPE bingo_phase_seconds summary",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'bingo_phase_seconds{{phase="{name}",quantile="{q}"}} {histogram.percentile(q * 100):.6f}')
+                lines.append(f'bingo_phase_seconds_sum{{phase="{name}"}} {histogram.sum:.6f}')
+                lines.append(f'bingo_phase_seconds_count{{phase="{name}"}} {histogram.count}')
+            lines.append("# HELP bingo_events_total Simulation event counters.")
+            lines.append("# TYPE bingo_events_total counter")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'bingo_events_total{{name="{name}"}} {value}')
+
+        # Write then rename so scrapers never see a half-written file
+        tmp_path = self.prometheus_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prometheus_path)
+
+
+# Shared metrics registry, configured from the Hydra config in main.py
+metrics = Metrics()
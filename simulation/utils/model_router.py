@@ -0,0 +1,316 @@
+"""Routes each LLM call type to its configured model"""
+import os
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional
+from utils.console import console
+from utils.metrics import metrics
+from utils.quota import quota
+from utils.token_counter import extract_usage
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """Load the project's .env once, on the first client creation rather than at import"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+
+            env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../.env'))
+            console.debug("Loading .env from: %s", env_path)
+            load_dotenv(env_path)
+            _env_loaded = True
+
+
+# Used for call types missing from the config
+DEFAULT_ROUTE = {
+    "model": "gemma-3-27b-it",
+    "temperature": 0.1,
+    "max_output_tokens": None,
+    "max_concurrency": 4,
+    "timeout": None,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _call_executor() -> ThreadPoolExecutor:
+    """Threads that run calls with a deadline or a hedge; abandoned calls finish in the background"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+    return _executor
+
+
+class AbandonedCall(Exception):
+    """The caller gave up on this attempt before it was sent"""
+
+
+class _Attempt:
+    """One submitted request; the caller can abandon it while it waits for a slot or quota"""
+
+    def __init__(self):
+        self.admitted = threading.Event()  # Set when the request is sent, or when the attempt ends without one
+        self.started: Optional[float] = None
+        self.abandoned = False
+
+
+class HedgePolicy:
+    """
+    Decides when a slow call gets a duplicate and caps the duplicate spend.
+    A call is hedged once it has been running longer than the observed
+    percentile (p95 by default) of its call type's `llm.<type>` latency.
+    """
+
+    def __init__(self, enabled: bool = False, percentile: float = 95, min_samples: int = 20,
+                 max_duplicate_ratio: float = 0.05, max_duplicate_tokens: Optional[int] = None):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_duplicate_ratio = max_duplicate_ratio
+        self.max_duplicate_tokens = max_duplicate_tokens
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.abandoned_calls = 0
+        self.duplicate_tokens = 0
+        self._lock = threading.Lock()
+
+    def configure(self, settings) -> "HedgePolicy":
+        for key in ("enabled", "percentile", "min_samples", "max_duplicate_ratio", "max_duplicate_tokens"):
+            if key in settings:
+                setattr(self, key, settings[key])
+        return self
+
+    def delay(self, call_type: str) -> Optional[float]:
+        """Seconds after which a call of this type is hedged, or None while there is too little history"""
+        if not self.enabled:
+            return None
+        histogram = metrics.histograms.get(f"llm.{call_type}")
+        if histogram is None or histogram.count < self.min_samples:
+            return None
+        return histogram.percentile(self.percentile)
+
+    def record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def record_win(self):
+        """The duplicate answered first"""
+        with self._lock:
+            self.hedge_wins += 1
+        metrics.count("llm.hedge_wins")
+
+    def allow(self) -> bool:
+        """Take a hedge from the budget if the duplicate caps allow it"""
+        with self._lock:
+            if self.hedges + 1 > self.max_duplicate_ratio * self.calls:
+                return False
+            if self.max_duplicate_tokens is not None and self.duplicate_tokens >= self.max_duplicate_tokens:
+                return False
+            self.hedges += 1
+            return True
+
+    def record_duplicate(self, future):
+        """Count the tokens of the call that lost the race, once it finishes"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        usage = extract_usage(future.result())
+        if usage:
+            with self._lock:
+                self.duplicate_tokens += sum(usage)
+            metrics.count("llm.hedge.duplicate_tokens", sum(usage))
+
+    def record_abandoned(self, future):
+        """A call that outlived its deadline still answered; its tokens are duplicate spend"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self.abandoned_calls += 1
+        metrics.count("llm.abandoned_calls")
+        self.record_duplicate(future)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "abandoned_calls": self.abandoned_calls,
+            "duplicate_tokens": self.duplicate_tokens,
+        }
+
+
+# Shared hedging policy, configured with the router
+hedging = HedgePolicy()
+
+
+class ModelRoute:
+    """One entry of the routing table: a model, its sampling settings and a concurrency limit"""
+
+    def __init__(self, call_type: str, model: str, temperature: float = 0.1,
+                 max_output_tokens: Optional[int] = None, max_concurrency: int = 4,
+                 timeout: Optional[float] = None):
+        self.call_type = call_type
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def client(self):
+        """The chat model for this route, shared by every caller"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    load_env()
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+
+                    kwargs = {}
+                    if self.max_output_tokens:
+                        kwargs["max_output_tokens"] = self.max_output_tokens
+                    self._client = ChatGoogleGenerativeAI(
+                        model=self.model,
+                        google_api_key=os.getenv("GOOGLE_API_KEY"),
+                        temperature=self.temperature,
+                        **kwargs
+                    )
+        return self._client
+
+    def invoke(self, prompt):
+        """
+        Invoke the model with this route's deadline and the hedging policy.
+        The deadline and the hedge delay count from when the request is sent,
+        not from when it was queued for a slot or for quota. Raises
+        TimeoutError if no attempt has answered within `timeout` seconds.
+        """
+        hedging.record_call()
+        hedge_after = hedging.delay(self.call_type)
+        if not self.timeout and hedge_after is None:
+            return self._invoke_once(prompt)
+
+        pool = _call_executor()
+        attempts = [_Attempt()]
+        futures = [pool.submit(self._invoke_once, prompt, attempts[0])]
+        attempts[0].admitted.wait()
+        started = attempts[0].started or time.monotonic()
+        deadline = started + self.timeout if self.timeout else None
+        if hedge_after is not None and (deadline is None or started + hedge_after < deadline):
+            done, _ = wait(futures, timeout=max(0.0, started + hedge_after - time.monotonic()))
+            if not done and hedging.allow():
+                metrics.count("llm.hedges")
+                attempts.append(_Attempt())
+                futures.append(pool.submit(self._invoke_once, prompt, attempts[1]))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        hedging.record_win()
+                    for other, attempt in zip(futures, attempts):
+                        if other is not future:
+                            attempt.abandoned = True
+                            other.add_done_callback(hedging.record_duplicate)
+                    return future.result()
+                error = future.exception()
+        if pending:
+            # Attempts still queued are never sent; those in flight are counted if they answer
+            for future, attempt in zip(futures, attempts):
+                if future in pending:
+                    attempt.abandoned = True
+                    future.add_done_callback(hedging.record_abandoned)
+            metrics.count("llm.timeouts")
+            raise TimeoutError(f"{self.call_type} call to {self.model} exceeded {self.timeout}s")
+        raise error
+
+    def _invoke_once(self, prompt, attempt: Optional[_Attempt] = None):
+        """
+        One request, waiting for a free slot if the route is at its concurrency
+        limit and for the host-wide quota coordinator to grant a request. An
+        attempt abandoned while it waits raises AbandonedCall without sending.
+        """
+        try:
+            with self._slots:
+                if attempt is not None and attempt.abandoned:
+                    raise AbandonedCall(self.call_type)
+                quota.acquire()
+                if attempt is not None:
+                    if attempt.abandoned:
+                        raise AbandonedCall(self.call_type)
+                    attempt.started = time.monotonic()
+                    attempt.admitted.set()
+                try:
+                    message = self.client().invoke(prompt)
+                except Exception as e:
+                    if "429" in str(e) or "quota" in str(e).lower():
+                        quota.report_rate_limited()
+                    raise
+                usage = extract_usage(message)
+                if usage:
+                    quota.record_usage(sum(usage))
+                return message
+        finally:
+            if attempt is not None:
+                attempt.admitted.set()
+
+
+class ModelRouter:
+    """
+    Maps call types (dialogue, digest, long_term_memory) to ModelRoutes.
+    The table comes from `agent.agent.models` in the Hydra config.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.routes: Dict[str, ModelRoute] = {}
+        self.load_routes(routes or {})
+
+    def load_routes(self, routes: Dict[str, Dict[str, Any]]):
+        """Replace the routing table"""
+        self.routes = {}
+        for call_type, settings in routes.items():
+            merged = {**DEFAULT_ROUTE, **dict(settings)}
+            self.routes[call_type] = ModelRoute(call_type, **merged)
+
+    def configure(self, cfg) -> "ModelRouter":
+        """Load the routing table and hedging policy from the Hydra config, if present"""
+        routes = cfg.agent.agent.get("models") if "agent" in cfg else None
+        if routes:
+            self.load_routes(routes)
+        hedge_settings = cfg.agent.agent.get("hedging") if "agent" in cfg else None
+        if hedge_settings:
+            hedging.configure(hedge_settings)
+        return self
+
+    def route(self, call_type: str) -> ModelRoute:
+        """Route for a call type, falling back to the default model"""
+        route = self.routes.get(call_type)
+        if route is None:
+            route = self.routes[call_type] = ModelRoute(call_type, **DEFAULT_ROUTE)
+        return route
+
+    def invoke(self, call_type: str, prompt):
+        """Invoke the model routed for this call type"""
+        return self.route(call_type).invoke(prompt)
+
+
+# Shared router, configured from the Hydra config in main.py
+router = ModelRouter()
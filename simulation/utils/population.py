@@ -0,0 +1,289 @@
+"""
+Synthetic personas and bingo boards for scale tests.
+
+Writes N personas (<out>/agents_personas/<name>.txt) and boards
+(<out>/bingo_boards/input/<name>.json) in the same formats as the shipped
+ones, plus ground_truth.json recording which agents can fill which square.
+
+Every agent holds a few traits (a language, a hometown, a field, a hobby...)
+that its persona states in plain words. Each board square is a clue about
+one trait. A share of the squares (--match-rate) ask about traits that some
+other agent holds; the rest ask about traits nobody holds, so the best
+possible fill rate is known in advance. The trait catalogue size
+(--catalogue) sets how many agents share each trait. Output depends only on
+the arguments, so a seed always gives the same population.
+
+Generate from the simulation directory, then point a run at it:
+    python -m utils.population --agents 100000 --out synthetic --seed 0 [--bundle]
+    python main.py paths.agents_dir=synthetic/agents_personas paths.bingo_board_dir=synthetic/bingo_boards/input
+
+Score a run's fills against the ground truth:
+    python -m utils.population --score outputs/<experiment>/bingo_fills.jsonl --out synthetic
+"""
+import os
+import json
+import random
+import argparse
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.bingo_manager import grid_shape
+from utils.bundle import compile_bundle
+
+GROUND_TRUTH = "ground_truth.json"
+
+FIRST_NAMES = (
+    "Ava Ben Chloe Dev Elena Farid Grace Hiro Isla Jonas Kemi Liam Maya Noor Omar Priya Quinn Rosa Sami Tara "
+    "Uma Victor Wen Ximena Yusuf Zoe Amir Bea Caleb Dana Emil Fatima Gus Hana Ivan Jada Kai Lena Mateo Nia"
+).split()
+LAST_NAMES = (
+    "Abe Bauer Costa Diaz Eze Fischer Garcia Haddad Ito Jensen Kim Lopez Moreau Nakamura Okafor Patel Quist "
+    "Rossi Silva Tanaka Ueda Varga Wong Xu Yilmaz Zhang"
+).split()
+
+# Trait kinds: (clue on a board, sentence in a persona, persona section, values)
+PLACES = ("Lisbon", "Nairobi", "Osaka", "Montreal", "Tucson", "Kraków", "Chennai", "Valparaíso", "Reykjavík",
+          "Fresno", "Manila", "Ghent", "Accra", "Boise", "Hanoi", "Tbilisi", "Cusco", "Adelaide", "Bergen", "Oaxaca")
+TRAIT_KINDS = [
+    ("Find someone who grew up in {0}", "{name} grew up in {0} and still calls it home.", "demographics", PLACES),
+    ("Find someone who speaks {0}", "{name} speaks {0} with family and friends.", "demographics",
+     ("Portuguese", "Tagalog", "Swahili", "Korean", "Polish", "Farsi", "Gujarati", "Icelandic", "Yoruba", "Dutch",
+      "Vietnamese", "Georgian", "Quechua", "Hebrew", "Finnish", "Amharic")),
+    ("Find someone who works in {0}", "{name} works in {0} and enjoys talking shop.", "professional",
+     ("biotech", "renewable energy", "public policy", "video game design", "supply chain logistics", "journalism",
+      "urban planning", "venture capital", "cybersecurity", "museum curation", "agritech", "space systems")),
+    ("Find someone who is researching {0}", "Lately {name} has been researching {0}.", "professional",
+     ("protein folding", "coral reef recovery", "language models", "battery chemistry", "medieval manuscripts",
+      "sleep science", "housing markets", "quantum sensors", "soil microbiomes", "wildfire modeling")),
+    ("Find someone who plays the {0}", "{name} plays the {0} most evenings.", "hobbies",
+     ("cello", "banjo", "tabla", "trombone", "harp", "accordion", "ukulele", "oboe", "marimba", "bagpipes")),
+    ("Find someone who has gone {0} in {1}", "{name} once went {0} in {1} and loves telling the story.", "hobbies",
+     (("surfing", "hiking", "kayaking", "rock climbing", "skiing", "scuba diving", "birdwatching", "cycling"), PLACES)),
+    ("Find someone who collects {0}", "{name} collects {0} and has a favorite piece.", "hobbies",
+     ("vintage maps", "vinyl records", "fountain pens", "film cameras", "mechanical keyboards", "botanical prints",
+      "enamel pins", "antique clocks")),
+    ("Find someone who is looking for advice on {0}", "{name} is looking for advice on {0}.", "goals",
+     ("starting a PhD program", "switching careers into data science", "raising seed funding", "public speaking",
+      "managing a remote team", "publishing a first paper", "negotiating a salary", "finding a mentor")),
+]
+SUPPORT_KINDS = [
+    ("Share a tip about {0}", "{name} has good tips about {0}.", "goals",
+     ("time management", "grant writing", "job interviews", "learning a language", "work-life balance",
+      "networking", "note taking", "running a meetup")),
+]
+
+FILLER = {
+    "backstory": ["{name} came to the reunion to reconnect with old classmates and meet new people.",
+                  "{name} took a winding path after graduation and enjoys swapping stories about it.",
+                  "Friends describe {name} as curious, dependable and quick to laugh."],
+    "demographics": ["{name} values community and tries to stay involved in local projects."],
+    "professional": ["{name} likes problems that mix technical depth with people skills."],
+    "hobbies": ["On weekends {name} tries to get outside and away from screens."],
+    "communication": ["{name} is a good listener who asks follow-up questions.",
+                      "{name} is direct but friendly, and comfortable with small talk.",
+                      "{name} tends to tell stories and enjoys a bit of banter."],
+    "goals": ["{name} hopes to leave the event with a few new contacts worth following up with."],
+}
+SECTIONS = [
+    ("backstory", "Name & Backstory"),
+    ("demographics", "Demographics & Cultural Background"),
+    ("professional", "Professional Background & Interests"),
+    ("hobbies", "Hobbies, Passions & Quirks"),
+    ("communication", "Communication Style"),
+    ("goals", "Event Goals & Bingo Board Insights"),
+]
+
+
+def trait_catalogue() -> List[Dict[str, Any]]:
+    """Every trait: id, clue text, persona sentence template, section and square type"""
+    catalogue = []
+    for kinds, visual_type in ((TRAIT_KINDS, "meet"), (SUPPORT_KINDS, "support")):
+        for clue, sentence, section, values in kinds:
+            combinations = product(*values) if isinstance(values[0], tuple) else ((value,) for value in values)
+            for combination in combinations:
+                catalogue.append({
+                    "id": len(catalogue),
+                    "clue": clue.format(*combination),
+                    "sentence": sentence.format(*combination, name="{name}"),
+                    "section": section,
+                    "visualType": visual_type,
+                })
+    return catalogue
+
+
+def agent_names(count: int, rng: random.Random) -> List[str]:
+    """Unique file-safe names, e.g. MayaK00042"""
+    width = len(str(count - 1))
+    return [f"{rng.choice(FIRST_NAMES)}{rng.choice(LAST_NAMES)[0]}{i:0{width}d}" for i in range(count)]
+
+
+def render_persona(name: str, traits: List[Dict[str, Any]], wanted: List[str], rng: random.Random) -> str:
+    sentences = {key: [rng.choice(lines).format(name=name)] for key, lines in FILLER.items()}
+    for trait in traits:
+        sentences[trait["section"]].append(trait["sentence"].format(name=name))
+    sentences["goals"].append(f"On the bingo board, {name} is most curious about: " + "; ".join(wanted) + ".")
+    body = "\n\n".join(f"### {title}\n" + " ".join(sentences[key]) for key, title in SECTIONS)
+    return f"---\n\n{body}\n\n---\n"
+
+
+def render_board(traits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"squares": [
+        {"visualType": trait["visualType"], "text": trait["clue"], "filled": False, "matched_with": "", "response_snippet": ""}
+        for trait in traits
+    ]}
+
+
+def generate_population(out_dir: str, agents: int, seed: int = 0, traits_per_agent: int = 4, squares: int = 12,
+                        support_squares: int = 2, match_rate: float = 0.75,
+                        catalogue_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Write personas, boards and ground_truth.json under out_dir; returns the ground-truth summary.
+
+    catalogue_size caps how many distinct traits agents hold (fewer traits, more
+    agents per trait). Traits left out of it are the pool for unfillable squares.
+    """
+    rng = random.Random(seed)
+    catalogue = trait_catalogue()
+    meet = [trait for trait in catalogue if trait["visualType"] == "meet"]
+    support = [trait for trait in catalogue if trait["visualType"] == "support"]
+    rng.shuffle(meet)
+    rng.shuffle(support)
+    # Keep a quarter of each kind for squares nobody can fill
+    held_meet = meet[:min(catalogue_size or len(meet), len(meet) * 3 // 4)]
+    held_support = support[:max(1, len(support) * 3 // 4)]
+    unheld_meet, unheld_support = meet[len(held_meet):], support[len(held_support):]
+    if squares - support_squares > len(held_meet) or traits_per_agent > len(held_meet):
+        raise ValueError(f"Catalogue of {len(held_meet)} held traits is too small for {squares} squares "
+                         f"and {traits_per_agent} traits per agent")
+    grid_shape(squares)  # Boards must lay out in at least 2x2
+
+    names = agent_names(agents, rng)
+    held: Dict[str, List[Dict[str, Any]]] = {}
+    holders: Dict[int, List[str]] = {}
+    for name in names:
+        traits = rng.sample(held_meet, traits_per_agent) + [rng.choice(held_support)]
+        held[name] = traits
+        for trait in traits:
+            holders.setdefault(trait["id"], []).append(name)
+    held_meet = [trait for trait in held_meet if trait["id"] in holders]
+    held_support = [trait for trait in held_support if trait["id"] in holders]
+
+    agents_dir = os.path.join(out_dir, "agents_personas")
+    boards_dir = os.path.join(out_dir, "bingo_boards", "input")
+    os.makedirs(agents_dir, exist_ok=True)
+    os.makedirs(boards_dir, exist_ok=True)
+
+    boards: Dict[str, List[int]] = {}
+    fillable = 0
+    other_holders = 0
+    for name in names:
+        board: List[Dict[str, Any]] = []
+        used = {trait["id"] for trait in held[name]}
+        own = set(used)
+        for index in range(squares):
+            is_support = index >= squares - support_squares
+            pool = held_support if is_support else held_meet
+            if rng.random() >= match_rate:
+                pool = (unheld_support if is_support else unheld_meet) or pool
+            trait = rng.choice(pool)
+            # Never a clue the owner fills themselves or a repeated clue, unless the pool runs out
+            for _ in range(8):
+                if trait["id"] not in used:
+                    break
+                trait = rng.choice(pool)
+            used.add(trait["id"])
+            board.append(trait)
+            others = len(holders.get(trait["id"], ())) - (trait["id"] in own)
+            fillable += others > 0
+            other_holders += others
+        rng.shuffle(board)
+        boards[name] = [trait["id"] for trait in board]
+        wanted = [trait["clue"].split("Find someone who ")[-1] for trait in board[:3]]
+
+        with open(os.path.join(agents_dir, f"{name}.txt"), "w") as f:
+            f.write(render_persona(name, held[name], wanted, rng))
+        with open(os.path.join(boards_dir, f"{name}.json"), "w") as f:
+            json.dump(render_board(board), f, indent=2)
+
+    summary = {
+        "agents": agents,
+        "seed": seed,
+        "squares": agents * squares,
+        "fillable_squares": fillable,
+        "fillable_share": fillable / (agents * squares) if agents else 0.0,
+        # Chance that a random other agent can fill a random square
+        "pair_fill_probability": other_holders / (agents * squares * max(agents - 1, 1)) if agents else 0.0,
+        "held_traits": len(holders),
+    }
+    by_id = {trait["id"]: trait for trait in catalogue}
+    ground_truth = {
+        "summary": summary,
+        "traits": {trait_id: {"clue": by_id[trait_id]["clue"], "holders": holders.get(trait_id, [])}
+                   for trait_id in sorted({trait_id for ids in boards.values() for trait_id in ids})},
+        "boards": boards,
+    }
+    with open(os.path.join(out_dir, GROUND_TRUTH), "w") as f:
+        json.dump(ground_truth, f, separators=(",", ":"))
+    return summary
+
+
+def score_fills(ground_truth_path: str, fill_log_path: str) -> Dict[str, Any]:
+    """Share of a run's fills (bingo_fills.jsonl) whose partner really holds the square's trait"""
+    with open(ground_truth_path, "r") as f:
+        ground_truth = json.load(f)
+    holders = {trait_id: set(trait["holders"]) for trait_id, trait in ground_truth["traits"].items()}
+    correct = total = 0
+    wrong: List[Tuple[str, int, str]] = []
+    with open(fill_log_path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            board = ground_truth["boards"].get(record["agent"])
+            if board is None or record["square"] >= len(board):
+                continue
+            total += 1
+            if record["partner"] in holders[str(board[record["square"]])]:
+                correct += 1
+            else:
+                wrong.append((record["agent"], record["square"], record["partner"]))
+    return {"fills": total, "correct": correct, "precision": correct / total if total else 0.0,
+            "fillable_squares": ground_truth["summary"]["fillable_squares"], "wrong": wrong}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic personas and bingo boards with known matches")
+    parser.add_argument("--agents", type=int, default=1000, help="Number of agents")
+    parser.add_argument("--out", default="synthetic", help="Output directory (also where --score looks for the ground truth)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--traits-per-agent", type=int, default=4, help="Meet traits each persona states")
+    parser.add_argument("--squares", type=int, default=12, help="Squares per board")
+    parser.add_argument("--support-squares", type=int, default=2, help="'Share a tip' squares per board")
+    parser.add_argument("--match-rate", type=float, default=0.75, help="Share of squares some other agent can fill")
+    parser.add_argument("--catalogue", type=int, help="Distinct meet traits in use; fewer means more agents per trait")
+    parser.add_argument("--bundle", action="store_true", help="Also compile <out>/population.bundle")
+    parser.add_argument("--score", metavar="FILL_LOG", help="Score a run's bingo_fills.jsonl instead of generating")
+    args = parser.parse_args(argv)
+
+    if args.score:
+        score = score_fills(os.path.join(args.out, GROUND_TRUTH), args.score)
+        print(f"{score['correct']}/{score['fills']} fills correct (precision {score['precision']:.1%}); "
+              f"{score['fillable_squares']:,} squares were fillable")
+        for agent, square, partner in score["wrong"][:10]:
+            print(f"  wrong: {agent} square {square} filled by {partner}")
+        return
+
+    summary = generate_population(args.out, args.agents, args.seed, args.traits_per_agent, args.squares,
+                                  args.support_squares, args.match_rate, args.catalogue)
+    print(f"Wrote {summary['agents']:,} personas and boards to {args.out}")
+    print(f"Fillable squares: {summary['fillable_squares']:,} of {summary['squares']:,} ({summary['fillable_share']:.1%}); "
+          f"pair fill probability {summary['pair_fill_probability']:.4f}; {summary['held_traits']} traits held")
+    if args.bundle:
+        out_path = os.path.join(args.out, "population.bundle")
+        count = compile_bundle(os.path.join(args.out, "agents_personas"),
+                               os.path.join(args.out, "bingo_boards", "input"), out_path)
+        print(f"Compiled {count} agents into {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Built-in CPU (cProfile) and memory (tracemalloc) profiling of a run.
+
+With `profile=cpu|memory|both`, every time step gets its own profile
+segment (step 0 is setup: loading agents, boards and the environment). Each
+segment is written to <experiment>/profile/ as step_NNNN.prof (open with
+pstats or snakeviz) and/or step_NNNN.snapshot (tracemalloc.Snapshot.load),
+and summarised in profile_steps.jsonl. At the end of the run profile.txt
+lists the top functions, CPU time by category (JSON, file I/O, OmegaConf,
+regex, sleeps, waiting on threads, model client) and memory by component (MemoryManager,
+BingoManager, TokenCounter, conversation logs...).
+
+cProfile only sees the main thread; time spent waiting on model calls made
+from worker threads shows up where the main thread waits. When profiling is
+off, step() is a single attribute check.
+"""
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+SIM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["cpu", "memory", "both"]
+
+# Allocation owner: the most recent frame of the traceback inside one of these files
+COMPONENTS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("MemoryManager", ("core/memory_manager.py", "core/memory_consolidator.py", "utils/memory_archive.py")),
+    ("BingoManager", ("core/bingo_manager.py", "utils/bundle.py")),
+    ("TokenCounter", ("utils/token_counter.py",)),
+    ("conversation logs", ("utils/log_memory.py",)),
+    ("ConversationManager", ("core/conversation_manager.py", "utils/context_assembler.py", "core/director.py")),
+    ("AgentManager", ("core/agent_manager.py", "utils/agent_base.py")),
+    ("environment", ("environments/",)),
+    ("metrics", ("utils/metrics.py", "utils/console.py")),
+]
+
+# CPU category of a function, from its pstats key (file, line, name); first match wins
+CATEGORIES: List[Tuple[str, Any]] = [
+    ("sleep", lambda file, name: "time.sleep" in name),
+    ("waiting on threads", lambda file, name: "_thread.lock" in name or "/concurrent/futures/" in file
+     or file.endswith("/threading.py")),
+    ("json", lambda file, name: "/json/" in file or "_json" in name),
+    ("regex", lambda file, name: "/re/" in file or file.endswith(("/re.py", "sre_compile.py", "sre_parse.py"))
+     or "re.Pattern" in name or "_sre" in name),
+    ("omegaconf", lambda file, name: "/omegaconf/" in file),
+    ("file I/O", lambda file, name: "io.open" in name or "_io." in name or "posix." in name),
+    ("model client", lambda file, name: any(part in file for part in ("/langchain", "/google/", "/httpx/", "/grpc/"))),
+    ("simulation", lambda file, name: file.startswith(SIM_DIR)),
+]
+
+
+def _component(traceback: tracemalloc.Traceback) -> str:
+    for frame in reversed(traceback):
+        filename = frame.filename.replace(os.sep, "/")
+        if not filename.startswith(SIM_DIR.replace(os.sep, "/")):
+            continue
+        for component, suffixes in COMPONENTS:
+            if any(suffix in filename for suffix in suffixes):
+                return component
+    return "other"
+
+
+def _category(key: Tuple[str, int, str]) -> str:
+    file, _, name = key
+    for category, matches in CATEGORIES:
+        if matches(file, name):
+            return category
+    return "other"
+
+
+class Profiler:
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self.cpu = False
+        self.memory = False
+        self.top_n = 25
+        self.frames = 10
+        self.output_dir: Optional[str] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._step = 0
+        self._step_started = 0.0
+        self._cpu_files: List[str] = []
+        self._components_peak: Dict[str, int] = {}
+
+    def configure(self, cfg, output_dir: str) -> "Profiler":
+        """Read `profile` (and the `profiling` section) and start profiling if it is on"""
+        mode = cfg.get("profile")
+        if mode in (None, False, "off", "none"):
+            return self
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}. Available modes: {['off'] + MODES}")
+        settings = cfg.get("profiling") or {}
+        self.mode = mode
+        self.cpu = mode in ("cpu", "both")
+        self.memory = mode in ("memory", "both")
+        self.top_n = settings.get("top_n", self.top_n)
+        self.frames = settings.get("traceback_frames", self.frames)
+        self.output_dir = os.path.join(output_dir, "profile")
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._begin_segment()
+        return self
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def _begin_segment(self):
+        self._step_started = time.perf_counter()
+        if self.memory:
+            tracemalloc.reset_peak()
+        if self.cpu:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _end_segment(self, label: str) -> Dict[str, Any]:
+        """Stop the current segment, write its files and return its summary line"""
+        record: Dict[str, Any] = {"step": label, "seconds": time.perf_counter() - self._step_started}
+        if self._profile is not None:
+            self._profile.disable()
+        # Snapshot before building any report, so the profiler's own objects are not counted
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = self._snapshot()
+            snapshot.dump(os.path.join(self.output_dir, f"{label}.snapshot"))
+            components = self._components(snapshot)
+            for component, size in components.items():
+                self._components_peak[component] = max(self._components_peak.get(component, 0), size)
+            record.update({"memory_current_bytes": current, "memory_peak_bytes": peak, "memory_by_component": components})
+        if self._profile is not None:
+            path = os.path.join(self.output_dir, f"{label}.prof")
+            self._profile.dump_stats(path)
+            self._cpu_files.append(path)
+            stats = pstats.Stats(self._profile)
+            record["cpu_seconds"] = stats.total_tt
+            record["cpu_by_category"] = self._categories(stats)
+            self._profile = None
+        with open(os.path.join(self.output_dir, "profile_steps.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
+        return record
+
+    def step(self, step: int):
+        """Close the segment of the step that just finished and open the next one"""
+        if self.mode is None:
+            return
+        self._end_segment(f"step_{self._step:04d}")
+        self._step = step
+        self._begin_segment()
+
+    #######################
+    # Reporting
+    #######################
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+
+    @staticmethod
+    def _categories(stats: pstats.Stats) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for key, (_, _, tottime, _, _) in stats.stats.items():
+            category = _category(key)
+            totals[category] = totals.get(category, 0.0) + tottime
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    @staticmethod
+    def _components(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for statistic in snapshot.statistics("traceback"):
+            component = _component(statistic.traceback)
+            totals[component] = totals.get(component, 0) + statistic.size
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def stop(self) -> Optional[str]:
+        """Close the last segment and write profile.txt; returns its path"""
+        if self.mode is None:
+            return None
+        self._end_segment(f"step_{self._step:04d}")
+        memory_lines: List[str] = []
+        if self.memory:
+            snapshot = self._snapshot()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            components = self._components(snapshot)
+            memory_lines.extend([f"=== Memory by component ({current / 1e6:.1f} MB traced at end) ===",
+                                 f"{'component':24}{'at end':>13}{'step max':>13}"])
+            for component in sorted(set(components) | set(self._components_peak),
+                                    key=lambda name: -self._components_peak.get(name, 0)):
+                memory_lines.append(f"{component:24}{components.get(component, 0) / 1e6:>10.2f} MB"
+                                    f"{self._components_peak.get(component, 0) / 1e6:>10.2f} MB")
+            memory_lines.extend(["", f"=== Top {self.top_n} allocation sites at end ==="])
+            memory_lines.extend(str(statistic) for statistic in snapshot.statistics("lineno")[:self.top_n])
+
+        lines = [f"Profile mode: {self.mode}"]
+        if self.cpu and self._cpu_files:
+            stats = pstats.Stats(*self._cpu_files)
+            stats.dump_stats(os.path.join(self.output_dir, "run.prof"))
+            lines.extend(["", f"=== CPU by category ({stats.total_tt:.2f}s profiled) ==="])
+            for category, seconds in self._categories(stats).items():
+                lines.append(f"{category:24}{seconds:>10.3f}s{seconds / stats.total_tt if stats.total_tt else 0:>8.1%}")
+            for sort_key in ("cumulative", "tottime"):
+                buffer = io.StringIO()
+                pstats.Stats(*self._cpu_files, stream=buffer).sort_stats(sort_key).print_stats(self.top_n)
+                lines.extend(["", f"=== Top {self.top_n} functions by {sort_key} time ===", buffer.getvalue().strip()])
+        if memory_lines:
+            lines.extend([""] + memory_lines)
+        path = os.path.join(self.output_dir, "profile.txt")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        self.mode = None
+        return path
+
+
+# Shared profiler, configured from the Hydra config in main.py
+profiler = Profiler()
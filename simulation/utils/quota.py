@@ -0,0 +1,229 @@
+"""
+Host-wide API quota coordinator.
+
+Every process that shares an API key draws from one token bucket kept in a
+small JSON state file guarded by an exclusive file lock (fcntl.flock). The
+bucket refills at `requests_per_minute`; an optional `tokens_per_minute`
+budget is debited with the usage each call actually reported.
+
+Fair share: when several processes are waiting, the next request goes to
+the one with the fewest recent grants (a decayed count), so one busy run
+cannot starve the others. A 429 anywhere pauses every process once, for a
+shared cool-down, instead of each one tripping the limit and backing off
+in lockstep.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from utils.metrics import metrics
+
+# Waiting entries not refreshed for this long belong to dead processes
+STALE_SECONDS = 30.0
+# Half-life of the per-process grant score used for fair share
+SHARE_HALF_LIFE = 60.0
+# Shared statistics restart after the bucket has been idle this long
+IDLE_RESET_SECONDS = 600.0
+
+
+class QuotaCoordinator:
+    """Cross-process token bucket; disabled (a no-op) until configured"""
+
+    def __init__(self, state_path: Optional[str] = None, requests_per_minute: float = 30,
+                 burst: int = 5, tokens_per_minute: Optional[int] = None, cooldown: float = 10.0):
+        self.enabled = state_path is not None
+        self.state_path = state_path
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.tokens_per_minute = tokens_per_minute
+        self.cooldown = cooldown
+        self.client_id = str(os.getpid())
+        self._lock = threading.Lock()
+        self._waiters = 0
+        # Local counters for this process
+        self.granted = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    def configure(self, cfg, orig_cwd: str = "") -> "QuotaCoordinator":
+        """Apply the `quota` section of the Hydra config, if present"""
+        settings = cfg.get("quota") if hasattr(cfg, "get") else None
+        if not settings or not settings.get("enabled", False):
+            self.enabled = False
+            return self
+        self.state_path = os.path.join(orig_cwd, settings.get("state_file", "outputs/.quota/google_api.json"))
+        self.requests_per_minute = settings.get("requests_per_minute", self.requests_per_minute)
+        self.burst = settings.get("burst", self.burst)
+        self.tokens_per_minute = settings.get("tokens_per_minute", self.tokens_per_minute)
+        self.cooldown = settings.get("cooldown", self.cooldown)
+        self.enabled = True
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        return self
+
+    #######################
+    # Shared state
+    #######################
+
+    @contextmanager
+    def _locked_state(self):
+        """Read-modify-write the state file under an exclusive lock"""
+        import fcntl
+
+        with self._lock, open(self.state_path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw.strip() else {}
+                self._refill(state, time.time())
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict[str, Any], now: float):
+        if "updated" not in state or now - state["updated"] > IDLE_RESET_SECONDS:
+            state.update({
+                "started": now, "updated": now, "requests": float(self.burst),
+                "tokens": float(self.tokens_per_minute or 0), "blocked_until": 0.0,
+                "clients": {}, "waiting": {}, "granted": 0, "rate_limited": 0, "tokens_used": 0,
+            })
+        elapsed = max(0.0, now - state["updated"])
+        state["requests"] = min(float(self.burst), state["requests"] + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            state["tokens"] = min(float(self.tokens_per_minute), state["tokens"] + elapsed * self.tokens_per_minute / 60)
+        state["updated"] = now
+        state["waiting"] = {
+            client: entry for client, entry in state["waiting"].items() if now - entry["seen"] < STALE_SECONDS
+        }
+
+    @staticmethod
+    def _score(client: Dict[str, Any], now: float) -> float:
+        """Decayed number of recent grants"""
+        return client.get("score", 0.0) * 0.5 ** ((now - client.get("score_at", now)) / SHARE_HALF_LIFE)
+
+    def _try_grant(self, state: Dict[str, Any], now: float) -> float:
+        """Take a request slot if it is this process's turn; returns 0 on success, else seconds to wait"""
+        if now < state["blocked_until"]:
+            return state["blocked_until"] - now
+        if state["requests"] < 1:
+            return (1 - state["requests"]) * 60 / self.requests_per_minute
+        if self.tokens_per_minute and state["tokens"] <= 0:
+            return -state["tokens"] * 60 / self.tokens_per_minute + 0.05
+
+        # Fair share: among waiting processes, the one with the fewest recent grants goes first
+        clients = state["clients"]
+        turn = min(
+            state["waiting"],
+            key=lambda client: (self._score(clients.get(client, {}), now), state["waiting"][client]["since"]),
+        )
+        if turn != self.client_id:
+            return 0.05
+
+        client = clients.setdefault(self.client_id, {"granted": 0})
+        client["score"] = self._score(client, now) + 1
+        client["score_at"] = now
+        client["granted"] += 1
+        state["requests"] -= 1
+        state["granted"] += 1
+        return 0.0
+
+    #######################
+    # Public API
+    #######################
+
+    def acquire(self):
+        """Block until this process may send one request"""
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        with self._lock:
+            self._waiters += 1
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                state["waiting"].setdefault(self.client_id, {"since": now})["seen"] = now
+                wait = self._try_grant(state, now)
+                if wait <= 0:
+                    self._waiters -= 1
+                    # Other threads of this process keep the place in line
+                    if not self._waiters:
+                        state["waiting"].pop(self.client_id, None)
+            if wait <= 0:
+                break
+            time.sleep(min(max(wait, 0.01), 1.0))
+        waited = time.perf_counter() - started
+        self.granted += 1
+        self.waited_seconds += waited
+        metrics.observe("quota.wait", waited)
+
+    def record_usage(self, total_tokens: int):
+        """Debit the shared tokens-per-minute budget with a call's reported usage"""
+        if not self.enabled or not total_tokens:
+            return
+        with self._locked_state() as state:
+            state["tokens_used"] += total_tokens
+            if self.tokens_per_minute:
+                state["tokens"] -= total_tokens
+
+    def report_rate_limited(self):
+        """A 429 was returned: drain the bucket and pause every process for the cool-down"""
+        self.rate_limited += 1
+        if not self.enabled:
+            return
+        with self._locked_state() as state:
+            now = time.time()
+            state["rate_limited"] += 1
+            state["requests"] = 0.0
+            state["blocked_until"] = max(state["blocked_until"], now + self.cooldown)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Measured throughput against quota, host-wide and for this process.
+        The measured figures are zero until some process has made a request.
+        """
+        result = {
+            "enabled": self.enabled,
+            "process": {
+                "client_id": self.client_id,
+                "granted": self.granted,
+                "rate_limited": self.rate_limited,
+                "waited_seconds": self.waited_seconds,
+            },
+            "requests_per_minute_quota": self.requests_per_minute,
+            "requests_per_minute_measured": 0.0,
+            "tokens_per_minute_quota": self.tokens_per_minute,
+            "tokens_per_minute_measured": 0.0,
+            "utilization": 0.0,
+            "granted": 0,
+            "rate_limited": 0,
+            "share_by_process": {},
+        }
+        if not self.enabled or not os.path.exists(self.state_path):
+            return result
+        with self._locked_state() as state:
+            minutes = max((time.time() - state["started"]) / 60, 1e-9)
+            result.update({
+                "requests_per_minute_quota": self.requests_per_minute,
+                "requests_per_minute_measured": state["granted"] / minutes,
+                "tokens_per_minute_quota": self.tokens_per_minute,
+                "tokens_per_minute_measured": state["tokens_used"] / minutes,
+                "utilization": state["granted"] / minutes / self.requests_per_minute,
+                "granted": state["granted"],
+                "rate_limited": state["rate_limited"],
+                "share_by_process": {
+                    client: entry["granted"] / state["granted"] if state["granted"] else 0.0
+                    for client, entry in state["clients"].items()
+                },
+            })
+        return result
+
+
+# Shared coordinator, configured from the Hydra config in main.py
+quota = QuotaCoordinator()
@@ -0,0 +1,241 @@
+"""
+Streaming analytics over experiment output directories.
+
+Each run directory (outputs/<experiment_id>) is read one record at a time:
+token_calls_*.jsonl, bingo_fills.jsonl and the short-term memory archive.
+Only integer aggregates are kept while streaming; NumPy tables are built once
+at the end, so memory scales with agents and steps rather than with calls.
+"""
+import csv
+import glob
+import gzip
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """Records of a JSON-lines file, plain or gzip-compressed, one at a time"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def find_runs(paths: List[str]) -> List[str]:
+    """Experiment directories under the given paths (a path may itself be a run directory)"""
+    runs = []
+    for path in paths:
+        candidates = [path] + sorted(glob.glob(os.path.join(path, "*")))
+        for candidate in candidates:
+            if not os.path.isdir(candidate):
+                continue
+            if glob.glob(os.path.join(candidate, "token_calls_*.jsonl")) or \
+                    os.path.exists(os.path.join(candidate, "bingo_fills.jsonl")):
+                runs.append(os.path.abspath(candidate))
+    return sorted(set(runs))
+
+
+class RunAnalytics:
+    """Accumulates aggregates across runs and turns them into NumPy tables"""
+
+    def __init__(self):
+        self.agents: Dict[str, int] = {}
+        self.runs: List[str] = []
+        # (speaker, listener) -> dialogue messages / (agent, partner) -> squares filled
+        self._messages: Dict[Tuple[int, int], int] = {}
+        self._fills: Dict[Tuple[int, int], int] = {}
+        # (run, step) -> fills / lines completed
+        self._step_fills: Dict[Tuple[int, int], int] = {}
+        self._step_lines: Dict[Tuple[int, int], int] = {}
+        # (agent_a, agent_b) sorted -> [calls, prompt, completion]
+        self._pair_tokens: Dict[Tuple[int, int], List[int]] = {}
+        self._pair_conversations: Dict[Tuple[int, int], int] = {}
+        # run -> [calls, prompt tokens, completion tokens, conversations, exchanges]
+        self._run_totals: List[List[int]] = []
+        # run -> [dialogue calls, director calls]
+        self._run_turn_calls: List[List[int]] = []
+        self._conversation_lengths: List[Tuple[int, int, int, int]] = []
+
+    def _agent(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        if name not in self.agents:
+            self.agents[name] = len(self.agents)
+        return self.agents[name]
+
+    @staticmethod
+    def _bump(table: Dict, key, amount: int = 1):
+        table[key] = table.get(key, 0) + amount
+
+    #######################
+    # Streaming
+    #######################
+
+    def add_run(self, run_dir: str):
+        run = len(self.runs)
+        self.runs.append(os.path.basename(run_dir.rstrip(os.sep)))
+        totals = [0, 0, 0, 0, 0]
+        self._run_totals.append(totals)
+        turn_calls = [0, 0]
+        self._run_turn_calls.append(turn_calls)
+
+        for calls_path in glob.glob(os.path.join(run_dir, "token_calls_*.jsonl")):
+            for record in iter_jsonl(calls_path):
+                prompt, completion = record.get("prompt_tokens", 0), record.get("completion_tokens", 0)
+                totals[0] += 1
+                totals[1] += prompt
+                totals[2] += completion
+                call_type = record.get("call_type")
+                if call_type == "dialogue":
+                    turn_calls[0] += 1
+                elif call_type == "director":
+                    turn_calls[1] += 1
+                agent, partner = self._agent(record.get("agent")), self._agent(record.get("partner"))
+                if agent is None or partner is None:
+                    continue
+                if call_type == "dialogue":
+                    self._bump(self._messages, (agent, partner))
+                elif call_type == "director":
+                    # One director call writes a message for each speaker
+                    self._bump(self._messages, (agent, partner))
+                    self._bump(self._messages, (partner, agent))
+                pair_totals = self._pair_tokens.setdefault((min(agent, partner), max(agent, partner)), [0, 0, 0])
+                pair_totals[0] += 1
+                pair_totals[1] += prompt
+                pair_totals[2] += completion
+
+        fills_path = os.path.join(run_dir, "bingo_fills.jsonl")
+        if os.path.exists(fills_path):
+            for record in iter_jsonl(fills_path):
+                agent, partner = self._agent(record["agent"]), self._agent(record.get("partner"))
+                if partner is not None:
+                    self._bump(self._fills, (agent, partner))
+                step = record.get("step") or 0
+                self._bump(self._step_fills, (run, step))
+                if record.get("completed_lines"):
+                    self._bump(self._step_lines, (run, step), len(record["completed_lines"]))
+
+        # The archive index and its gzip members are in the same order. Every finished
+        # conversation is archived once per participant, so count it from one side only.
+        for index_path in glob.glob(os.path.join(run_dir, "agent_memories", "*", "*", "archived", "*.index.jsonl")):
+            data_path = index_path[:-len(".index.jsonl")] + ".jsonl.gz"
+            if not os.path.exists(data_path):
+                continue
+            for entry, snapshot in zip(iter_jsonl(index_path), iter_jsonl(data_path)):
+                agent_name, partner_name = entry.get("agent"), entry.get("partner")
+                exchanges = len(snapshot.get("current_conversation", {}).get("exchanges", []))
+                if not agent_name or not partner_name or not exchanges or agent_name > partner_name:
+                    continue
+                agent, partner = self._agent(agent_name), self._agent(partner_name)
+                self._bump(self._pair_conversations, (min(agent, partner), max(agent, partner)))
+                self._conversation_lengths.append((run, agent, partner, exchanges))
+                totals[3] += 1
+                totals[4] += exchanges
+
+    #######################
+    # Tables
+    #######################
+
+    def _matrix(self, table: Dict[Tuple[int, int], int]) -> np.ndarray:
+        matrix = np.zeros((len(self.agents), len(self.agents)), dtype=np.int64)
+        if table:
+            keys = np.array(list(table.keys()), dtype=np.int64)
+            np.add.at(matrix, (keys[:, 0], keys[:, 1]), np.fromiter(table.values(), dtype=np.int64))
+        return matrix
+
+    def interaction_matrix(self) -> np.ndarray:
+        """Dialogue messages sent from row agent to column agent"""
+        return self._matrix(self._messages)
+
+    def fill_matrix(self) -> np.ndarray:
+        """Squares on the row agent's board filled through the column agent"""
+        return self._matrix(self._fills)
+
+    def _per_step(self, table: Dict[Tuple[int, int], int]) -> np.ndarray:
+        steps = max((step for _, step in self._step_fills), default=0)
+        per_step = np.zeros((len(self.runs), steps + 1), dtype=np.int64)
+        for (run, step), count in table.items():
+            per_step[run, step] += count
+        return per_step
+
+    def fills_per_step(self) -> np.ndarray:
+        """[runs, steps + 1] fills per time step (column 0 holds fills outside time-dependent runs)"""
+        return self._per_step(self._step_fills)
+
+    def lines_per_step(self) -> np.ndarray:
+        """[runs, steps + 1] bingo lines completed per time step"""
+        return self._per_step(self._step_lines)
+
+    def pair_tokens(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(pairs [n, 2] agent ids, values [n, 5]: calls, prompt, completion, total, conversations)"""
+        keys = sorted(self._pair_tokens)
+        pairs = np.array(keys, dtype=np.int64).reshape(-1, 2)
+        values = np.zeros((len(keys), 5), dtype=np.int64)
+        for i, key in enumerate(keys):
+            calls, prompt, completion = self._pair_tokens[key]
+            values[i] = (calls, prompt, completion, prompt + completion, self._pair_conversations.get(key, 0))
+        return pairs, values
+
+    def conversation_lengths(self) -> np.ndarray:
+        """[n, 4] run, agent, partner, exchanges for every archived conversation"""
+        return np.array(self._conversation_lengths, dtype=np.int64).reshape(-1, 4)
+
+    def run_summary(self) -> np.ndarray:
+        """[runs, 5] calls, prompt tokens, completion tokens, conversations, exchanges"""
+        return np.array(self._run_totals, dtype=np.int64).reshape(-1, 5)
+
+    def turn_calls(self) -> np.ndarray:
+        """[runs, 2] dialogue calls (one message each) and director calls (two messages each)"""
+        return np.array(self._run_turn_calls, dtype=np.int64).reshape(-1, 2)
+
+    #######################
+    # Export
+    #######################
+
+    def export_csv(self, out_dir: str) -> List[str]:
+        """Write every table as CSV into out_dir and return the paths"""
+        os.makedirs(out_dir, exist_ok=True)
+        names = sorted(self.agents, key=self.agents.get)
+        written = []
+
+        def write(filename: str, header: List[str], rows):
+            path = os.path.join(out_dir, filename)
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            written.append(path)
+
+        for filename, matrix in (("interactions.csv", self.interaction_matrix()), ("fills.csv", self.fill_matrix())):
+            write(filename, ["agent"] + names, ([name] + row.tolist() for name, row in zip(names, matrix)))
+
+        per_step = self.fills_per_step()
+        cumulative = per_step.cumsum(axis=1)
+        lines = self.lines_per_step()
+        write("fills_per_step.csv", ["run", "step", "fills", "cumulative_fills", "lines_completed"],
+              ([self.runs[run], step, int(per_step[run, step]), int(cumulative[run, step]), int(lines[run, step])]
+               for run in range(per_step.shape[0]) for step in range(per_step.shape[1])))
+
+        pairs, values = self.pair_tokens()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_conversation = np.where(values[:, 4] > 0, values[:, 3] / np.maximum(values[:, 4], 1), np.nan)
+        write("pair_tokens.csv",
+              ["agent_a", "agent_b", "calls", "prompt_tokens", "completion_tokens", "total_tokens",
+               "conversations", "tokens_per_conversation"],
+              ([names[a], names[b]] + value.tolist() + [round(float(avg), 1) if avg == avg else ""]
+               for (a, b), value, avg in zip(pairs, values, per_conversation)))
+
+        write("conversations.csv", ["run", "agent", "partner", "exchanges"],
+              ([self.runs[run], names[a], names[b], exchanges]
+               for run, a, b, exchanges in self.conversation_lengths()))
+
+        summary = self.run_summary()
+        write("runs.csv", ["run", "calls", "prompt_tokens", "completion_tokens", "conversations", "exchanges",
+                           "fills", "lines_completed"],
+              ([self.runs[run]] + summary[run].tolist() + [int(per_step[run].sum()), int(lines[run].sum())]
+               for run in range(len(self.runs))))
+        return written
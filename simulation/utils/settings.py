@@ -0,0 +1,100 @@
+"""
+Frozen snapshot of the settings read inside the simulation loop.
+
+Reading `cfg.environment.settings.time_dependent.messages_per_time_step`
+walks four DictConfig nodes on every access. Settings resolves those values
+once, checks them, and exposes them as plain slot attributes. main.py builds
+it after the experiment paths are resolved and hands it to AgentManager;
+environments and the ConversationManager share the agent manager's copy.
+"""
+from typing import Any, Optional
+
+from omegaconf import DictConfig
+
+
+def _number(path: str, value: Any, minimum: float, cast=int, optional: bool = False):
+    if value is None and optional:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+        raise ValueError(f"Invalid setting {path}: {value!r} (expected a number >= {minimum})")
+    return cast(value)
+
+
+class Settings:
+    """Typed, read-only run settings; assigning to an attribute raises AttributeError"""
+
+    __slots__ = (
+        "max_time_steps", "messages_per_time_step", "stall_patience", "random_seed",
+        "agent_max_retries", "agent_delay", "digest_max_retries", "digest_delay",
+        "turns_per_conversation", "max_total_conversations", "max_concurrent_conversations", "turn_mode",
+        "test_max_agents", "test_max_time_steps", "test_messages_per_conversation",
+    )
+
+    # environment.settings.time_dependent (None outside time-stepped environments)
+    max_time_steps: Optional[int]
+    messages_per_time_step: Optional[int]
+    stall_patience: int
+    random_seed: Optional[int]
+    # agent.agent and conversation.conversation.digest retry policies
+    agent_max_retries: int
+    agent_delay: float
+    digest_max_retries: int
+    digest_delay: float
+    # conversation.conversation
+    turns_per_conversation: int
+    max_total_conversations: int
+    max_concurrent_conversations: int
+    turn_mode: str
+    # environment.settings.test
+    test_max_agents: Optional[int]
+    test_max_time_steps: Optional[int]
+    test_messages_per_conversation: Optional[int]
+
+    def __init__(self, **values: Any):
+        missing = [name for name in self.__slots__ if name not in values]
+        unknown = [name for name in values if name not in self.__slots__]
+        if missing or unknown:
+            raise TypeError(f"Settings got missing fields {missing} and unknown fields {unknown}")
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Settings are frozen; cannot set {name}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Settings are frozen; cannot delete {name}")
+
+    def __repr__(self) -> str:
+        return "Settings(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__) + ")"
+
+    @classmethod
+    def from_cfg(cls, cfg: DictConfig) -> "Settings":
+        """Resolve and validate every field; raises ValueError on a bad value"""
+        environment = cfg.environment.get("settings") or {}
+        time_dependent = environment.get("time_dependent") or {}
+        test = environment.get("test") or {}
+        agent = cfg.agent.agent
+        conversation = cfg.conversation.conversation
+        digest = conversation.get("digest") or {}
+        prefix = "environment.settings.time_dependent"
+        return cls(
+            max_time_steps=_number(f"{prefix}.max_time_steps", time_dependent.get("max_time_steps"), 1,
+                                   optional=not time_dependent),
+            messages_per_time_step=_number(f"{prefix}.messages_per_time_step", time_dependent.get("messages_per_time_step"), 1,
+                                           optional=not time_dependent),
+            stall_patience=_number(f"{prefix}.stall_patience", time_dependent.get("stall_patience", 3), 1),
+            random_seed=_number(f"{prefix}.random_seed", time_dependent.get("random_seed"), float("-inf"), optional=True),
+            agent_max_retries=_number("agent.max_retries", agent.max_retries, 1),
+            agent_delay=_number("agent.delay", agent.delay, 0, cast=float),
+            digest_max_retries=_number("conversation.digest.max_retries", digest.get("max_retries", 3), 1),
+            digest_delay=_number("conversation.digest.delay", digest.get("delay", 1), 0, cast=float),
+            turns_per_conversation=_number("conversation.turns_per_conversation", conversation.turns_per_conversation, 1),
+            max_total_conversations=_number("conversation.max_total_conversations", conversation.max_total_conversations, 0),
+            max_concurrent_conversations=_number("conversation.max_concurrent_conversations",
+                                                 conversation.get("max_concurrent_conversations", 1), 1),
+            turn_mode=str(conversation.get("turn_mode", "alternating")),
+            test_max_agents=_number("environment.settings.test.max_agents", test.get("max_agents"), 2, optional=True),
+            test_max_time_steps=_number("environment.settings.test.max_time_steps", test.get("max_time_steps"), 1, optional=True),
+            test_messages_per_conversation=_number("environment.settings.test.messages_per_conversation",
+                                                   test.get("messages_per_conversation"), 1, optional=True),
+        )
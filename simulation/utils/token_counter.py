@@ -1,59 +1,189 @@
-"""Simple utility to track API token usage"""
+"""Token usage accounting for LLM calls"""
 import json
 import os
+import re
+import threading
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Rough SentencePiece-style split: words, numbers and single punctuation marks
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate used when the API does not report usage.
+    Words longer than ~4 characters are counted as several sub-word pieces,
+    which tracks Gemma/Gemini tokenization much closer than len(text) // 4.
+    Not cached: callers pass whole prompts and responses, which never repeat.
+    """
+    count = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        count += (1 + (len(piece) - 1) // 4) if piece.isalpha() else 1
+    return count
+
+
+def extract_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """
+    Read (prompt_tokens, completion_tokens) reported by the API, if any.
+    Handles LangChain's normalized `usage_metadata` and Gemini's raw
+    `usage_metadata` block inside `response_metadata`.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("usage_metadata")
+    if usage:
+        return usage.get("prompt_token_count", 0), usage.get("candidates_token_count", 0)
+    return None
+
+
+def measure_usage(prompt=None, response=None) -> Tuple[int, int, str]:
+    """(prompt_tokens, completion_tokens, source) of one call, reported by the API or estimated"""
+    usage = extract_usage(response)
+    if usage is not None:
+        return usage[0], usage[1], "usage_metadata"
+    text = response.content if hasattr(response, "content") else response
+    prompt_tokens = estimate_tokens(str(prompt)) if prompt else 0
+    completion_tokens = estimate_tokens(str(text)) if text else 0
+    return prompt_tokens, completion_tokens, "estimate"
+
+
+def _empty_totals() -> Dict[str, int]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+def _add_to(totals: Dict[str, int], prompt_tokens: int, completion_tokens: int):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["total_tokens"] += prompt_tokens + completion_tokens
+
 
 class TokenCounter:
-    def __init__(self):
+    """
+    Tracks token usage for every LLM call in a run.
+
+    Only rolling aggregates are kept in memory: overall, per call type
+    (dialogue, digest, long_term_memory), per agent and per pair. Individual
+    call records are streamed to a JSON-lines file once an output directory
+    is set, so memory does not grow with the number of calls.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None):
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
         self.total_tokens = 0
-        self.calls = []
-    
-    def add_api_call(self, prompt=None, response=None):
-        """Extract token counts from an API call"""
-        # Rough estimation: ~4 chars per token
-        prompt_tokens = len(str(prompt)) // 4 if prompt else 0
-        completion_tokens = len(str(response)) // 4 if response else 0
-        
-        # Update totals
-        self.total_prompt_tokens += prompt_tokens
-        self.total_completion_tokens += completion_tokens
-        self.total_tokens += (prompt_tokens + completion_tokens)
-        
-        # Record the call
-        self.calls.append({
-            'timestamp': datetime.now().isoformat(),
-            'prompt_tokens': prompt_tokens,
-            'completion_tokens': completion_tokens,
-            'total_tokens': prompt_tokens + completion_tokens
-        })
-    
-    def save_summary(self, output_dir):
-        """Save token usage summary to a file"""
-        summary = {
+        self.total_calls = 0
+        self.estimated_calls = 0
+        self.by_call_type: Dict[str, Dict[str, int]] = {}
+        self.by_agent: Dict[str, Dict[str, int]] = {}
+        self.by_pair: Dict[str, Dict[str, int]] = {}
+        self.calls_path: Optional[str] = None
+        self._calls_file = None
+        self._lock = threading.Lock()
+        if output_dir:
+            self.set_output_dir(output_dir)
+
+    def set_output_dir(self, output_dir: str):
+        """Start streaming per-call records to token_calls_<timestamp>.jsonl"""
+        self.close()
+        filename = f'token_calls_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl'
+        self.calls_path = os.path.join(output_dir, filename)
+        self._calls_file = open(self.calls_path, "a", encoding="utf-8")
+
+    def add_api_call(self, prompt=None, response=None, call_type: str = "dialogue",
+                     agent: Optional[str] = None, partner: Optional[str] = None, model: Optional[str] = None):
+        """
+        Record one API call. `response` may be the LangChain message (preferred,
+        so real usage is read from its metadata) or plain response text.
+        """
+        prompt_tokens, completion_tokens, source = measure_usage(prompt, response)
+        self.add_usage(prompt_tokens, completion_tokens, call_type, agent, partner, model, source)
+
+    def add_usage(self, prompt_tokens: int, completion_tokens: int, call_type: str = "dialogue",
+                  agent: Optional[str] = None, partner: Optional[str] = None, model: Optional[str] = None,
+                  source: str = "usage_metadata"):
+        """Record one API call whose token counts are already known, e.g. reported by a worker"""
+        # Conversations of a round-robin round may record calls from several threads
+        with self._lock:
+            if source == "estimate":
+                self.estimated_calls += 1
+
+            # Update totals
+            self.total_calls += 1
+            self.total_prompt_tokens += prompt_tokens
+            self.total_completion_tokens += completion_tokens
+            self.total_tokens += (prompt_tokens + completion_tokens)
+
+            # Update breakdowns
+            _add_to(self.by_call_type.setdefault(call_type, _empty_totals()), prompt_tokens, completion_tokens)
+            if agent:
+                _add_to(self.by_agent.setdefault(agent, _empty_totals()), prompt_tokens, completion_tokens)
+            if agent and partner:
+                pair_key = "|".join(sorted((agent, partner)))
+                _add_to(self.by_pair.setdefault(pair_key, _empty_totals()), prompt_tokens, completion_tokens)
+
+            # Stream the call record instead of keeping it
+            if self._calls_file is not None:
+                self._calls_file.write(json.dumps({
+                    'timestamp': datetime.now().isoformat(),
+                    'call_type': call_type,
+                    'agent': agent,
+                    'partner': partner,
+                    'model': model,
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens,
+                    'source': source
+                }) + "\n")
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Aggregated token usage for the run so far"""
+        return {
             'timestamp': datetime.now().isoformat(),
             'total_prompt_tokens': self.total_prompt_tokens,
             'total_completion_tokens': self.total_completion_tokens,
             'total_tokens': self.total_tokens,
-            'total_calls': len(self.calls),
-            'calls': self.calls
+            'total_calls': self.total_calls,
+            'estimated_calls': self.estimated_calls,
+            'by_call_type': self.by_call_type,
+            'by_agent': self.by_agent,
+            'by_pair': self.by_pair,
+            'calls_file': os.path.basename(self.calls_path) if self.calls_path else None
         }
-        
+
+    def save_summary(self, output_dir):
+        """Save token usage summary to a file"""
+        if self._calls_file is not None:
+            self._calls_file.flush()
+
         # Create output filename with timestamp
         filename = f'token_usage_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
         filepath = os.path.join(output_dir, filename)
-        
+
         with open(filepath, 'w') as f:
-            json.dump(summary, f, indent=2)
-        
+            json.dump(self.get_summary(), f, indent=2)
+
         return filepath
-    
+
+    def close(self):
+        """Close the per-call record stream"""
+        if self._calls_file is not None:
+            self._calls_file.close()
+            self._calls_file = None
+
     def print_summary(self):
         """Print token usage summary"""
         print("\n=== Token Usage Summary ===")
         print(f"Total Prompt Tokens: {self.total_prompt_tokens:,}")
         print(f"Total Completion Tokens: {self.total_completion_tokens:,}")
         print(f"Total Tokens: {self.total_tokens:,}")
-        print(f"Total API Calls: {len(self.calls)}")
-        print("============================") 
\ No newline at end of file
+        print(f"Total API Calls: {self.total_calls}")
+        for call_type, totals in sorted(self.by_call_type.items()):
+            print(f"  {call_type}: {totals['calls']} calls, {totals['total_tokens']:,} tokens")
+        if self.estimated_calls:
+            print(f"Estimated (no usage metadata): {self.estimated_calls} calls")
+        print("============================")
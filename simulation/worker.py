@@ -0,0 +1,98 @@
+"""
+Conversation worker for cluster runs.
+
+Claims pair-step jobs from the coordinator's SQLite queue, runs the turn
+loop against its own API key (from this machine's environment or .env) and
+returns the exchanges and token usage. Takes the same Hydra overrides as
+main.py; the model routes, turn mode and quota settings apply here.
+
+Run from the simulation directory, pointing at the coordinator's queue:
+    python worker.py cluster.queue_file=/shared/run/jobs.sqlite
+
+The coordinator (main.py with cluster.enabled=true) can also start local
+workers itself (cluster.local_workers=N).
+"""
+import os
+import socket
+import time
+import threading
+from contextlib import contextmanager
+import hydra
+from omegaconf import DictConfig
+
+from core.pair_step import PairStepRunner
+from utils.console import console
+from utils.job_queue import JobQueue
+from utils.model_router import router
+from utils.quota import quota
+
+
+@contextmanager
+def heartbeats(path: str, worker: str, job_id: int, interval: float):
+    """Heartbeat from a background thread while a job runs, so a long job keeps its lease"""
+    stop = threading.Event()
+
+    def beat():
+        # SQLite connections stay on the thread that opened them
+        queue = JobQueue(path)
+        try:
+            while not stop.wait(interval):
+                queue.heartbeat(worker, job_id)
+        finally:
+            queue.close()
+
+    thread = threading.Thread(target=beat, name="heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+@hydra.main(version_base=None, config_path="configs", config_name="config")
+def main(cfg: DictConfig) -> None:
+    orig_cwd = hydra.utils.get_original_cwd()
+    console.configure(cfg)
+    settings = cfg.cluster
+    if not settings.get("queue_file"):
+        raise ValueError("cluster.queue_file is required: the coordinator prints its queue path at startup")
+    router.configure(cfg)
+    quota.configure(cfg, orig_cwd)
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(os.path.join(orig_cwd, settings.queue_file))
+    runner = PairStepRunner(cfg)
+    poll_interval = settings.get("poll_interval", 0.2)
+    heartbeat_interval = settings.get("heartbeat_interval", 10)
+    idle_timeout = settings.get("idle_timeout")
+    console.info("🛰️  Worker %s polling %s", worker, queue.path)
+
+    jobs = 0
+    idle_since = time.time()
+    while True:
+        queue.heartbeat(worker)
+        claimed = queue.claim(worker)
+        if claimed is None:
+            if queue.shutdown_requested() or (idle_timeout and time.time() - idle_since > idle_timeout):
+                break
+            time.sleep(poll_interval)
+            continue
+        job_id, job = claimed
+        try:
+            with heartbeats(queue.path, worker, job_id, heartbeat_interval):
+                result = runner.run_group(job)
+            queue.complete(job_id, worker, result)
+            jobs += 1
+        except Exception as e:
+            console.error("❌ Job %d (%s/%s) failed: %s", job_id, job.get("agent1"), job.get("agent2"), e)
+            queue.fail(job_id, str(e))
+        idle_since = time.time()
+
+    queue.close()
+    console.info("🛰️  Worker %s finished %d jobs", worker, jobs)
+    console.flush()
+
+
+if __name__ == "__main__":
+    main()